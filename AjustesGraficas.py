@@ -1,37 +1,225 @@
-import cv2
-import numpy as np
-
-# Cargar la imagen de la gráfica
-imagen_grafica = cv2.imread("graficak1.png")
-
-# Convertir la imagen a escala de grises
-imagen_gris = cv2.cvtColor(imagen_grafica, cv2.COLOR_BGR2GRAY)
-
-# Aplicar umbralización para obtener solo los puntos de interés
-_, umbralizada = cv2.threshold(imagen_gris, 240, 255, cv2.THRESH_BINARY)
-
-# Encontrar los contornos de los puntos
-contornos, _ = cv2.findContours(umbralizada, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-# Extraer los puntos de los contornos
-puntos = []
-for contorno in contornos:
-    # Calcular el centro del contorno (punto)
-    M = cv2.moments(contorno)
-    if M["m00"] != 0:
-        centro_x = int(M["m01"] / M["m10"])
-        centro_y = int(M["m01"] / M["m10"])
-        puntos.append((centro_x, centro_y))
-
-# Mostrar los puntos encontrados
-for punto in puntos:
-    print("Punto:", punto)
-
-# Dibujar los puntos sobre la imagen original (opcional)
-for punto in puntos:
-    cv2.circle(imagen_grafica, punto, 3, (0, 0, 255), -1)
-
-# Mostrar la imagen con los puntos resaltados (opcional)
-cv2.imshow("Imagen con puntos", imagen_grafica)
-cv2.waitKey(0)
-cv2.destroyAllWindows()
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from CargaAjustes import DIRECTORIO_AJUSTES
+from CargaDiferida import importar_diferido
+from Rutas import directorio_cache
+
+cv2 = importar_diferido("cv2")
+
+
+# Digitalización de las gráficas del diseño (K1, tipo de flujo, arrastre, diámetros comerciales).
+# Cada imagen va acompañada de un archivo de calibración con el mismo nombre y extensión .json:
+#
+#   {
+#     "grafica": "k1",
+#     "ejes": {"x": {"pixeles": [112, 905], "valores": [0.01, 1.0], "escala": "log"},
+#              "y": {"pixeles": [640, 45], "valores": [0.01, 0.2], "escala": "log"}},
+#     "recorte": [112, 45, 905, 640],
+#     "curvas": {"0.6": {"color": [0, 0, 255], "tolerancia": 40, "grado": 3}, ...},
+#     "modo": "marcadores",
+#     "ajuste": "lineal"
+#   }
+#
+# "curvas" indica para cada curva su color (BGR) en la imagen; si se omite, la gráfica tiene una sola
+# curva formada por los trazos oscuros (umbral sobre la escala de grises). En modo "marcadores" cada
+# contorno es un punto digitalizado (su centroide); en modo "trazo" se toma un punto por columna de
+# píxeles. Cada curva se ajusta a un polinomio de la variable x (coeficientes de mayor a menor grado,
+# como en MotorPlatos.AJUSTES_K1), o con "ajuste": "log" log10(y) a un polinomio de log10(x), como requiere
+# la gráfica de arrastre (MotorPlatos.AJUSTES_ARRASTRE). Con "invertir": true se ajusta x en función de y,
+# como en la gráfica del tipo de flujo, cuyas fronteras (curvas "invertido" y "doble") se expresan como caudal
+# en función del diámetro (MotorPlatos.AJUSTES_FLUJO). Los ajustes se escriben en ajustes_<grafica>.json,
+# que el motor carga al arrancar (CargaAjustes.py).
+
+EXTENSIONES = (".png", ".jpg", ".jpeg", ".bmp")
+VERSION = 2
+
+UMBRAL_GRIS = 240
+TOLERANCIA_COLOR = 40
+AREA_MINIMA = 2.0
+GRADO = 2
+
+
+def pixeles_a_valores(pixeles, eje):
+    # Convierte coordenadas de píxel a valores del eje calibrado con dos puntos de referencia
+    (p0, p1), (v0, v1) = eje["pixeles"], eje["valores"]
+    fraccion = (np.asarray(pixeles, dtype=float) - p0) / (p1 - p0)
+    if eje.get("escala", "lineal") == "log":
+        return 10 ** (np.log10(v0) + fraccion * (np.log10(v1) - np.log10(v0)))
+    return v0 + fraccion * (v1 - v0)
+
+
+def mascara_curva(imagen, curva):
+    # Píxeles de una curva: por color si se indica, si no los trazos oscuros
+    if curva.get("color") is not None:
+        color = np.asarray(curva["color"], dtype=int)
+        tolerancia = curva.get("tolerancia", TOLERANCIA_COLOR)
+        return cv2.inRange(imagen, np.clip(color - tolerancia, 0, 255).astype(np.uint8),
+                           np.clip(color + tolerancia, 0, 255).astype(np.uint8))
+    gris = cv2.cvtColor(imagen, cv2.COLOR_BGR2GRAY)
+    _, mascara = cv2.threshold(gris, curva.get("umbral", UMBRAL_GRIS), 255, cv2.THRESH_BINARY_INV)
+    return mascara
+
+
+def centroides(mascara, area_minima=AREA_MINIMA):
+    # Centro de cada marcador: (m10/m00, m01/m00) de los momentos de su contorno
+    contornos, _ = cv2.findContours(mascara, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    puntos = []
+    for contorno in contornos:
+        momentos = cv2.moments(contorno)
+        if momentos["m00"] >= area_minima:
+            puntos.append((momentos["m10"] / momentos["m00"], momentos["m01"] / momentos["m00"]))
+    return np.array(puntos, dtype=float).reshape(-1, 2)
+
+
+def trazo(mascara):
+    # Un punto por columna con píxeles de la curva: la fila media de esos píxeles
+    filas, columnas = np.nonzero(mascara)
+    if columnas.size == 0:
+        return np.empty((0, 2))
+    unicas, inversa, cuentas = np.unique(columnas, return_inverse=True, return_counts=True)
+    return np.column_stack([unicas, np.bincount(inversa, weights=filas) / cuentas])
+
+
+def extraer_puntos(imagen, calibracion):
+    # Puntos (x, y) en unidades de la gráfica de cada curva ((y, x) si se invierte la gráfica)
+    if calibracion.get("recorte"):
+        x0, y0, x1, y1 = calibracion["recorte"]
+        imagen = imagen[y0:y1, x0:x1]
+        desplazamiento = np.array([x0, y0], dtype=float)
+    else:
+        desplazamiento = np.zeros(2)
+    curvas = calibracion.get("curvas") or {"curva": {}}
+    modo = calibracion.get("modo", "marcadores")
+    puntos = {}
+    for nombre, curva in curvas.items():
+        mascara = mascara_curva(imagen, curva)
+        pixeles = (centroides(mascara) if modo == "marcadores" else trazo(mascara)) + desplazamiento
+        x = pixeles_a_valores(pixeles[:, 0], calibracion["ejes"]["x"])
+        y = pixeles_a_valores(pixeles[:, 1], calibracion["ejes"]["y"])
+        if calibracion.get("invertir"):
+            x, y = y, x
+        orden = np.argsort(x)
+        puntos[nombre] = np.column_stack([x[orden], y[orden]])
+    return puntos
+
+
+def ajustar(puntos, grado=GRADO, logaritmico=False):
+    # Polinomio de mínimos cuadrados de una curva, con su intervalo de validez y su error (este en las
+    # variables del ajuste)
+    x, y = puntos[:, 0], puntos[:, 1]
+    rango_x = [float(x.min()), float(x.max())] if x.size else [np.nan, np.nan]
+    if logaritmico:
+        x, y = np.log10(x), np.log10(y)
+    if x.size <= grado:
+        raise ValueError(f"Se necesitan más de {grado} puntos para un ajuste de grado {grado}, hay {x.size}")
+    coeficientes = np.polyfit(x, y, grado)
+    residuos = y - np.polyval(coeficientes, x)
+    return {
+        "coeficientes": coeficientes.tolist(),
+        "rango_x": rango_x,
+        "puntos": int(x.size),
+        "error_rms": float(np.sqrt(np.mean(residuos ** 2))),
+    }
+
+
+def _ruta_calibracion(ruta_imagen):
+    return os.path.splitext(ruta_imagen)[0] + ".json"
+
+
+def _huella(ruta_imagen, calibracion):
+    # Identifica el resultado: contenido de la imagen, calibración y versión del procedimiento
+    huella = hashlib.sha256()
+    with open(ruta_imagen, "rb") as archivo:
+        huella.update(archivo.read())
+    huella.update(json.dumps(calibracion, sort_keys=True).encode("utf-8"))
+    huella.update(str(VERSION).encode("utf-8"))
+    return huella.hexdigest()
+
+
+def _escribir_json(ruta, contenido):
+    # Escritura atómica: un archivo a medio escribir nunca sustituye al anterior
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta) or ".", suffix=".json")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as archivo:
+            json.dump(contenido, archivo, indent=2, ensure_ascii=False)
+        os.replace(temporal, ruta)
+    except OSError:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def procesar_grafica(ruta_imagen, cache=None):
+    # Digitaliza y ajusta una gráfica. El resultado se guarda en caché por huella, de modo que una
+    # gráfica sin cambios (ni en la imagen ni en su calibración) no se vuelve a procesar.
+    with open(_ruta_calibracion(ruta_imagen), encoding="utf-8") as archivo:
+        calibracion = json.load(archivo)
+    huella = _huella(ruta_imagen, calibracion)
+    ruta_cache = os.path.join(cache or directorio_cache("graficas"), f"{huella}.json")
+    try:
+        with open(ruta_cache, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        pass
+
+    # imdecode en lugar de imread para admitir rutas con tildes (imágenes/) en Windows
+    imagen = cv2.imdecode(np.fromfile(ruta_imagen, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if imagen is None:
+        raise OSError(f"No se pudo leer la imagen {ruta_imagen}")
+    curvas = calibracion.get("curvas") or {}
+    resultado = {
+        "grafica": calibracion.get("grafica", os.path.splitext(os.path.basename(ruta_imagen))[0]),
+        "imagen": os.path.basename(ruta_imagen),
+        "huella": huella,
+        "ajuste": calibracion.get("ajuste", "lineal"),
+        "curvas": {nombre: ajustar(puntos, curvas.get(nombre, {}).get("grado", calibracion.get("grado", GRADO)),
+                                   calibracion.get("ajuste") == "log")
+                   for nombre, puntos in extraer_puntos(imagen, calibracion).items()},
+    }
+    try:
+        _escribir_json(ruta_cache, resultado)
+    except OSError:
+        pass  # La caché es opcional
+    return resultado
+
+
+def procesar_directorio(directorio, destino=DIRECTORIO_AJUSTES, procesos=None):
+    # Procesa en paralelo todas las imágenes calibradas del directorio y escribe un archivo de ajustes
+    # por gráfica en `destino`. Devuelve las rutas de los archivos escritos.
+    imagenes = sorted(os.path.join(directorio, nombre) for nombre in os.listdir(directorio)
+                      if nombre.lower().endswith(EXTENSIONES)
+                      and os.path.exists(_ruta_calibracion(os.path.join(directorio, nombre))))
+    if not imagenes:
+        return []
+    procesos = min(procesos or os.cpu_count() or 1, len(imagenes))
+    if procesos == 1:
+        resultados = [procesar_grafica(ruta) for ruta in imagenes]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as grupo:
+            resultados = list(grupo.map(procesar_grafica, imagenes))
+
+    rutas = []
+    for resultado in resultados:
+        ruta = os.path.join(destino, f"ajustes_{resultado['grafica']}.json")
+        _escribir_json(ruta, resultado)
+        rutas.append(ruta)
+    return rutas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Digitaliza las gráficas calibradas de un directorio y "
+                                                 "escribe sus ajustes para el motor de cálculo")
+    parser.add_argument("directorio", help="directorio con las imágenes y sus calibraciones .json")
+    parser.add_argument("--destino", default=DIRECTORIO_AJUSTES, help="directorio de los archivos de ajustes")
+    parser.add_argument("--procesos", type=int, default=None)
+    argumentos = parser.parse_args()
+    for ruta in procesar_directorio(argumentos.directorio, argumentos.destino, argumentos.procesos):
+        print("Ajustes escritos en", ruta)
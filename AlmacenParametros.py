@@ -0,0 +1,157 @@
+import numpy as np
+
+from ChemicalProcessInterface import Item
+
+
+class ItemVista(Item):
+    # Item cuyos datos viven en una fila de un AlmacenParametros. La interfaz lo usa como cualquier Item,
+    # pero el valor se lee y escribe en el array del almacén y el nombre, la unidad y las opciones se
+    # comparten entre todas las filas.
+    __slots__ = ("_almacen", "_campo", "_fila")
+
+    def __init__(self, almacen, campo, fila=0):
+        self._almacen = almacen
+        self._campo = campo
+        self._fila = fila
+
+    @property
+    def name(self):
+        return self._almacen.etiquetas[self._campo]
+
+    @property
+    def unit(self):
+        return self._almacen.unidades[self._campo]
+
+    @property
+    def is_choice(self):
+        return self._almacen.es_opcion[self._campo]
+
+    @property
+    def choices(self):
+        return self._almacen.opciones[self._campo]
+
+    @property
+    def value(self):
+        return self._almacen.leer(self._fila, self._campo)
+
+    @value.setter
+    def value(self, valor):
+        self._almacen.escribir(self._fila, self._campo, valor)
+
+    def __repr__(self):
+        return f"ItemVista({self.name!r}, {self.value!r}, {self.unit!r}, fila={self._fila})"
+
+
+class AlmacenParametros:
+    # Todos los parámetros de un diseño en una fila contigua de un array de NumPy (un campo por columna)
+    # y muchos diseños como un bloque 2D. Copiar o guardar el estado de un diseño es copiar una fila.
+    # Junto a los valores se guarda su tipo, para devolver enteros y None tal como se asignaron.
+
+    FLOTANTE, ENTERO, NINGUNO = 0, 1, 2
+
+    def __init__(self, campos, capacidad=1):
+        # campos: secuencia de (nombre, etiqueta, valor, unidad, is_choice, choices)
+        campos = list(campos)
+        self.nombres = tuple(campo[0] for campo in campos)
+        self.indice = {nombre: j for j, nombre in enumerate(self.nombres)}
+        self.etiquetas = [campo[1] for campo in campos]
+        self.unidades = [campo[3] for campo in campos]
+        self.es_opcion = [campo[4] for campo in campos]
+        self.opciones = [list(campo[5]) if campo[5] else [] for campo in campos]
+        self.datos = np.zeros((max(capacidad, 1), len(campos)))
+        self.tipos = np.zeros(self.datos.shape, dtype=np.int8)
+        self.filas = 1
+        for j, campo in enumerate(campos):
+            self.escribir(0, j, campo[2])
+
+    @classmethod
+    def desde_objeto(cls, objeto):
+        # Traslada los Item atributos de `objeto` a un almacén y los sustituye por vistas de la fila 0
+        items = {nombre: valor for nombre, valor in vars(objeto).items()
+                 if isinstance(valor, Item) and not isinstance(valor, ItemVista)}
+        almacen = cls((nombre, item.name, item.value, item.unit, item.is_choice, item.choices)
+                      for nombre, item in items.items())
+        for nombre in items:
+            setattr(objeto, nombre, almacen.vista(nombre))
+        return almacen
+
+    def __len__(self):
+        return self.filas
+
+    def __contains__(self, nombre):
+        return nombre in self.indice
+
+    @staticmethod
+    def _convertir(valor):
+        if valor is None:
+            return np.nan, AlmacenParametros.NINGUNO
+        if isinstance(valor, (int, np.integer)) and not isinstance(valor, bool):
+            return float(valor), AlmacenParametros.ENTERO
+        # Los textos de la interfaz se convierten aquí; un texto no numérico lanza ValueError
+        return float(valor), AlmacenParametros.FLOTANTE
+
+    def leer(self, fila, campo):
+        tipo = self.tipos[fila, campo]
+        if tipo == AlmacenParametros.NINGUNO:
+            return None
+        valor = self.datos[fila, campo].item()
+        return int(valor) if tipo == AlmacenParametros.ENTERO else valor
+
+    def escribir(self, fila, campo, valor):
+        self.datos[fila, campo], self.tipos[fila, campo] = self._convertir(valor)
+
+    def vista(self, nombre, fila=0):
+        return ItemVista(self, self.indice[nombre], fila)
+
+    def como_diccionario(self, fila=0, nombres=None):
+        nombres = self.nombres if nombres is None else nombres
+        return {nombre: self.leer(fila, self.indice[nombre]) for nombre in nombres}
+
+    def instantanea(self, fila=0):
+        # Copia del estado de un diseño, para restaurarlo después
+        return self.datos[fila].copy(), self.tipos[fila].copy()
+
+    def restaurar(self, instantanea, fila=0):
+        self.datos[fila], self.tipos[fila] = instantanea
+
+    def _reservar(self, filas):
+        # Crecimiento geométrico, como una lista, para que añadir filas sea O(1) amortizado
+        necesarias = self.filas + filas
+        if necesarias > self.datos.shape[0]:
+            capacidad = max(necesarias, 2 * self.datos.shape[0])
+            datos = np.zeros((capacidad, len(self.nombres)))
+            tipos = np.zeros(datos.shape, dtype=np.int8)
+            datos[:self.filas] = self.datos[:self.filas]
+            tipos[:self.filas] = self.tipos[:self.filas]
+            self.datos, self.tipos = datos, tipos
+        nuevas = slice(self.filas, necesarias)
+        self.filas = necesarias
+        return nuevas
+
+    def clonar(self, fila=0, veces=1):
+        # Añade `veces` copias de un diseño y devuelve el rango de las filas nuevas
+        nuevas = self._reservar(veces)
+        self.datos[nuevas] = self.datos[fila]
+        self.tipos[nuevas] = self.tipos[fila]
+        return range(nuevas.start, nuevas.stop)
+
+    def añadir_filas(self, valores, base=0):
+        # Añade un bloque de diseños a partir de la fila `base`, sustituyendo las columnas de `valores`
+        # (arrays con broadcasting, por ejemplo los resultados de MotorPlatos.evaluar). Los nombres que
+        # no son campos del almacén se ignoran.
+        valores = {nombre: np.asarray(valor, dtype=float).ravel() for nombre, valor in valores.items()
+                   if nombre in self.indice}
+        n = np.broadcast_shapes(*(valor.shape for valor in valores.values())) if valores else (1,)
+        filas = self.clonar(base, int(np.prod(n)))
+        bloque = slice(filas.start, filas.stop)
+        for nombre, valor in valores.items():
+            j = self.indice[nombre]
+            self.datos[bloque, j] = valor
+            self.tipos[bloque, j] = AlmacenParametros.FLOTANTE
+        return filas
+
+    def columna(self, nombre):
+        return self.datos[:self.filas, self.indice[nombre]]
+
+    def bloque(self):
+        return self.datos[:self.filas]
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from CargaDiferida import importar_diferido
+from Rutas import directorio_cache
+
+pd = importar_diferido("pandas")
+
+
+class AlmacenPropiedades:
+    # Propiedades físicas de propiedades.xlsx accesibles por nombre.
+    # El libro de Excel solo se analiza la primera vez: los valores se guardan en una caché binaria
+    # (.npz) asociada al tamaño, fecha de modificación y hash del archivo de origen, y en memoria
+    # para el resto de la sesión.
+
+    # Posición (fila, columna) de cada propiedad en la hoja exportada del Unisim
+    CELDAS = {
+        "temperatura_dest": (0, 1),
+        "temperatura_res": (0, 2),
+        "presion_dest": (1, 1),
+        "presion_res": (1, 2),
+        "densidad_dest_liq": (3, 1),
+        "densidad_res_liq": (3, 2),
+        "densidad_dest_vap": (3, 3),
+        "densidad_res_vap": (3, 4),
+        "viscosidad_dest_liq": (4, 1),
+        "viscosidad_res_liq": (4, 2),
+        "viscosidad_dest_vap": (4, 3),
+        "viscosidad_res_vap": (4, 4),
+        "peso_molecular_dest": (5, 1),
+        "peso_molecular_res": (5, 2),
+        "tension_superficial_dest": (6, 1),
+        "tension_superficial_res": (6, 2),
+    }
+
+    # Propiedades ya cargadas en esta sesión, por ruta del libro
+    _en_memoria = {}
+
+    def __init__(self, ruta_excel, ruta_cache=None):
+        self.ruta_excel = os.path.abspath(ruta_excel)
+        self.ruta_cache = ruta_cache or self._ruta_cache_por_defecto(self.ruta_excel)
+        self._valores = self._cargar()
+
+    @staticmethod
+    def _ruta_cache_por_defecto(ruta_excel):
+        nombre = f"propiedades_{hashlib.sha1(ruta_excel.encode('utf-8')).hexdigest()[:12]}.npz"
+        return directorio_cache(nombre)
+
+    @staticmethod
+    def _hash_archivo(ruta):
+        with open(ruta, "rb") as archivo:
+            return hashlib.sha256(archivo.read()).hexdigest()
+
+    def _cargar(self):
+        estado = os.stat(self.ruta_excel)
+        firma = f"{estado.st_size}-{estado.st_mtime_ns}"
+
+        en_memoria = self._en_memoria.get(self.ruta_excel)
+        if en_memoria is not None and en_memoria[0] == firma:
+            return en_memoria[1]
+
+        valores = self._leer_cache(firma)
+        if valores is None:
+            valores = self._leer_excel()
+            self._escribir_cache(firma, valores)
+
+        self._en_memoria[self.ruta_excel] = (firma, valores)
+        return valores
+
+    def _leer_cache(self, firma):
+        try:
+            with np.load(self.ruta_cache, allow_pickle=False) as cache:
+                nombres = [str(nombre) for nombre in cache["nombres"]]
+                valores = dict(zip(nombres, cache["valores"].tolist()))
+                firma_cache = str(cache["firma"])
+                hash_cache = str(cache["hash"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+        if set(nombres) != set(self.CELDAS):
+            return None
+        if firma_cache != firma:
+            # La fecha ha cambiado (copia, instalación...): se comprueba si el contenido es el mismo
+            if hash_cache != self._hash_archivo(self.ruta_excel):
+                return None
+            self._escribir_cache(firma, valores, hash_cache)
+        return valores
+
+    def _leer_excel(self):
+        hoja = pd.read_excel(self.ruta_excel)
+        return {nombre: float(hoja.iloc[fila, columna]) for nombre, (fila, columna) in self.CELDAS.items()}
+
+    def _escribir_cache(self, firma, valores, hash_origen=None):
+        # La caché es opcional: si no se puede escribir se sigue trabajando con los valores en memoria
+        temporal = None
+        try:
+            os.makedirs(os.path.dirname(self.ruta_cache), exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(self.ruta_cache), suffix=".npz")
+            with os.fdopen(descriptor, "wb") as archivo:
+                np.savez(archivo,
+                         nombres=np.array(list(valores), dtype=str),
+                         valores=np.array(list(valores.values()), dtype=float),
+                         firma=np.array(firma),
+                         hash=np.array(hash_origen or self._hash_archivo(self.ruta_excel)))
+            os.replace(temporal, self.ruta_cache)
+        except OSError:
+            if temporal is not None and os.path.exists(temporal):
+                os.remove(temporal)
+
+    @property
+    def nombres(self):
+        return tuple(self._valores)
+
+    def valores(self):
+        return dict(self._valores)
+
+    def __getitem__(self, nombre):
+        try:
+            return self._valores[nombre]
+        except KeyError:
+            raise KeyError(f"Propiedad desconocida: {nombre}") from None
+
+    def __contains__(self, nombre):
+        return nombre in self._valores
@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from MotorPlatos import MotorPlatos
+from CargaDiferida import importar_diferido
+
+pd = importar_diferido("pandas")
+
+
+# Diámetros comerciales de columna en pulgadas, convertidos a metros
+DIAMETROS_COMERCIALES = tuple(round(pulgadas * 0.0254, 4) for pulgadas in (
+    12, 14, 16, 18, 20, 24, 30, 36, 42, 48, 54, 60, 72, 84, 96, 108, 120))
+
+# Rango por defecto de la constante para el área de agujeros (fracción del área activa)
+FRACCIONES_AGUJERO = tuple(np.round(np.linspace(0.05, 0.15, 21), 4))
+
+# Resultados que se conservan por diseño en la tabla final, para acotar la memoria
+COLUMNAS_RESULTADO = (
+    "porcentaje_inundacion", "perdida_total", "nivel_bajante", "tiempo_residencia",
+    "arrastre_fraccional", "numero_agujeros", "coste_instalacion", "coste_walas",
+)
+
+TAMAÑO_BLOQUE = 50_000
+
+
+def _evaluar_bloque(entradas, espaciados, diametros, fracciones, inicio, fin):
+    # Cada proceso reconstruye sus puntos de la malla a partir del rango de índices planos,
+    # de forma que solo viajan entre procesos los ejes de la malla y no la malla completa.
+    i_esp, i_diam, i_frac = np.unravel_index(np.arange(inicio, fin), (len(espaciados), len(diametros),
+                                                                      len(fracciones)))
+    diseño = dict(entradas)
+    diseño["ESPACIADO_SELECCIONADO"] = espaciados[i_esp]
+    diseño["diametro_columna"] = diametros[i_diam]
+    diseño["CONSTANTE_AGUJERO"] = fracciones[i_frac]
+    resultados = MotorPlatos.evaluar(**diseño)
+    bloque = {
+        "ESPACIADO_SELECCIONADO": diseño["ESPACIADO_SELECCIONADO"],
+        "diametro_columna": diseño["diametro_columna"],
+        "CONSTANTE_AGUJERO": diseño["CONSTANTE_AGUJERO"],
+    }
+    bloque.update({nombre: np.array(resultados[nombre]) for nombre in COLUMNAS_RESULTADO})
+    bloque.update(MotorPlatos.comprobar_diseño(resultados))
+    return bloque
+
+
+def barrer(entradas, espaciados=tuple(MotorPlatos.AJUSTES_K1), diametros=DIAMETROS_COMERCIALES,
+           fracciones=FRACCIONES_AGUJERO, procesos=None, tamaño_bloque=TAMAÑO_BLOQUE):
+    # Evalúa el producto cartesiano espaciado × diámetro × fracción de agujeros.
+    # `entradas` contiene el resto de entradas del motor (caudales, propiedades, ...) como escalares.
+    # Devuelve un DataFrame con una fila por diseño, su factibilidad y la primera comprobación que falla.
+    espaciados = np.asarray(espaciados, dtype=float)
+    diametros = np.asarray(diametros, dtype=float)
+    fracciones = np.asarray(fracciones, dtype=float)
+    entradas = {nombre: valor for nombre, valor in entradas.items()
+                if nombre not in ("ESPACIADO_SELECCIONADO", "diametro_columna", "CONSTANTE_AGUJERO")}
+
+    total = len(espaciados) * len(diametros) * len(fracciones)
+    procesos = procesos or os.cpu_count() or 1
+    # Bloques suficientemente pequeños para repartir el trabajo entre todos los procesos
+    tamaño_bloque = max(1, min(tamaño_bloque, -(-total // procesos)))
+    limites = [(inicio, min(inicio + tamaño_bloque, total)) for inicio in range(0, total, tamaño_bloque)]
+    argumentos = [(entradas, espaciados, diametros, fracciones, inicio, fin) for inicio, fin in limites]
+
+    if procesos == 1 or len(limites) == 1:
+        bloques = [_evaluar_bloque(*args) for args in argumentos]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            bloques = list(ejecutor.map(_evaluar_bloque, *zip(*argumentos)))
+
+    return pd.DataFrame({nombre: np.concatenate([bloque[nombre] for bloque in bloques]) for nombre in bloques[0]})
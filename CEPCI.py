@@ -1,53 +1,98 @@
+import csv
+import json
+import os
+
 import numpy as np
 
+from Rutas import ruta_recurso
+
 
 class CEPCI:
-    # Datos de años y sus respectivos índices CEPCI desde 1958 hasta el año más reciente disponible (2023)
-    years = np.array([
-        1959, 1960, 1961, 1962, 1963, 1964, 1965, 1966, 1967, 1968, 1969, 1970,
-        1971, 1972, 1973, 1974, 1975, 1976, 1977, 1978, 1979, 1980, 1981, 1982,
-        1983, 1984, 1985, 1986, 1987, 1988, 1989, 1990, 1991, 1992, 1993, 1994,
-        1995, 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005, 2006,
-        2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018,
-        2019, 2020, 2021, 2022, 2023
-    ])
+    # Índices CEPCI (Chemical Engineering Plant Cost Index, base 1957-1959 = 100), medias anuales
+    # desde 1959 hasta el año más reciente disponible (2023). Los años son consecutivos, de modo que
+    # el índice de un año se obtiene directamente como year - first_year.
+    years = np.arange(1959, 2024)
 
     cepci_indices = np.array([
-        103.8, 108.4, 112.5, 114.4, 117.3, 119.0, 121.0, 123.7, 125.7, 127.9,
-        131.1, 135.2, 140.2, 144.8, 171.3, 203.2, 227.3, 223.1, 229.1, 254.1,
-        297.0, 318.4, 355.4, 390.6, 389.5, 394.1, 390.0, 357.6, 358.2, 381.1,
-        400.0, 418.1, 394.3, 381.1, 359.2, 368.1, 381.7, 381.1, 386.5, 389.5,
-        412.0, 394.0, 395.6, 402.0, 416.2, 468.2, 500.0, 509.0, 525.4, 556.8,
-        584.6, 607.5, 585.7, 607.5, 585.7, 595.2, 556.8, 558.2, 550.8, 556.8,
-        567.5, 603.1, 596.2, 596.1, 689.9, 708.0, 725.8, 739.3, 785.6
+        101.8, 102.0, 101.5, 102.0, 102.4, 103.3, 104.2, 107.2, 109.7, 113.7,  # 1959-1968
+        119.0, 125.7, 132.2, 137.2, 144.1, 165.4, 182.4, 192.1, 204.1, 218.8,  # 1969-1978
+        238.7, 261.2, 297.0, 314.0, 316.9, 322.7, 325.3, 318.4, 323.8, 342.5,  # 1979-1988
+        355.4, 357.6, 361.3, 358.2, 359.2, 368.1, 381.1, 381.7, 386.5, 389.5,  # 1989-1998
+        390.6, 394.1, 394.3, 395.6, 402.0, 444.2, 468.2, 499.6, 525.4, 575.4,  # 1999-2008
+        521.9, 550.8, 585.7, 584.6, 567.3, 576.1, 556.8, 541.7, 567.5, 603.1,  # 2009-2018
+        607.5, 596.2, 708.0, 816.0, 797.9,                                      # 2019-2023
     ])
 
+    # Año de referencia de cada correlación de costes
+    BASE_YEAR_WALAS = 1964
+    BASE_YEAR_SINOT = 1980
+
     @staticmethod
-    def adjust_for_inflation_walas(value):
-        start_year = 1964
-        if start_year not in CEPCI.years:
-            raise ValueError("Año de inicio fuera del rango de los datos disponibles.")
+    def validate(years, indices):
+        # Años enteros consecutivos e índices positivos, uno por año
+        years = np.asarray(years)
+        indices = np.asarray(indices, dtype=float)
+        if years.ndim != 1 or years.shape != indices.shape:
+            raise ValueError(f"La tabla CEPCI tiene {years.size} años y {indices.size} índices")
+        if years.size == 0:
+            raise ValueError("La tabla CEPCI está vacía")
+        if not np.array_equal(years, np.arange(years[0], years[0] + years.size)):
+            raise ValueError("Los años de la tabla CEPCI deben ser consecutivos y crecientes")
+        if not np.all(np.isfinite(indices) & (indices > 0)):
+            raise ValueError("Los índices CEPCI deben ser números positivos")
+        return years.astype(int), indices
+
+    @staticmethod
+    def latest_year():
+        return int(CEPCI.years[-1])
+
+    @staticmethod
+    def index_of(year):
+        # Índice CEPCI de uno o varios años (escalar o array)
+        year = np.asarray(year)
+        position = year.astype(int) - CEPCI.years[0]
+        if np.any(year != np.round(year)) or np.any((position < 0) | (position >= CEPCI.years.size)):
+            raise ValueError(f"Año fuera del rango de los datos disponibles ({CEPCI.years[0]}-{CEPCI.years[-1]})")
+        return CEPCI.cepci_indices[position]
+
+    @staticmethod
+    def escalate(values, from_year, to_year=None):
+        # Actualiza costes de from_year a to_year (por defecto el último año de la tabla).
+        # Valores y años admiten arrays de NumPy con broadcasting.
+        to_year = CEPCI.latest_year() if to_year is None else to_year
+        return np.asarray(values, dtype=float) * (CEPCI.index_of(to_year) / CEPCI.index_of(from_year))
 
-        # Índice CEPCI para el año de inicio (1964)
-        start_index = CEPCI.cepci_indices[np.where(CEPCI.years == start_year)][0]
-        # Índice CEPCI para el año más reciente (2023)
-        end_index = CEPCI.cepci_indices[-1]
+    @staticmethod
+    def load_table(path, replace=False):
+        # Carga índices más recientes desde un CSV (año, índice; cabecera opcional) o un JSON {"año": índice}.
+        # Por defecto se combinan con la tabla actual y los años del archivo prevalecen.
+        if os.path.splitext(path)[1].lower() == ".json":
+            with open(path, encoding="utf-8") as archivo:
+                table = {int(year): float(index) for year, index in json.load(archivo).items()}
+        else:
+            table = {}
+            with open(path, newline="", encoding="utf-8") as archivo:
+                for row in csv.reader(archivo):
+                    if len(row) < 2 or not row[0].strip().lstrip("-").isdigit():
+                        continue  # Cabecera o líneas vacías
+                    table[int(row[0])] = float(row[1])
+        if not replace:
+            table = {**dict(zip(CEPCI.years.tolist(), CEPCI.cepci_indices.tolist())), **table}
+        years = sorted(table)
+        CEPCI.years, CEPCI.cepci_indices = CEPCI.validate(years, [table[year] for year in years])
 
-        # Ajuste del valor según la inflación
-        adjusted_value = value * (end_index / start_index)
-        return adjusted_value
+    @staticmethod
+    def adjust_for_inflation_walas(value):
+        return CEPCI.escalate(value, CEPCI.BASE_YEAR_WALAS)
 
     @staticmethod
     def adjust_for_inflation_sinot(value):
-        start_year = 1980
-        if start_year not in CEPCI.years:
-            raise ValueError("Año de inicio fuera del rango de los datos disponibles.")
-
-        # Índice CEPCI para el año de inicio (1980)
-        start_index = CEPCI.cepci_indices[np.where(CEPCI.years == start_year)][0]
-        # Índice CEPCI para el año más reciente (2023)
-        end_index = CEPCI.cepci_indices[-1]
-
-        # Ajuste del valor según la inflación
-        adjusted_value = value * (end_index / start_index)
-        return adjusted_value
\ No newline at end of file
+        return CEPCI.escalate(value, CEPCI.BASE_YEAR_SINOT)
+
+
+# Tabla integrada validada al importar; un cepci.csv o cepci.json junto al programa la amplía con años
+# más recientes (también en los procesos del barrido, que importan este módulo de nuevo)
+CEPCI.years, CEPCI.cepci_indices = CEPCI.validate(CEPCI.years, CEPCI.cepci_indices)
+for _nombre in ("cepci.csv", "cepci.json"):
+    if os.path.exists(ruta_recurso(_nombre)):
+        CEPCI.load_table(ruta_recurso(_nombre))
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QPixmap
+
+
+class CacheImagenes:
+    # Imágenes de las gráficas cargadas una sola vez (al precargarlas o la primera vez que se usan) y versiones ya
+    # escaladas para cada tamaño en que se muestran. Las entradas se descartan por orden de uso cuando
+    # el tamaño total en memoria supera el límite.
+
+    LIMITE_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, limite_bytes=LIMITE_BYTES):
+        self.limite_bytes = limite_bytes
+        self._entradas = OrderedDict()  # (ruta, ancho, alto) -> QPixmap; (ruta, None, None) es el original
+        self._bytes = 0
+
+    @staticmethod
+    def _tamaño_en_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def _guardar(self, clave, pixmap):
+        self._entradas[clave] = pixmap
+        self._bytes += self._tamaño_en_bytes(pixmap)
+        # Nunca se descarta la entrada recién guardada
+        while self._bytes > self.limite_bytes and len(self._entradas) > 1:
+            _, descartada = self._entradas.popitem(last=False)
+            self._bytes -= self._tamaño_en_bytes(descartada)
+
+    def _obtener(self, clave):
+        pixmap = self._entradas.get(clave)
+        if pixmap is not None:
+            self._entradas.move_to_end(clave)
+        return pixmap
+
+    def original(self, ruta):
+        # Si el archivo no existe se guarda un pixmap nulo, para no volver a intentarlo en cada paso
+        clave = (ruta, None, None)
+        pixmap = self._obtener(clave)
+        if pixmap is None:
+            pixmap = QPixmap(ruta)
+            self._guardar(clave, pixmap)
+        return pixmap
+
+    def escalada(self, ruta, tamaño):
+        # Versión de la imagen ajustada a `tamaño` (QSize) conservando la proporción
+        tamaño = QSize(tamaño)
+        clave = (ruta, tamaño.width(), tamaño.height())
+        pixmap = self._obtener(clave)
+        if pixmap is None:
+            original = self.original(ruta)
+            if original.isNull():
+                return original
+            pixmap = original.scaled(tamaño, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self._guardar(clave, pixmap)
+        return pixmap
+
+    def precargar(self, rutas, tamaños):
+        # Prepara de antemano las versiones escaladas que se van a mostrar
+        for ruta in rutas:
+            for tamaño in tamaños:
+                self.escalada(ruta, tamaño)
+
+    def descartar(self, ruta):
+        # Elimina todas las versiones de una imagen, por ejemplo si el archivo ha cambiado
+        for clave in [clave for clave in self._entradas if clave[0] == ruta]:
+            self._bytes -= self._tamaño_en_bytes(self._entradas.pop(clave))
+
+    @property
+    def bytes_en_uso(self):
+        return self._bytes
@@ -0,0 +1,100 @@
+import json
+import math
+import os
+import warnings
+
+from Rutas import ruta_recurso
+
+
+# Carga en el motor de los ajustes digitalizados de las gráficas (ajustes_<grafica>.json, que escribe
+# AjustesGraficas.py). Está separada de la digitalización para que el arranque no importe ese proceso.
+# Cada archivo se comprueba antes de usarlo; si no es válido se avisa y el motor conserva sus tablas.
+
+DIRECTORIO_AJUSTES = ruta_recurso("ajustes")
+
+# Mayor grado de polinomio admitido en un ajuste
+GRADO_MAXIMO = 6
+
+# Gráficas que usa el motor: (tipo de ajuste, curvas necesarias). Sin curvas necesarias, el nombre de cada
+# curva es el valor del parámetro de la familia (espaciado, porcentaje de inundación).
+GRAFICAS = {
+    "k1": ("lineal", None),
+    "arrastre": ("log", None),
+    "flujoplato": ("log", ("invertido", "doble")),
+}
+
+
+def _coeficientes(nombre, curva):
+    # Coeficientes de una curva del archivo, comprobados
+    coeficientes = curva.get("coeficientes") if isinstance(curva, dict) else None
+    if not isinstance(coeficientes, list) or not 1 <= len(coeficientes) <= GRADO_MAXIMO + 1:
+        raise ValueError(f"la curva {nombre!r} debe tener entre 1 y {GRADO_MAXIMO + 1} coeficientes")
+    if not all(isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+               for valor in coeficientes):
+        raise ValueError(f"la curva {nombre!r} tiene coeficientes no numéricos o no finitos")
+    return tuple(float(valor) for valor in coeficientes)
+
+
+def _parametro(nombre):
+    # Valor del parámetro de la familia que indica el nombre de una curva
+    try:
+        parametro = float(nombre)
+    except ValueError:
+        raise ValueError(f"el nombre de la curva {nombre!r} no es un valor del parámetro de la gráfica") from None
+    if not math.isfinite(parametro):
+        raise ValueError(f"el nombre de la curva {nombre!r} no es un valor finito")
+    return parametro
+
+
+def leer_ajustes(grafica, directorio=DIRECTORIO_AJUSTES):
+    # Coeficientes de cada curva de una gráfica ya procesada, o None si no hay archivo de ajustes. En las
+    # familias de curvas las claves son el valor del parámetro (float). Lanza ValueError si el archivo no
+    # es válido para el motor.
+    ajuste, necesarias = GRAFICAS[grafica]
+    ruta = os.path.join(directorio, f"ajustes_{grafica}.json")
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding="utf-8") as archivo:
+        contenido = json.load(archivo)
+    if not isinstance(contenido, dict) or not isinstance(contenido.get("curvas"), dict):
+        raise ValueError("no contiene las curvas")
+    if contenido.get("ajuste", "lineal") != ajuste:
+        raise ValueError(f"el ajuste es {contenido.get('ajuste')!r} y se esperaba {ajuste!r}")
+    curvas = contenido["curvas"]
+
+    if necesarias is not None:
+        faltan = [nombre for nombre in necesarias if nombre not in curvas]
+        if faltan:
+            raise ValueError(f"faltan las curvas {', '.join(faltan)}")
+        return {nombre: _coeficientes(nombre, curvas[nombre]) for nombre in necesarias}
+
+    ajustes = {}
+    for nombre, curva in curvas.items():
+        parametro = _parametro(nombre)
+        if parametro in ajustes:
+            raise ValueError(f"hay dos curvas para el valor {parametro:g}")
+        ajustes[parametro] = _coeficientes(nombre, curva)
+    if len(ajustes) < 2:
+        raise ValueError("se necesitan los ajustes de al menos dos curvas")
+    return ajustes
+
+
+def cargar_en_motor(motor, directorio=DIRECTORIO_AJUSTES):
+    # Sustituye las tablas de `motor` (la clase MotorPlatos) por los ajustes de las gráficas que los tengan
+    # y sean válidos. Devuelve las gráficas cargadas.
+    usar = {
+        "k1": motor.usar_ajustes_k1,
+        "arrastre": motor.usar_ajustes_arrastre,
+        "flujoplato": motor.usar_ajustes_flujo,
+    }
+    cargadas = []
+    for grafica, usar_ajustes in usar.items():
+        try:
+            ajustes = leer_ajustes(grafica, directorio)
+        except (OSError, ValueError) as error:
+            warnings.warn(f"Ajustes de la gráfica {grafica} no válidos ({error}); se usan los de las tablas")
+            continue
+        if ajustes is not None:
+            usar_ajustes(ajustes)
+            cargadas.append(grafica)
+    return cargadas
@@ -0,0 +1,41 @@
+import importlib
+import sys
+import types
+
+
+class ModuloDiferido(types.ModuleType):
+    # Sustituto de un módulo que no se importa hasta que se accede a alguno de sus atributos.
+    # Permite declarar las dependencias pesadas (pyvista, pandas...) al principio del archivo
+    # sin pagar su importación en el arranque de la aplicación.
+
+    def __init__(self, nombre):
+        super().__init__(nombre)
+        self.__dict__["_modulo"] = None
+
+    def _cargar(self):
+        modulo = self.__dict__["_modulo"]
+        if modulo is None:
+            modulo = importlib.import_module(self.__name__)
+            self.__dict__["_modulo"] = modulo
+        return modulo
+
+    @property
+    def cargado(self):
+        return self.__dict__["_modulo"] is not None
+
+    def __getattr__(self, atributo):
+        return getattr(self._cargar(), atributo)
+
+    def __dir__(self):
+        return dir(self._cargar())
+
+    def __repr__(self):
+        estado = "cargado" if self.cargado else "sin cargar"
+        return f"<módulo diferido '{self.__name__}' ({estado})>"
+
+
+def importar_diferido(nombre):
+    # Si el módulo ya se importó en otro sitio se devuelve directamente
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    return ModuloDiferido(nombre)
@@ -2,14 +2,20 @@ from asyncio import sleep
 import sys
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
                              QPushButton, QListWidget, QListWidgetItem, QTextEdit,
-                             QLineEdit, QFormLayout, QScrollArea, QGroupBox, QComboBox, QMainWindow)
+                             QLineEdit, QFormLayout, QScrollArea, QGroupBox, QComboBox, QMainWindow,
+                             QProgressBar)
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt, pyqtSignal
-from datetime import datetime
 from PyQt5.QtCore import QTimer
 
+from CacheImagenes import CacheImagenes
+from RegistroConsola import RegistroConsola
+
 
 class Item:
+    # Sin __dict__ por instancia: el programa crea muchos Item (y vistas de AlmacenParametros)
+    __slots__ = ("name", "value", "unit", "is_choice", "choices")
+
     def __init__(self, name, value, unit, is_choice=False, choices=None):
         self.name = name
         self.value = value
@@ -57,6 +63,10 @@ class ChemicalProcessInterface(QWidget):
         # Top Left - Parameters List with Scroll Area
         self.param_form_layout = QFormLayout()
         self.param_inputs = {}
+        # Filas mostradas (item, tipo, etiqueta, campo) y widgets retirados disponibles para reutilizar
+        self._filas_formulario = []
+        self._reserva_widgets = {"linea": [], "opciones": [], "etiqueta": []}
+        self._item_de_campo = {}
 
         self.update_parameter_form(self.modifiable_items, self.non_modifiable_items)
 
@@ -74,17 +84,38 @@ class ChemicalProcessInterface(QWidget):
         self.prev_button = QPushButton("Anterior")
         self.next_button = QPushButton("Siguiente")
         self.apply_button = QPushButton("Aplicar")
+        self.optimize_button = QPushButton("Optimizar")
+        self.uncertainty_button = QPushButton("Incertidumbre")
+        self.sensitivity_button = QPushButton("Sensibilidad")
+        self.plates_button = QPushButton("Por platos")
         button_layout.addWidget(self.prev_button)
         button_layout.addWidget(self.next_button)
         button_layout.addWidget(self.apply_button)
+        button_layout.addWidget(self.optimize_button)
+        button_layout.addWidget(self.uncertainty_button)
+        button_layout.addWidget(self.sensitivity_button)
+        button_layout.addWidget(self.plates_button)
         self.left_layout.addLayout(button_layout)
 
+        # Indicador de actividad mientras hay cálculos en segundo plano
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)
+        self.busy_indicator.setTextVisible(False)
+        self.busy_indicator.setFixedHeight(8)
+        self.busy_indicator.hide()
+        self.left_layout.addWidget(self.busy_indicator)
+
         # Connect buttons to signal emitters
         self.prev_button.clicked.connect(lambda: self.emit_button_signal("Anterior"))
         self.next_button.clicked.connect(lambda: self.emit_button_signal("Siguiente"))
         self.apply_button.clicked.connect(lambda: self.emit_button_signal("Aplicar"))
+        self.optimize_button.clicked.connect(lambda: self.emit_button_signal("Optimizar"))
+        self.uncertainty_button.clicked.connect(lambda: self.emit_button_signal("Incertidumbre"))
+        self.sensitivity_button.clicked.connect(lambda: self.emit_button_signal("Sensibilidad"))
+        self.plates_button.clicked.connect(lambda: self.emit_button_signal("Por platos"))
 
         # Top Right - Graphics Display
+        self.imagenes = CacheImagenes()
         self.graphics_display = QLabel()
         self.graphics_display.setFixedSize(520, 380)
         self.graphics_display.setStyleSheet("background-color: white; border: 1px solid black;")
@@ -100,6 +131,7 @@ class ChemicalProcessInterface(QWidget):
         self.console_output = QTextEdit()
         self.console_output.setReadOnly(True)
         self.console_output.setFixedHeight(300)
+        self.registro = RegistroConsola(self.console_output)
         self.bottom_layout.addWidget(self.console_output)
 
         # Combine layouts
@@ -112,6 +144,13 @@ class ChemicalProcessInterface(QWidget):
 
         self.show()
 
+    def set_busy(self, busy):
+        self.busy_indicator.setVisible(busy)
+        if busy:
+            QApplication.setOverrideCursor(Qt.BusyCursor)
+        else:
+            QApplication.restoreOverrideCursor()
+
     def emit_button_signal(self, button_name):
         # Emitir señal personalizada cuando se pulsa un botón
         self.button_clicked.emit(button_name)
@@ -124,14 +163,23 @@ class ChemicalProcessInterface(QWidget):
             # Manejar el error si el valor no es válido
             pass
 
+    def precargar_graficas(self, rutas):
+        # Carga y escala de antemano las gráficas al tamaño del panel
+        self.imagenes.precargar(rutas, [self.graphics_display.size()])
+
     def update_graphics(self, image_path):
-        pixmap = QPixmap(image_path)
-        self.graphics_display.setPixmap(pixmap.scaled(self.graphics_display.size(), Qt.KeepAspectRatio))
-        self.current_pixmap = pixmap  # Guardar pixmap actual para usarlo al hacer clic
+        # Las imágenes se leen una vez y se muestran con la versión ya escalada de la caché
+        self.graphics_display.setPixmap(self.imagenes.escalada(image_path, self.graphics_display.size()))
+        self.current_image = image_path  # Guardar la imagen actual para usarla al hacer clic
 
     def open_fullscreen_image(self, event):
-        if hasattr(self, 'current_pixmap'):
-            self.fullscreen_window = FullScreenImageWindow(self.current_pixmap)
+        if hasattr(self, 'current_image'):
+            pixmap = self.imagenes.original(self.current_image)
+            pantalla = QApplication.primaryScreen().availableGeometry().size()
+            # Solo se reduce si no cabe en la pantalla
+            if pixmap.width() > pantalla.width() or pixmap.height() > pantalla.height():
+                pixmap = self.imagenes.escalada(self.current_image, pantalla)
+            self.fullscreen_window = FullScreenImageWindow(pixmap)
             self.fullscreen_window.show()
 
     def append_console_output(self, text, delay=0):
@@ -141,25 +189,19 @@ class ChemicalProcessInterface(QWidget):
             self._append_text(text)
 
     def _append_text(self, text):
-        symbol = "•"
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_text = f"{symbol} [{timestamp}] {text}"
-        self.console_output.append(formatted_text)
+        self.registro.escribir(text)
 
     def override_console_output(self, text, delay=0):
         if delay > 0:
             QTimer.singleShot(delay * 1000, lambda: self._override_text(text))
         else:
-            self.override_text(text)
+            self._override_text(text)
 
     def _override_text(self, text):
-        symbol = "•"
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_text = f"{symbol} [{timestamp}] {text}"
-        self.console_output.setText(formatted_text)
+        self.registro.reemplazar(text)
 
     def delete_console_contents(self):
-        self.console_output.clear()
+        self.registro.limpiar()
 
     def apply_modifications(self):
         for item in self.modifiable_items:
@@ -180,31 +222,72 @@ class ChemicalProcessInterface(QWidget):
         self.update_parameter_form(new_modifiable_items, new_non_modifiable_items)
 
     def update_parameter_form(self, modifiable_items, non_modifiable_items):
-        # Limpiar el layout existente
-        for i in reversed(range(self.param_form_layout.count())):
-            widget = self.param_form_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
-
-        # Actualizar el formulario de parámetros con nuevas listas
-        self.param_inputs = {}
-
-        for item in modifiable_items:
-            if item.is_choice:
-                input_field = QComboBox()
-                input_field.addItems([str(choice) for choice in item.choices])
-                input_field.setCurrentText(str(item.value))
-            else:
-                input_field = QLineEdit(str(item.value))
-            self.param_form_layout.addRow(f"{item.name} ({item.unit}):", input_field)
-            self.param_inputs[item.name] = input_field
-            if item.is_choice:
-                input_field.currentTextChanged.connect(
-                    lambda text: self.emit_modified_parameter_signal(item, text))
-            else:
-                input_field.textChanged.connect(
-                    lambda text: self.emit_modified_parameter_signal(item, text))
-
-        for item in non_modifiable_items:
-            input_field = QLabel(str(item.value))
-            self.param_form_layout.addRow(f"{item.name} ({item.unit}):", input_field)
+        # El formulario se actualiza por diferencias: si se muestran los mismos items solo se cambian
+        # los textos que difieren, y si cambian las filas los widgets retirados vuelven a una reserva
+        # por tipo para reutilizarlos, en lugar de destruir y crear el árbol de widgets en cada paso.
+        filas = [(item, "opciones" if item.is_choice else "linea") for item in modifiable_items]
+        filas += [(item, "etiqueta") for item in non_modifiable_items]
+        if [(id(item), tipo) for item, tipo in filas] != [(id(fila[0]), fila[1]) for fila in self._filas_formulario]:
+            self._reconstruir_formulario(filas)
+        for item, tipo, etiqueta, campo in self._filas_formulario:
+            self._mostrar_valor(item, tipo, etiqueta, campo)
+        self.param_inputs = {item.name: campo for item, tipo, _, campo in self._filas_formulario if tipo != "etiqueta"}
+
+    def _reconstruir_formulario(self, filas):
+        # takeRow saca la fila del layout sin destruir sus widgets
+        while self.param_form_layout.rowCount():
+            self.param_form_layout.takeRow(0)
+        # Los widgets que ya mostraban un item se le conservan; el resto vuelve a la reserva
+        anteriores = {}
+        for item, tipo, etiqueta, campo in self._filas_formulario:
+            etiqueta.hide()
+            campo.hide()
+            anteriores[(id(item), tipo)] = (etiqueta, campo)
+        claves = {(id(item), tipo) for item, tipo in filas}
+        for clave in [clave for clave in anteriores if clave not in claves]:
+            self._reserva_widgets[clave[1]].append(anteriores.pop(clave))
+
+        self._filas_formulario = []
+        for item, tipo in filas:
+            reserva = self._reserva_widgets[tipo]
+            etiqueta, campo = anteriores.pop((id(item), tipo), None) or (reserva.pop() if reserva
+                                                                         else self._crear_fila(tipo))
+            self._item_de_campo[campo] = item
+            self.param_form_layout.addRow(etiqueta, campo)
+            etiqueta.show()
+            campo.show()
+            self._filas_formulario.append((item, tipo, etiqueta, campo))
+
+    def _crear_fila(self, tipo):
+        # Las señales se conectan una sola vez; el item de cada campo se busca al emitir
+        etiqueta = QLabel()
+        if tipo == "opciones":
+            campo = QComboBox()
+            campo.currentTextChanged.connect(lambda text, campo=campo: self._campo_modificado(campo, text))
+        elif tipo == "linea":
+            campo = QLineEdit()
+            campo.textChanged.connect(lambda text, campo=campo: self._campo_modificado(campo, text))
+        else:
+            campo = QLabel()
+        return etiqueta, campo
+
+    def _campo_modificado(self, campo, text):
+        self.emit_modified_parameter_signal(self._item_de_campo[campo], text)
+
+    def _mostrar_valor(self, item, tipo, etiqueta, campo):
+        # Los cambios hechos desde el programa no emiten parameter_modified
+        texto_etiqueta = f"{item.name} ({item.unit}):"
+        if etiqueta.text() != texto_etiqueta:
+            etiqueta.setText(texto_etiqueta)
+        texto = str(item.value)
+        campo.blockSignals(True)
+        if tipo == "opciones":
+            opciones = [str(choice) for choice in item.choices]
+            if [campo.itemText(i) for i in range(campo.count())] != opciones:
+                campo.clear()
+                campo.addItems(opciones)
+            if campo.currentText() != texto:
+                campo.setCurrentText(texto)
+        elif campo.text() != texto:
+            campo.setText(texto)
+        campo.blockSignals(False)
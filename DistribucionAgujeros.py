@@ -0,0 +1,100 @@
+import numpy as np
+
+
+class DistribucionAgujeros:
+    # Distribución de agujeros al tresbolillo (paso triangular) dentro de la zona perforada real:
+    # el círculo del plato menos los bajantes, las zonas de calma junto a las presas y las bandas
+    # sin perforar del borde. Los centros se obtienen con una rejilla y una máscara vectorizadas.
+    # Longitudes en metros salvo el diámetro de los agujeros, en mm como en el resto del programa.
+
+    ANCHO_ZONA_CALMA = 0.05
+    ANCHO_BANDA_SIN_PERFORAR = 0.05
+
+    # Paso mínimo en diámetros de agujero: por debajo el plato entre agujeros pierde resistencia, y por
+    # debajo de 1 los agujeros se solapan
+    PASO_RELATIVO_MINIMO = 2.0
+
+    # Fracción abierta de una red triangular: (π/4·d²) / (√3/2·p²) = 0.9069·(d/p)²
+    FACTOR_TRIANGULAR = np.pi / (2 * np.sqrt(3))
+
+    @staticmethod
+    def zona_perforada(diametro_columna, longitud_presa,
+                       ancho_zona_calma=ANCHO_ZONA_CALMA, ancho_banda=ANCHO_BANDA_SIN_PERFORAR):
+        # Radio útil, distancia máxima al eje de las presas y área de la zona perforada
+        radio = diametro_columna / 2
+        distancia_presa = np.sqrt(max(radio ** 2 - (longitud_presa / 2) ** 2, 0.0))
+        radio_util = radio - ancho_banda
+        y_util = distancia_presa - ancho_zona_calma
+        if radio_util <= 0 or y_util <= 0:
+            return {"radio_util": radio_util, "y_util": y_util, "area_perforada": 0.0}
+        angulo = np.arcsin(min(y_util / radio_util, 1.0))
+        area = 2 * radio_util ** 2 * (angulo + np.sin(angulo) * np.cos(angulo))
+        return {"radio_util": radio_util, "y_util": y_util, "area_perforada": float(area)}
+
+    @staticmethod
+    def paso_para_area(diametro_agujeros, area_perforada, area_agujeros):
+        # Paso triangular que da el área de agujeros pedida sobre la zona perforada
+        d = diametro_agujeros / 1000
+        return d * np.sqrt(DistribucionAgujeros.FACTOR_TRIANGULAR * area_perforada / area_agujeros)
+
+    @staticmethod
+    def paso_para_numero(area_perforada, numero_agujeros):
+        # Cada agujero de la red triangular ocupa un rombo de área √3/2·p²
+        return np.sqrt(2 * area_perforada / (np.sqrt(3) * numero_agujeros))
+
+    @staticmethod
+    def distribuir(diametro_columna, longitud_presa, diametro_agujeros, paso=None, area_agujeros=None,
+                   numero_agujeros=None, area_activa=None):
+        # El paso se da directamente o se deduce del área de agujeros o del número de agujeros buscado.
+        # Un paso menor que PASO_RELATIVO_MINIMO diámetros (o un área o número de agujeros que lo exigiría)
+        # es un error (ValueError).
+        # Devuelve los centros (N, 2), el número exacto de agujeros y la fracción abierta conseguida.
+        zona = DistribucionAgujeros.zona_perforada(diametro_columna, longitud_presa)
+        d = diametro_agujeros / 1000
+        paso_pedido = paso
+        if paso is None:
+            if area_agujeros is not None:
+                paso = DistribucionAgujeros.paso_para_area(diametro_agujeros, zona["area_perforada"], area_agujeros)
+            elif numero_agujeros is not None:
+                paso = DistribucionAgujeros.paso_para_numero(zona["area_perforada"], numero_agujeros)
+            else:
+                raise ValueError("Se necesita el paso, el área de agujeros o el número de agujeros")
+        if np.isfinite(paso) and paso < DistribucionAgujeros.PASO_RELATIVO_MINIMO * d:
+            minimo = DistribucionAgujeros.PASO_RELATIVO_MINIMO
+            if paso_pedido is not None:
+                raise ValueError(f"El paso de {1000 * paso:.2f} mm es menor que {minimo:g} diámetros de agujero")
+            # Con el paso mínimo se alcanza la mayor fracción abierta posible sobre la zona perforada
+            maximo = DistribucionAgujeros.FACTOR_TRIANGULAR / minimo ** 2 * zona["area_perforada"]
+            raise ValueError(f"Los agujeros pedidos no caben en la zona perforada ({zona['area_perforada']:.4f} m2): "
+                             f"necesitarían un paso de {paso / d:.2f} diámetros y el mínimo es {minimo:g}. "
+                             f"El área de agujeros máxima es {maximo:.4f} m2")
+
+        # Los agujeros deben quedar enteros dentro de la zona perforada
+        radio_centros = zona["radio_util"] - d / 2
+        y_centros = zona["y_util"] - d / 2
+        if not (paso > 0 and np.isfinite(paso)) or radio_centros <= 0 or y_centros <= 0:
+            centros = np.empty((0, 2))
+        else:
+            # Filas separadas √3/2·p, desplazadas medio paso de forma alterna, centradas en el plato
+            altura_fila = paso * np.sqrt(3) / 2
+            filas = np.arange(-np.floor(y_centros / altura_fila), np.floor(y_centros / altura_fila) + 1)
+            columnas = np.arange(-np.ceil(radio_centros / paso) - 1, np.ceil(radio_centros / paso) + 2)
+            j, i = np.meshgrid(filas, columnas, indexing="ij")
+            x = (i + 0.5 * (j % 2)) * paso
+            y = j * altura_fila
+            dentro = x ** 2 + y ** 2 <= radio_centros ** 2
+            centros = np.column_stack([x[dentro], y[dentro]])
+
+        numero = centros.shape[0]
+        area_total_agujeros = numero * (np.pi / 4) * d ** 2
+        return {
+            "centros": centros,
+            "numero_agujeros": numero,
+            "paso": float(paso),
+            "paso_relativo": float(paso / d),
+            "area_perforada": zona["area_perforada"],
+            "area_agujeros": area_total_agujeros,
+            "fraccion_abierta_perforada": area_total_agujeros / zona["area_perforada"] if numero else 0.0,
+            "fraccion_abierta_activa": None if area_activa is None else (
+                area_total_agujeros / area_activa if area_activa > 0 else 0.0),
+        }
@@ -0,0 +1,88 @@
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _SeñalesPaso(QObject):
+    terminado = pyqtSignal(int, object)
+    fallido = pyqtSignal(int, str)
+
+
+class _TareaPaso(QRunnable):
+    # Ejecuta el cálculo de un paso en un hilo del QThreadPool; el resultado vuelve por señales al hilo
+    # de la interfaz, que es el único que toca los widgets
+    def __init__(self, generacion, calculo, cancelado, señales):
+        super().__init__()
+        self.generacion = generacion
+        self.calculo = calculo
+        self.cancelado = cancelado
+        self.señales = señales
+
+    def run(self):
+        try:
+            resultado = self.calculo(self.cancelado)
+        except Exception:
+            self.señales.fallido.emit(self.generacion, traceback.format_exc(limit=3))
+            return
+        self.señales.terminado.emit(self.generacion, resultado)
+
+
+class EjecutorPasos(QObject):
+    # Cálculos de los pasos fuera del hilo de la interfaz.
+    # Cada tarea recibe un número de generación; cancelar() o lanzar otra tarea cancelable la deja
+    # obsoleta y su resultado se descarta al llegar. Los cálculos reciben una función `cancelado()`
+    # para abandonar antes los bucles largos. `ocupado` indica si queda alguna tarea en marcha.
+    ocupado = pyqtSignal(bool)
+
+    def __init__(self, grupo=None, parent=None):
+        super().__init__(parent)
+        self.grupo = grupo or QThreadPool.globalInstance()
+        self.generacion = 0
+        self._respuestas = {}
+        self._señales = _SeñalesPaso()
+        self._señales.terminado.connect(self._al_terminar)
+        self._señales.fallido.connect(self._al_fallar)
+
+    @property
+    def en_marcha(self):
+        return bool(self._respuestas)
+
+    def ejecutar(self, calculo, al_terminar, al_fallar=None, cancelable=True):
+        # calculo(cancelado) se ejecuta en segundo plano y al_terminar(resultado) en el hilo de la interfaz.
+        # Las tareas no cancelables entregan su resultado aunque se cancele o se lance otra después.
+        if cancelable:
+            self.generacion += 1
+            generacion = self.generacion
+            cancelado = lambda: generacion != self.generacion
+        else:
+            generacion = -(len(self._respuestas) + 1)
+            while generacion in self._respuestas:
+                generacion -= 1
+            cancelado = lambda: False
+        if not self._respuestas:
+            self.ocupado.emit(True)
+        self._respuestas[generacion] = (al_terminar, al_fallar)
+        self.grupo.start(_TareaPaso(generacion, calculo, cancelado, self._señales))
+        return generacion
+
+    def cancelar(self):
+        self.generacion += 1
+
+    def _vigente(self, generacion):
+        return generacion < 0 or generacion == self.generacion
+
+    def _retirar(self, generacion):
+        respuesta = self._respuestas.pop(generacion)
+        if not self._respuestas:
+            self.ocupado.emit(False)
+        return respuesta
+
+    def _al_terminar(self, generacion, resultado):
+        al_terminar, _ = self._retirar(generacion)
+        if self._vigente(generacion):
+            al_terminar(resultado)
+
+    def _al_fallar(self, generacion, mensaje):
+        _, al_fallar = self._retirar(generacion)
+        if self._vigente(generacion) and al_fallar is not None:
+            al_fallar(mensaje)
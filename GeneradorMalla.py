@@ -0,0 +1,249 @@
+import numpy as np
+
+from CargaDiferida import importar_diferido
+from DistribucionAgujeros import DistribucionAgujeros
+
+pv = importar_diferido("pyvista")
+spatial = importar_diferido("scipy.spatial")
+
+
+class GeneradorMalla:
+    # Geometría del plato perforado construida a partir del diseño calculado.
+    # Cada parte se devuelve como (vértices, caras) en el formato de caras de VTK
+    # ([n, i0, ..., in-1, n, ...]), generadas con NumPy sin bucles por agujero: los agujeros son
+    # instancias de un único polígono plantilla desplazado a cada centro.
+    # Mientras se construyen, las caras de cada parte se guardan como bloques (m, n) de polígonos con el
+    # mismo número de vértices; así unir partes es desplazar los índices de cada bloque.
+    # Coordenadas en metros; el plano del plato es XY y las presas son paralelas al eje X.
+
+    # Cambia cuando cambia la geometría generada, para invalidar las capturas en caché
+    VERSION = 3
+
+    SEGMENTOS_CIRCUNFERENCIA = 128
+    SEGMENTOS_AGUJERO = 12
+
+    # Zona entre tres agujeros vecinos de la red (agujeros de 12 lados, con vértices cada 30° desde el eje X):
+    # polígono de 9 vértices como (esquina, vértice del agujero), con los tres arcos de los agujeros y los
+    # tramos rectos entre ellos, para los triángulos de la red con la punta arriba (esquinas A, B, C) y con
+    # la punta abajo (D, R, L). Los dos polígonos se triangulan igual: un triángulo central entre los
+    # vértices medios de los arcos y dos por cada lado.
+    ZONA_ARRIBA = (np.array([0, 1, 1, 1, 2, 2, 2, 0, 0]), np.array([0, 6, 5, 4, 10, 9, 8, 2, 1]))
+    ZONA_ABAJO = (np.array([0, 1, 1, 1, 2, 2, 2, 0, 0]), np.array([2, 8, 7, 6, 0, 11, 10, 4, 3]))
+    TRIANGULOS_ZONA = np.array([[8, 2, 5], [8, 0, 1], [8, 1, 2], [2, 3, 4], [2, 4, 5], [5, 6, 7], [5, 7, 8]])
+
+    COLORES = {
+        "cubierta": "white",
+        "zonas_de_calma": "lightsteelblue",
+        "bandas_sin_perforar": "lightgray",
+        "presas": "steelblue",
+        "bajantes": "slategray",
+        "carcasa": "silver",
+        "agujeros": "dimgray",
+    }
+
+    @staticmethod
+    def _caras(bloques):
+        # Caras de VTK a partir de bloques (m, n) de índices de polígonos de n vértices
+        return np.concatenate([np.hstack([np.full((bloque.shape[0], 1), bloque.shape[1]), bloque]).ravel()
+                               for bloque in bloques]).astype(np.int64)
+
+    @staticmethod
+    def _segmento_circular(radio, y_inferior, y_superior, z, segmentos):
+        # Polígono convexo de la intersección del círculo con la franja y_inferior <= y <= y_superior
+        angulo_inferior = np.arcsin(np.clip(y_inferior / radio, -1, 1))
+        angulo_superior = np.arcsin(np.clip(y_superior / radio, -1, 1))
+        derecha = np.linspace(angulo_inferior, angulo_superior, segmentos)
+        izquierda = np.linspace(np.pi - angulo_superior, np.pi - angulo_inferior, segmentos)
+        angulos = np.concatenate([derecha, izquierda])
+        vertices = np.column_stack([radio * np.cos(angulos), radio * np.sin(angulos), np.full(angulos.size, z)])
+        return vertices, [np.arange(vertices.shape[0])[None, :]]
+
+    @staticmethod
+    def _paredes(anillos, desplazamiento):
+        # Cuadriláteros laterales de polígonos cerrados: `anillos` (m, n) son los índices de la cara superior
+        # de cada polígono y `desplazamiento` lo que se suma para llegar a los de la inferior. Con los anillos
+        # en sentido antihorario las normales apuntan hacia fuera del polígono.
+        siguiente = np.roll(anillos, -1, axis=1)
+        return np.stack([anillos, anillos + desplazamiento, siguiente + desplazamiento, siguiente],
+                        axis=-1).reshape(-1, 4)
+
+    @staticmethod
+    def _cuadrilateros(esquinas):
+        # esquinas: array (m, 4, 3) con los cuatro vértices de cada cuadrilátero
+        return esquinas.reshape(-1, 3), [np.arange(esquinas.shape[0] * 4).reshape(-1, 4)]
+
+    @staticmethod
+    def _unir(*partes):
+        # Une partes (vértices, bloques) desplazando los índices de cada una tras los vértices anteriores
+        desplazamientos = np.cumsum([0] + [vertices.shape[0] for vertices, _ in partes[:-1]])
+        return (np.vstack([vertices for vertices, _ in partes]),
+                [bloque + desplazamiento for (_, bloques), desplazamiento in zip(partes, desplazamientos)
+                 for bloque in bloques])
+
+    @staticmethod
+    def _red(centros, paso):
+        # Índices (m, j) de los centros en la red triangular de DistribucionAgujeros: x = m·p + j·p/2,
+        # y = j·√3/2·p
+        j = np.rint(centros[:, 1] / (paso * np.sqrt(3) / 2)).astype(int)
+        m = np.rint(centros[:, 0] / paso - j / 2).astype(int)
+        return m, j
+
+    @staticmethod
+    def _cubierta_perforada(contorno, agujeros, espesor, centros=None, paso=None):
+        # Cubierta con los agujeros atravesándola. contorno: (m, 2), convexo; agujeros: (número de agujeros,
+        # lados, 2).
+        # Si los agujeros forman la red triangular de paso `paso`, la zona entre cada tres agujeros vecinos
+        # (el triángulo de la red menos los sectores de los agujeros) se triangula con una plantilla fija. El
+        # resto de la cubierta, entre el contorno y los agujeros del perímetro de la red, se triangula con
+        # Delaunay y se descartan los triángulos interiores a un agujero (sus tres vértices en el mismo
+        # agujero) o a un triángulo de la red ya cubierto. Los lados de los agujeros y los tramos rectos entre
+        # agujeros vecinos son aristas de la triangulación porque los agujeros están separados más de un
+        # diámetro, así que todas las piezas encajan sin huecos.
+        n_agujeros, lados = agujeros.shape[:2]
+        n_contorno = contorno.shape[0]
+        puntos = np.vstack([contorno, agujeros.reshape(-1, 2)])
+        agujero = np.concatenate([np.full(n_contorno, -1), np.repeat(np.arange(n_agujeros), lados)])
+        triangulos = [np.empty((0, 3), dtype=int)]
+        perimetro = np.ones(n_agujeros, dtype=bool)
+        lleno = None
+
+        if paso is not None and n_agujeros and lados == 12:
+            m, j = GeneradorMalla._red(centros, paso)
+            m0, j0 = m.min() - 1, j.min() - 1
+            rejilla = np.full((m.max() - m0 + 2, j.max() - j0 + 2), -1)
+            rejilla[m - m0, j - j0] = np.arange(n_agujeros)
+            mm, jj = m - m0, j - j0
+            vecinos = [rejilla[mm + dm, jj + dj] for dm, dj in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1))]
+            perimetro = np.any(np.array(vecinos) < 0, axis=0)
+            # Triángulos con dos agujeros abajo (A, B) y uno arriba (C), indexados por A, y con uno abajo (D)
+            # y dos arriba (R, L), indexados por D
+            arriba = np.stack([np.arange(n_agujeros), rejilla[mm + 1, jj], rejilla[mm, jj + 1]], axis=1)
+            abajo = np.stack([np.arange(n_agujeros), rejilla[mm, jj + 1], rejilla[mm - 1, jj + 1]], axis=1)
+            lleno = np.zeros((2,) + rejilla.shape, dtype=bool)
+            lleno[0, mm, jj] = (arriba >= 0).all(axis=1)
+            lleno[1, mm, jj] = (abajo >= 0).all(axis=1)
+            for esquinas, plantilla in ((arriba[lleno[0, mm, jj]], GeneradorMalla.ZONA_ARRIBA),
+                                        (abajo[lleno[1, mm, jj]], GeneradorMalla.ZONA_ABAJO)):
+                esquina, vertice = plantilla
+                poligonos = n_contorno + esquinas[:, esquina] * lados + vertice
+                triangulos.append(poligonos[:, GeneradorMalla.TRIANGULOS_ZONA].reshape(-1, 3))
+
+        # Delaunay solo con el contorno y los agujeros del perímetro de la red
+        usados = np.flatnonzero(np.concatenate([np.ones(n_contorno, dtype=bool), np.repeat(perimetro, lados)]))
+        resto = usados[spatial.Delaunay(puntos[usados]).simplices]
+        dentro_agujero = (agujero[resto[:, 0]] >= 0) & (agujero[resto[:, 0]] == agujero[resto[:, 1]]) \
+            & (agujero[resto[:, 0]] == agujero[resto[:, 2]])
+        resto = resto[~dentro_agujero]
+        if lleno is not None:
+            # Triángulo de la red que contiene el centroide, en coordenadas de la red
+            centroide = puntos[resto].mean(axis=1)
+            b = centroide[:, 1] / (paso * np.sqrt(3) / 2)
+            a = centroide[:, 0] / paso - b / 2
+            fa, fb = a - np.floor(a), b - np.floor(b)
+            de_abajo = fa + fb >= 1
+            a = np.floor(a).astype(int) + de_abajo - m0
+            b = np.floor(b).astype(int) - j0
+            a, b = np.clip(a, 0, lleno.shape[1] - 1), np.clip(b, 0, lleno.shape[2] - 1)
+            resto = resto[~lleno[de_abajo.astype(int), a, b]]
+        triangulos.append(resto)
+        triangulos = np.concatenate(triangulos)
+
+        # Orientación antihoraria vista desde arriba, para que las normales de la cara superior apunten hacia +Z
+        a, b, c = (puntos[triangulos[:, i]] for i in range(3))
+        horario = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]) < 0
+        triangulos[horario] = triangulos[horario][:, ::-1]
+
+        n = puntos.shape[0]
+        vertices = np.vstack([np.column_stack([puntos, np.zeros(n)]), np.column_stack([puntos, np.full(n, -espesor)])])
+        cubierta = (vertices, [triangulos, triangulos[:, ::-1] + n,
+                               GeneradorMalla._paredes(np.arange(n_contorno)[None, :], n)])
+        # Paredes de los agujeros (los taladros), como parte aparte para poder colorearlas
+        anillos = n_contorno + np.arange(n_agujeros * lados).reshape(n_agujeros, lados)
+        taladros = (vertices, [GeneradorMalla._paredes(anillos[:, ::-1], n)])
+        return cubierta, taladros
+
+    @staticmethod
+    def generar(diametro_columna, longitud_presa, diametro_agujeros, paso=None, numero_agujeros=0, centros=None,
+                altura_presa=50.0, espesor_de_plato=5.0, espaciado=0.5):
+        # diametro_agujeros, altura_presa y espesor_de_plato en mm, como en el resto del programa.
+        # Sin centros explícitos, los agujeros se distribuyen al tresbolillo con el paso dado o con el
+        # que da aproximadamente numero_agujeros.
+        segmentos = GeneradorMalla.SEGMENTOS_CIRCUNFERENCIA
+        radio = diametro_columna / 2
+        espesor = espesor_de_plato / 1000
+        medio_presa = longitud_presa / 2
+        distancia_presa = np.sqrt(max(radio ** 2 - medio_presa ** 2, 0.0))
+        zona = DistribucionAgujeros.zona_perforada(diametro_columna, longitud_presa)
+        radio_util, y_util = zona["radio_util"], zona["y_util"]
+        sobre = espesor * 1e-2  # Separación para que las zonas marcadas no coincidan con la cubierta
+        partes = {}
+
+        # Agujeros: un polígono plantilla instanciado en todos los centros a la vez
+        paso_red = None  # Solo se aprovecha la red si los centros salen de DistribucionAgujeros
+        if centros is None:
+            if paso is not None or numero_agujeros > 0:
+                distribucion = DistribucionAgujeros.distribuir(diametro_columna, longitud_presa, diametro_agujeros,
+                                                               paso=paso, numero_agujeros=numero_agujeros)
+                centros, paso_red = distribucion["centros"], distribucion["paso"]
+            else:
+                centros = np.empty((0, 2))
+        centros = np.asarray(centros, dtype=float).reshape(-1, 2)
+        angulos = np.linspace(0, 2 * np.pi, GeneradorMalla.SEGMENTOS_AGUJERO, endpoint=False)
+        plantilla = (diametro_agujeros / 2000) * np.column_stack([np.cos(angulos), np.sin(angulos)])
+
+        # Cubierta del plato entre las dos presas, con su espesor y los agujeros atravesándola
+        contorno, _ = GeneradorMalla._segmento_circular(radio, -distancia_presa, distancia_presa, 0.0, segmentos)
+        partes["cubierta"], partes["agujeros"] = GeneradorMalla._cubierta_perforada(
+            contorno[:, :2], centros[:, None, :] + plantilla[None, :, :], espesor, centros, paso_red)
+
+        # Zonas de calma junto a cada presa
+        partes["zonas_de_calma"] = GeneradorMalla._unir(
+            GeneradorMalla._segmento_circular(radio, y_util, distancia_presa, sobre, segmentos // 4),
+            GeneradorMalla._segmento_circular(radio, -distancia_presa, -y_util, sobre, segmentos // 4))
+
+        # Bandas sin perforar en el borde: cuadriláteros entre el arco exterior y el útil
+        angulo_util = np.arcsin(np.clip(y_util / radio_util, -1, 1))
+        angulos = np.concatenate([np.linspace(-angulo_util, angulo_util, segmentos // 2),
+                                  np.linspace(np.pi - angulo_util, np.pi + angulo_util, segmentos // 2)])
+        angulos = angulos.reshape(2, -1)
+        a0, a1 = angulos[:, :-1].ravel(), angulos[:, 1:].ravel()
+        esquinas = np.stack([
+            np.column_stack([radio_util * np.cos(a0), radio_util * np.sin(a0)]),
+            np.column_stack([radio * np.cos(a0), radio * np.sin(a0)]),
+            np.column_stack([radio * np.cos(a1), radio * np.sin(a1)]),
+            np.column_stack([radio_util * np.cos(a1), radio_util * np.sin(a1)]),
+        ], axis=1)
+        esquinas = np.concatenate([esquinas, np.full(esquinas.shape[:2] + (1,), sobre)], axis=2)
+        partes["bandas_sin_perforar"] = GeneradorMalla._cuadrilateros(esquinas)
+
+        # Presas (hacia arriba) y faldones de los bajantes (hacia abajo) en y = ±distancia_presa
+        altura = altura_presa / 1000
+        profundidad_bajante = max(espaciado - (altura_presa - 10) / 1000, 0.0)
+        presas, bajantes = [], []
+        for signo in (1, -1):
+            y = signo * distancia_presa
+            presas.append([[-medio_presa, y, 0], [medio_presa, y, 0], [medio_presa, y, altura],
+                           [-medio_presa, y, altura]])
+            bajantes.append([[-medio_presa, y, -espesor], [medio_presa, y, -espesor],
+                             [medio_presa, y, -profundidad_bajante], [-medio_presa, y, -profundidad_bajante]])
+        partes["presas"] = GeneradorMalla._cuadrilateros(np.array(presas, dtype=float))
+        partes["bajantes"] = GeneradorMalla._cuadrilateros(np.array(bajantes, dtype=float))
+
+        # Tramo corto de carcasa alrededor del plato (sin tapar la vista de la cubierta)
+        angulos = np.linspace(0, 2 * np.pi, segmentos + 1)
+        a0, a1 = angulos[:-1], angulos[1:]
+        z_inferior, z_superior = -2 * altura, 2 * altura
+        esquinas = np.stack([
+            np.column_stack([radio * np.cos(a0), radio * np.sin(a0), np.full(segmentos, z_inferior)]),
+            np.column_stack([radio * np.cos(a1), radio * np.sin(a1), np.full(segmentos, z_inferior)]),
+            np.column_stack([radio * np.cos(a1), radio * np.sin(a1), np.full(segmentos, z_superior)]),
+            np.column_stack([radio * np.cos(a0), radio * np.sin(a0), np.full(segmentos, z_superior)]),
+        ], axis=1)
+        partes["carcasa"] = GeneradorMalla._cuadrilateros(esquinas)
+
+        return {nombre: (vertices, GeneradorMalla._caras(bloques)) for nombre, (vertices, bloques) in partes.items()}
+
+    @staticmethod
+    def a_pyvista(partes):
+        # Convierte las partes generadas en mallas de pyvista
+        return {nombre: pv.PolyData(vertices, caras) for nombre, (vertices, caras) in partes.items()}
@@ -0,0 +1,113 @@
+import numpy as np
+
+from MotorPlatos import MotorPlatos
+
+
+class GrafoCalculo:
+    # Grafo de dependencias entre las magnitudes del diseño, construido a partir de MotorPlatos.CALCULOS.
+    # Al modificar una entrada solo se marcan como pendientes los cálculos que dependen de ella, y
+    # recalcular() los ejecuta en orden topológico. Si las salidas de un cálculo no cambian, sus
+    # dependientes no se vuelven a calcular.
+
+    def __init__(self, calculos=MotorPlatos.CALCULOS, valores=None):
+        self.calculos = calculos
+        self._productor = {}
+        self._consumidores = {}
+        for indice, (funcion, entradas, salidas) in enumerate(calculos):
+            for nombre in salidas:
+                if nombre in self._productor:
+                    raise ValueError(f"{nombre} lo calculan {calculos[self._productor[nombre]][0]} y {funcion}")
+                self._productor[nombre] = indice
+            for nombre in entradas:
+                self._consumidores.setdefault(nombre, []).append(indice)
+        self.orden = self._orden_topologico()
+        self._posicion = {indice: posicion for posicion, indice in enumerate(self.orden)}
+
+        self.valores = dict(MotorPlatos.VALORES_POR_DEFECTO)
+        self.valores.update(valores or {})
+        # Al principio todos los cálculos están pendientes
+        self._pendientes = set(range(len(calculos)))
+
+    def _orden_topologico(self):
+        # Algoritmo de Kahn, conservando el orden de CALCULOS entre cálculos independientes
+        previos = [{self._productor[nombre] for nombre in entradas if nombre in self._productor}
+                   for _, entradas, _ in self.calculos]
+        restantes = [len(p) for p in previos]
+        siguientes = [[] for _ in self.calculos]
+        for indice, p in enumerate(previos):
+            for previo in p:
+                siguientes[previo].append(indice)
+        listos = [indice for indice, n in enumerate(restantes) if n == 0]
+        orden = []
+        while listos:
+            indice = min(listos)
+            listos.remove(indice)
+            orden.append(indice)
+            for siguiente in siguientes[indice]:
+                restantes[siguiente] -= 1
+                if restantes[siguiente] == 0:
+                    listos.append(siguiente)
+        if len(orden) != len(self.calculos):
+            raise ValueError("Las dependencias entre cálculos forman un ciclo")
+        return orden
+
+    @property
+    def entradas(self):
+        # Magnitudes que no calcula ningún nodo del grafo
+        return tuple(nombre for nombre in self._consumidores if nombre not in self._productor)
+
+    @staticmethod
+    def _distinto(anterior, nuevo):
+        anterior, nuevo = np.asarray(anterior), np.asarray(nuevo)
+        # equal_nan solo es aplicable a magnitudes numéricas (no al tipo de flujo)
+        numericos = anterior.dtype.kind in "biufc" and nuevo.dtype.kind in "biufc"
+        return not np.array_equal(anterior, nuevo, equal_nan=numericos)
+
+    def _marcar_dependientes(self, nombre):
+        self._pendientes.update(self._consumidores.get(nombre, ()))
+
+    def actualizar(self, valores):
+        # Asigna nuevas entradas; solo las que cambian marcan a sus dependientes como pendientes
+        for nombre, valor in valores.items():
+            if nombre in self._productor:
+                raise KeyError(f"{nombre} es un resultado calculado y no se puede asignar")
+            if nombre not in self.valores or self._distinto(self.valores[nombre], valor):
+                self.valores[nombre] = valor
+                self._marcar_dependientes(nombre)
+
+    def recalcular(self):
+        # Ejecuta los cálculos pendientes en orden topológico. Los que aún no tienen todas sus entradas
+        # siguen pendientes. Devuelve {nombre: (valor anterior, valor nuevo)} de los resultados que cambian.
+        cambios = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for indice in self.orden:
+                if indice not in self._pendientes:
+                    continue
+                funcion, entradas, salidas = self.calculos[indice]
+                if any(nombre not in self.valores for nombre in entradas):
+                    continue
+                self._pendientes.discard(indice)
+                resultado = MotorPlatos.calcular(funcion, [self.valores[nombre] for nombre in entradas], salidas)
+                for nombre, valor in resultado.items():
+                    valor = np.asarray(valor).item() if np.ndim(valor) == 0 else valor
+                    anterior = self.valores.get(nombre)
+                    if nombre not in self.valores or self._distinto(anterior, valor):
+                        self.valores[nombre] = valor
+                        cambios[nombre] = (anterior, valor)
+                        self._marcar_dependientes(nombre)
+        return cambios
+
+    def pendientes(self):
+        # Resultados desactualizados: salidas de los cálculos que todavía no se han podido ejecutar
+        return [nombre for indice in sorted(self._pendientes, key=self._posicion.get)
+                for nombre in self.calculos[indice][2]]
+
+    def dependientes(self, nombre):
+        # Todas las magnitudes que se calculan, directa o indirectamente, a partir de `nombre`
+        visitados, frontera = set(), [nombre]
+        while frontera:
+            for indice in self._consumidores.get(frontera.pop(), ()):
+                if indice not in visitados:
+                    visitados.add(indice)
+                    frontera.extend(self.calculos[indice][2])
+        return [salida for indice in self.orden if indice in visitados for salida in self.calculos[indice][2]]
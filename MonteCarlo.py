@@ -0,0 +1,149 @@
+import numpy as np
+
+from MotorPlatos import MotorPlatos
+from Optimizador import margenes, RESTRICCIONES, TIEMPO_RESIDENCIA_MINIMO, INUNDACION_MAXIMA
+
+
+# Incertidumbre por defecto de las entradas: (distribución, dispersión relativa al valor nominal).
+# "normal" usa la dispersión como desviación típica, "uniforme" y "triangular" como semiancho del
+# intervalo y "lognormal" como sigma del logaritmo (mediana igual al valor nominal).
+INCERTIDUMBRES = {
+    "Ln_flow": ("normal", 0.05),
+    "Vn_flow": ("normal", 0.05),
+    "Lm_flow": ("normal", 0.05),
+    "Vm_flow": ("normal", 0.05),
+    "densidad_dest_liq": ("normal", 0.02),
+    "densidad_dest_vap": ("normal", 0.05),
+    "densidad_res_liq": ("normal", 0.02),
+    "densidad_res_vap": ("normal", 0.05),
+    "tension_superficial_dest": ("uniforme", 0.10),
+    "tension_superficial_res": ("uniforme", 0.10),
+}
+
+DISTRIBUCIONES = ("normal", "uniforme", "triangular", "lognormal")
+
+# Magnitudes de las que se dan bandas de percentiles. Las que no dependen de ninguna entrada muestreada
+# (los costes, con las incertidumbres por defecto) se señalan como deterministas en el resultado.
+SALIDAS = (
+    "velocidad_inundación_bottom", "porcentaje_inundacion", "velocidad_min_real", "velocidad_min_teorica",
+    "perdida_total", "nivel_bajante", "tiempo_residencia", "arrastre_fraccional", "coste_instalacion", "coste_walas",
+)
+
+PERCENTILES = (5, 50, 95)
+
+# Muestras por bloque y tamaño de la muestra que se guarda para los percentiles
+TAMAÑO_BLOQUE = 100_000
+TAMAÑO_RESERVA = 100_000
+
+
+def muestrear(generador, nominal, distribucion, dispersion, n):
+    # n valores de una entrada alrededor de su valor nominal
+    if distribucion == "normal":
+        return nominal * (1 + dispersion * generador.standard_normal(n))
+    if distribucion == "uniforme":
+        return nominal * (1 + dispersion * generador.uniform(-1, 1, n))
+    if distribucion == "triangular":
+        return nominal * (1 + dispersion * generador.triangular(-1, 0, 1, n))
+    if distribucion == "lognormal":
+        return nominal * np.exp(dispersion * generador.standard_normal(n))
+    raise ValueError(f"Distribución desconocida: {distribucion}. Opciones: {', '.join(DISTRIBUCIONES)}")
+
+
+def montecarlo(entradas, muestras=1_000_000, incertidumbres=None, semilla=0, percentiles=PERCENTILES,
+               tiempo_minimo=TIEMPO_RESIDENCIA_MINIMO, inundacion_maxima=INUNDACION_MAXIMA,
+               tamaño_bloque=TAMAÑO_BLOQUE, tamaño_reserva=TAMAÑO_RESERVA, cancelado=None):
+    # Propaga la incertidumbre de las entradas por todos los cálculos del motor para un diseño fijo.
+    # `entradas` contiene todas las entradas del motor como escalares; las indicadas en `incertidumbres`
+    # se muestrean alrededor de su valor. Cada bloque usa su propio generador derivado de `semilla`,
+    # así el resultado es reproducible y la memoria no depende del número de muestras.
+    # Las probabilidades de fallo se cuentan sobre todas las muestras; los percentiles se calculan sobre
+    # una muestra aleatoria uniforme de tamaño `tamaño_reserva` (la de menores claves aleatorias), y la
+    # media, la desviación típica y los extremos sobre todas. La media y la suma de cuadrados de las
+    # desviaciones se calculan en cada bloque y se combinan con las anteriores (Chan et al.), lo que evita
+    # la cancelación de restar n·media² a la suma de cuadrados.
+    # `cancelado` se consulta entre bloques; si devuelve True se abandona y se devuelve None.
+    if muestras <= 0:
+        raise ValueError("El número de muestras debe ser positivo")
+    incertidumbres = INCERTIDUMBRES if incertidumbres is None else incertidumbres
+    desconocidas = [nombre for nombre in incertidumbres if nombre not in MotorPlatos.ENTRADAS]
+    if desconocidas:
+        raise KeyError(f"Entradas desconocidas: {', '.join(desconocidas)}")
+    comprobaciones = ("k1_fuera_de_grafica",) + RESTRICCIONES
+
+    fallos = dict.fromkeys(comprobaciones, 0)
+    fallos_alguna = 0
+    media = np.zeros(len(SALIDAS))
+    m2 = np.zeros(len(SALIDAS))
+    minimo = np.full(len(SALIDAS), np.inf)
+    maximo = np.full(len(SALIDAS), -np.inf)
+    validas = np.zeros(len(SALIDAS), dtype=np.int64)
+    claves = np.empty(0)
+    reserva = np.empty((0, len(SALIDAS)))
+
+    bloques = range(0, muestras, tamaño_bloque)
+    for inicio, secuencia in zip(bloques, np.random.SeedSequence(semilla).spawn(len(bloques))):
+        if cancelado is not None and cancelado():
+            return None
+        n = min(tamaño_bloque, muestras - inicio)
+        generador = np.random.default_rng(secuencia)
+        diseño = dict(entradas)
+        for nombre, (distribucion, dispersion) in incertidumbres.items():
+            diseño[nombre] = muestrear(generador, float(entradas[nombre]), distribucion, dispersion, n)
+        with np.errstate(all="ignore"):
+            resultados = MotorPlatos.evaluar(**diseño)
+            holguras = margenes(resultados, tiempo_minimo, inundacion_maxima)
+        incumple = {"k1_fuera_de_grafica": ~(np.isfinite(resultados["K1"]) & np.isfinite(resultados["K2"]))}
+        incumple.update({nombre: ~(holguras[nombre] >= 0) for nombre in RESTRICCIONES})
+        for nombre in comprobaciones:
+            fallos[nombre] += int(np.count_nonzero(incumple[nombre]))
+        fallos_alguna += int(np.count_nonzero(np.logical_or.reduce(list(incumple.values()))))
+
+        valores = np.column_stack([np.broadcast_to(resultados[nombre], (n,)) for nombre in SALIDAS])
+        finitos = np.isfinite(valores)
+        n_bloque = finitos.sum(axis=0)
+        minimo_bloque = np.where(finitos, valores, np.inf).min(axis=0)
+        minimo = np.minimum(minimo, minimo_bloque)
+        maximo = np.maximum(maximo, np.where(finitos, valores, -np.inf).max(axis=0))
+
+        # Momentos del bloque respecto a su mínimo, para que una salida constante dé dispersión nula exacta
+        con_datos = n_bloque > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media_bloque = minimo_bloque + np.where(finitos, valores - minimo_bloque, 0.0).sum(axis=0) / n_bloque
+            m2_bloque = (np.where(finitos, valores - media_bloque, 0.0) ** 2).sum(axis=0)
+            total = validas + n_bloque
+            delta = media_bloque - media
+            media = np.where(con_datos, media + delta * n_bloque / total, media)
+            m2 = np.where(con_datos, m2 + m2_bloque + delta ** 2 * validas * n_bloque / total, m2)
+        validas = total
+
+        # Reserva: las tamaño_reserva muestras con menor clave aleatoria forman una muestra uniforme
+        claves = np.concatenate([claves, generador.random(n)])
+        reserva = np.concatenate([reserva, valores])
+        if claves.size > tamaño_reserva:
+            conservar = np.argpartition(claves, tamaño_reserva)[:tamaño_reserva]
+            claves, reserva = claves[conservar], reserva[conservar]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = np.where(validas > 0, media, np.nan)
+        desviacion = np.where(validas > 0, np.sqrt(m2 / np.maximum(validas - 1, 1)), np.nan)
+        bandas = np.nanpercentile(reserva, percentiles, axis=0) if reserva.size else np.full(
+            (len(percentiles), len(SALIDAS)), np.nan)
+
+    probabilidad = {nombre: fallos[nombre] / muestras for nombre in comprobaciones}
+    probabilidad_alguna = fallos_alguna / muestras
+    return {
+        "muestras": muestras,
+        "semilla": semilla,
+        "probabilidad_fallo": probabilidad,
+        "probabilidad_fallo_total": probabilidad_alguna,
+        # Error típico de cada probabilidad estimada
+        "error_probabilidad": {nombre: float(np.sqrt(p * (1 - p) / muestras)) for nombre, p in
+                               {**probabilidad, "total": probabilidad_alguna}.items()},
+        "percentiles": {nombre: dict(zip(percentiles, bandas[:, i].tolist())) for i, nombre in enumerate(SALIDAS)},
+        "media": dict(zip(SALIDAS, media.tolist())),
+        "desviacion": dict(zip(SALIDAS, desviacion.tolist())),
+        "minimo": dict(zip(SALIDAS, minimo.tolist())),
+        "maximo": dict(zip(SALIDAS, maximo.tolist())),
+        # Salidas que toman el mismo valor en todas las muestras: no dependen de las entradas inciertas
+        "deterministas": tuple(nombre for i, nombre in enumerate(SALIDAS) if minimo[i] == maximo[i]),
+    }
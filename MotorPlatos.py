@@ -0,0 +1,549 @@
+import numpy as np
+
+from CargaAjustes import cargar_en_motor
+from CEPCI import CEPCI
+
+
+class MotorPlatos:
+    # Motor de cálculo del diseño de platos sin dependencias de la interfaz gráfica.
+    # Todas las funciones aceptan escalares o arrays de NumPy (con broadcasting) y devuelven
+    # arrays, de modo que se pueden evaluar miles de diseños candidatos en una sola llamada.
+
+    # Entradas necesarias para evaluar un diseño completo (nombres iguales a los atributos de TFG)
+    ENTRADAS = (
+        "Ln_flow", "Vn_flow", "Lm_flow", "Vm_flow",
+        "densidad_dest_liq", "densidad_dest_vap", "densidad_res_liq", "densidad_res_vap",
+        "tension_superficial_dest", "tension_superficial_res",
+        "peso_molecular_dest", "peso_molecular_res",
+        "ESPACIADO_SELECCIONADO", "diametro_columna", "CONSTANTE_AGUJERO",
+        "altura_presa", "diametro_agujeros", "fraccion_bajante",
+        "Num_pisos", "Efi", "espesor_pared", "Densidad_material", "Presion_trabajo", "Esfuerzo",
+    )
+
+    # Cálculos del diseño en el orden de los pasos del programa: (función, entradas, salidas).
+    # Es la descripción de las dependencias entre magnitudes que usan evaluar y GrafoCalculo; las funciones
+    # que devuelven un diccionario aportan todas las salidas indicadas, el resto una sola.
+    CALCULOS = (
+        # Paso 3: factor líquido-vapor, K1, velocidades de inundación, áreas y diámetros
+        ("obtener_flv", ("Ln_flow", "Vn_flow", "densidad_dest_vap", "densidad_dest_liq"), ("Factor_liqvap_top",)),
+        ("obtener_flv", ("Lm_flow", "Vm_flow", "densidad_res_vap", "densidad_res_liq"), ("Factor_liqvap_bottom",)),
+        ("calcular_ajustes_grafica_k1", ("Factor_liqvap_top", "ESPACIADO_SELECCIONADO"), ("K1",)),
+        ("calcular_ajustes_grafica_k1", ("Factor_liqvap_bottom", "ESPACIADO_SELECCIONADO"), ("K2",)),
+        ("calcular_correccion_k1", ("tension_superficial_dest", "K1"), ("K1_c",)),
+        ("calcular_correccion_k1", ("tension_superficial_res", "K2"), ("K2_c",)),
+        ("calcular_velocidad_maxima", ("K1_c", "densidad_dest_liq", "densidad_dest_vap"),
+         ("velocidad_inundación_top",)),
+        ("calcular_velocidad_maxima", ("K2_c", "densidad_res_liq", "densidad_res_vap"),
+         ("velocidad_inundación_bottom",)),
+        ("velocidad_maxima_85", ("velocidad_inundación_top",), ("velocidad_inundación_top_correc",)),
+        ("velocidad_maxima_85", ("velocidad_inundación_bottom",), ("velocidad_inundación_bottom_correc",)),
+        ("calcular_flujo_volumetrico", ("Vn_flow", "peso_molecular_dest", "densidad_dest_vap"),
+         ("flujo_vap_max_top",)),
+        ("calcular_flujo_volumetrico", ("Vm_flow", "peso_molecular_res", "densidad_res_vap"),
+         ("flujo_vap_max_bottom",)),
+        ("calcular_areas", ("flujo_vap_max_top", "velocidad_inundación_top_correc"), ("area_total_top",)),
+        ("calcular_areas", ("flujo_vap_max_bottom", "velocidad_inundación_bottom_correc"), ("area_total_bottom",)),
+        ("calculo_diametro", ("area_total_top",), ("diametro_columna_top",)),
+        ("calculo_diametro", ("area_total_bottom",), ("diametro_columna_bottom",)),
+        # Paso 5: flujo volumétrico de líquido máximo
+        ("calculo_flujo_liq_maximo", ("Lm_flow", "peso_molecular_res", "densidad_res_liq"), ("flujo_liq_max",)),
+        ("clasificar_flujo", ("flujo_liq_max", "diametro_columna"),
+         ("patron_flujo", "flujo_limite_invertido", "flujo_limite_doble")),
+        # Paso 6: diseño provisional de plato
+        ("calculo_de_areas_en_la_columna", ("CONSTANTE_AGUJERO", "diametro_columna", "fraccion_bajante"),
+         ("area_columna", "area_bajante", "area_neta", "area_activa", "area_agujeros", "longitud_presa")),
+        # Paso 7: comprobación del punto de goteo
+        ("comprobar_weeping", ("flujo_liq_max", "longitud_presa", "area_agujeros", "densidad_res_liq", "altura_presa",
+                               "diametro_agujeros", "flujo_vap_max_bottom"),
+         ("tasa_max_liq", "tasa_min_liq", "max_altura_sobre_presa", "min_altura_sobre_presa", "altura_liq_tasa_min",
+          "K2p", "velocidad_min_teorica", "velocidad_min_real", "tiene_weeping")),
+        # Paso 8: caída de presión
+        ("obtener_presion", ("area_agujeros", "flujo_vap_max_bottom", "densidad_res_liq", "densidad_res_vap",
+                             "altura_presa"),
+         ("velocidad_max", "Co", "perdida_plato_seco", "perdida_residual", "perdida_total", "dif_presion")),
+        # Paso 9: nivel de líquido en el bajante
+        ("nivel_de_liquido_en_el_bajante", ("altura_presa", "longitud_presa", "area_bajante", "tasa_max_liq",
+                                            "densidad_res_liq", "perdida_total", "ESPACIADO_SELECCIONADO"),
+         ("altura_apron", "area_apron", "usa_area_apron", "perdida_bajante", "nivel_bajante", "nivel_bajante_maximo",
+          "bajante_aceptable")),
+        # Pasos 10 y 11: tiempo de residencia y porcentaje de inundación
+        ("calculo_tiempo_residencia", ("area_bajante", "nivel_bajante", "densidad_res_liq", "tasa_max_liq"),
+         ("tiempo_residencia",)),
+        ("porcentaje_flooding", ("flujo_vap_max_bottom", "area_neta", "velocidad_inundación_bottom"),
+         ("velocidad_area_neta", "porcentaje_inundacion")),
+        # Paso 11: arrastre fraccional y eficiencia corregida
+        ("calcular_arrastre", ("Factor_liqvap_bottom", "porcentaje_inundacion", "Efi"),
+         ("arrastre_fraccional", "eficiencia_con_arrastre", "arrastre_aceptable")),
+        # Paso 12: zonas sin perforar y número de agujeros
+        ("calcular_area_perforada", ("diametro_columna", "area_total_top", "longitud_presa", "diametro_agujeros",
+                                     "area_agujeros"),
+         ("angulo_borde_plato", "diametro_bandas_sin_perforar", "area_bandas_sin_perforar", "diametro_zonas_de_calma",
+          "area_zonas_de_calma", "area_perforada", "area_de_un_agujero", "numero_agujeros")),
+        # Paso 14: estimación de costes
+        ("calcular_precio_sinot", ("diametro_columna", "espesor_pared", "Densidad_material", "Num_pisos",
+                                   "ESPACIADO_SELECCIONADO"),
+         ("longitud_carcasa", "peso_carcasa", "coste_carcasa", "coste_platos", "coste_total", "coste_cepci",
+          "coste_instalacion")),
+        ("calcular_precio_walas", ("peso_carcasa", "longitud_carcasa", "diametro_columna", "espesor_pared", "Num_pisos",
+                                   "Presion_trabajo", "Esfuerzo"),
+         ("coste_walas_carcasa", "coste_walas_platos", "coste_walas_plataformas", "coste_walas")),
+    )
+
+    # Factor de instalación aplicado al coste de compra en los dos métodos de estimación
+    FACTOR_INSTALACION = 4
+
+    # Fracción del área de la columna ocupada por el bajante
+    FRACCION_BAJANTE = 0.12
+
+    # Valores fijos del diseño provisional de plato (altura de presa y diámetro de agujeros en mm)
+    VALORES_POR_DEFECTO = {
+        "altura_presa": 50.0,
+        "diametro_agujeros": 5.0,
+        "fraccion_bajante": FRACCION_BAJANTE,
+    }
+    ESPESOR_DE_PLATO = 5.0
+
+    # Ajustes de la gráfica de K1 para cada espaciado de platos (coeficientes de mayor a menor grado)
+    AJUSTES_K1 = {
+        0.25: (0.0278, -0.0593, 0.053),
+        0.3: (0.0372, -0.0786, 0.0653),
+        0.45: (0.0561, -0.1097, 0.0848),
+        0.5: (0.0496, -0.1121, 0.0938),
+        0.6: (-0.2942, 0.595, -0.4105, 0.1442),
+    }
+
+    # Ajustes de la gráfica de arrastre fraccional de Fair para cada porcentaje de inundación:
+    # log10(ψ) como polinomio de log10(FLV) (coeficientes de mayor a menor grado), válidos para FLV entre
+    # 0.01 y 1. Obtenidos de lecturas de la gráfica, con una desviación máxima de 0.04 en log10(ψ).
+    AJUSTES_ARRASTRE = {
+        30: (-0.1947, -1.1927, -3.7110),
+        35: (-0.2106, -1.2279, -3.5387),
+        40: (-0.2188, -1.2525, -3.3941),
+        45: (-0.2089, -1.2387, -3.2359),
+        50: (-0.2259, -1.2685, -3.1039),
+        60: (-0.2604, -1.3644, -2.8904),
+        70: (-0.2655, -1.3603, -2.5973),
+        80: (-0.2845, -1.3818, -2.3001),
+        90: (-0.2839, -1.3552, -1.9889),
+        95: (-0.3175, -1.3950, -1.8043),
+    }
+
+    # Fronteras de la gráfica de selección del tipo de flujo sobre el plato: log10 del caudal volumétrico de
+    # líquido (m3/s) como polinomio de log10 del diámetro de la columna (m), válidas para diámetros entre 0.5
+    # y 10 m. Por debajo de "invertido" el flujo es invertido, por encima de "doble" se necesitan dos pasos
+    # y entre ambas el flujo es cruzado. Obtenidos de lecturas de la gráfica, con una desviación máxima de
+    # 0.02 en log10(caudal).
+    AJUSTES_FLUJO = {
+        "invertido": (-0.2084, 1.4391, -2.9373),
+        "doble": (0.0489, 1.0462, -1.9151),
+    }
+
+    # Tipos de flujo sobre el plato, de menor a mayor caudal de líquido. El diseño del plato supone flujo
+    # cruzado de un solo paso.
+    TIPOS_FLUJO = ("invertido", "cruzado", "doble")
+
+    # Arrastre fraccional máximo para que no afecte apreciablemente a la eficiencia de plato
+    ARRASTRE_MAXIMO = 0.1
+
+    # Intervalo del factor líquido-vapor que cubre la gráfica de K1
+    RANGO_FLV_K1 = (0.01, 1.0)
+
+    # Tratamiento de FLV y espaciados fuera de la gráfica de K1: "nan" los marca como fuera de la
+    # gráfica, "limitar" usa el borde de la gráfica y "extrapolar" prolonga los ajustes
+    FUERA_DE_RANGO_K1 = ("nan", "limitar", "extrapolar")
+
+    @staticmethod
+    def _tabla_de_curvas(ajustes):
+        # Tabla de una familia de curvas polinómicas ({parámetro: coeficientes}): parámetros crecientes y una
+        # fila de coeficientes por curva, completada con ceros por la izquierda hasta el mayor grado
+        parametros = np.array(sorted(ajustes), dtype=float)
+        if parametros.size < 2:
+            raise ValueError("Se necesitan los ajustes de al menos dos curvas")
+        grado = max(len(coeficientes) for coeficientes in ajustes.values())
+        coeficientes = np.array([np.pad(np.asarray(ajustes[parametro], dtype=float),
+                                        (grado - len(ajustes[parametro]), 0)) for parametro in sorted(ajustes)])
+        return parametros, coeficientes
+
+    @staticmethod
+    def _evaluar_curvas(x, parametro, parametros, coeficientes):
+        # Evalúa la familia de curvas en x interpolando linealmente entre las dos curvas que rodean a
+        # `parametro` (fuera de la familia se prolonga la interpolación de las curvas extremas)
+        i = np.clip(np.searchsorted(parametros, parametro, side="right") - 1, 0, parametros.size - 2)
+        peso = (parametro - parametros[i]) / (parametros[i + 1] - parametros[i])
+        inferior = np.zeros(np.shape(x))
+        superior = np.zeros(np.shape(x))
+        for columna in range(coeficientes.shape[1]):  # Horner sobre todos los puntos a la vez
+            inferior = inferior * x + coeficientes[i, columna]
+            superior = superior * x + coeficientes[i + 1, columna]
+        return inferior + peso * (superior - inferior)
+
+    @staticmethod
+    def usar_ajustes_k1(ajustes):
+        # Sustituye los ajustes de K1 ({espaciado: coeficientes}) y reconstruye su tabla
+        MotorPlatos.AJUSTES_K1 = {float(espaciado): tuple(ajustes[espaciado]) for espaciado in sorted(ajustes)}
+        MotorPlatos.ESPACIADOS_K1, MotorPlatos.COEFICIENTES_K1 = MotorPlatos._tabla_de_curvas(MotorPlatos.AJUSTES_K1)
+
+    @staticmethod
+    def usar_ajustes_arrastre(ajustes):
+        # Sustituye los ajustes de arrastre ({porcentaje de inundación: coeficientes}) y reconstruye su tabla
+        MotorPlatos.AJUSTES_ARRASTRE = {float(porcentaje): tuple(ajustes[porcentaje]) for porcentaje in sorted(ajustes)}
+        MotorPlatos.INUNDACIONES_ARRASTRE, MotorPlatos.COEFICIENTES_ARRASTRE = MotorPlatos._tabla_de_curvas(
+            MotorPlatos.AJUSTES_ARRASTRE)
+
+    @staticmethod
+    def usar_ajustes_flujo(ajustes):
+        # Sustituye los ajustes de las fronteras del tipo de flujo ({"invertido": ..., "doble": ...})
+        faltan = [frontera for frontera in ("invertido", "doble") if frontera not in ajustes]
+        if faltan:
+            raise KeyError(f"Faltan fronteras del tipo de flujo: {', '.join(faltan)}")
+        MotorPlatos.AJUSTES_FLUJO = {frontera: tuple(ajustes[frontera]) for frontera in ("invertido", "doble")}
+
+    @staticmethod
+    def obtener_flv(flujo_liquido, flujo_vapor, densidad_vapor, densidad_liquido):
+        return (np.asarray(flujo_liquido) / flujo_vapor) * np.sqrt(np.asarray(densidad_vapor) / densidad_liquido)
+
+    @staticmethod
+    def calcular_ajustes_grafica_k1(flv, espaciado, fuera_de_rango="nan"):
+        # K1 para arrays de FLV y espaciado. Entre dos espaciados de la gráfica se interpola linealmente
+        # entre sus curvas; fuera de la gráfica se aplica el criterio `fuera_de_rango`.
+        if fuera_de_rango not in MotorPlatos.FUERA_DE_RANGO_K1:
+            raise ValueError(f"Criterio desconocido: {fuera_de_rango}. Opciones: "
+                             f"{', '.join(MotorPlatos.FUERA_DE_RANGO_K1)}")
+        flv, espaciado = np.broadcast_arrays(np.asarray(flv, dtype=float), np.asarray(espaciado, dtype=float))
+        espaciados = MotorPlatos.ESPACIADOS_K1
+        flv_min, flv_max = MotorPlatos.RANGO_FLV_K1
+        fuera = (flv < flv_min) | (flv > flv_max) | (espaciado < espaciados[0]) | (espaciado > espaciados[-1])
+        if fuera_de_rango == "limitar":
+            flv = np.clip(flv, flv_min, flv_max)
+            espaciado = np.clip(espaciado, espaciados[0], espaciados[-1])
+
+        k1 = MotorPlatos._evaluar_curvas(flv, espaciado, espaciados, MotorPlatos.COEFICIENTES_K1)
+        if fuera_de_rango == "nan":
+            k1 = np.where(fuera | np.isnan(espaciado), np.nan, k1)
+        return k1
+
+    @staticmethod
+    def calcular_correccion_k1(t_sup, k1):
+        return (np.asarray(t_sup) / 20) ** 0.2 * k1
+
+    @staticmethod
+    def calcular_velocidad_maxima(k1, densidad_liquido, densidad_vapor):
+        return np.asarray(k1) * np.sqrt((np.asarray(densidad_liquido) - densidad_vapor) / densidad_vapor)
+
+    @staticmethod
+    def velocidad_maxima_85(velocidad):
+        return np.asarray(velocidad) * 0.85
+
+    @staticmethod
+    def calcular_flujo_volumetrico(caudal, peso_molecular, densidad_vapor):
+        return np.asarray(caudal) * peso_molecular / (3600 * np.asarray(densidad_vapor))
+
+    @staticmethod
+    def calcular_areas(flujo_volumetrico, velocidad_al_85):
+        area_sin = np.asarray(flujo_volumetrico) / velocidad_al_85
+        return area_sin / 0.88
+
+    @staticmethod
+    def calculo_diametro(area):
+        return np.sqrt(np.asarray(area) * 4 / np.pi)
+
+    @staticmethod
+    def calculo_flujo_liq_maximo(flujom, peso_molecular, densidad):
+        return np.asarray(flujom) * peso_molecular / densidad / 3600
+
+    @staticmethod
+    def resolver_angulo_cuerda(fraccion_bajante, tolerancia=1e-13, max_iteraciones=60):
+        # Ángulo central θ del segmento circular que ocupa el bajante:
+        # D²/8·(θ − sinθ) = fracción·π·D²/4  ->  θ − sinθ = 2·π·fracción, independiente del diámetro.
+        # Newton vectorizado con salvaguarda de bisección sobre [0, π]: la función es monótona,
+        # así que el intervalo siempre contiene la raíz y la convergencia está garantizada.
+        fraccion_bajante = np.asarray(fraccion_bajante, dtype=float)
+        objetivo = (2 * np.pi * fraccion_bajante).ravel()
+        # Estimación inicial con la aproximación θ − sinθ ≈ θ³/6 para ángulos pequeños
+        theta = np.clip(np.cbrt(6 * objetivo), 0, np.pi)
+        inferior = np.zeros_like(objetivo)
+        superior = np.full_like(objetivo, np.pi)
+        # Solo se sigue iterando sobre los elementos que aún no han convergido
+        activos = np.arange(objetivo.size)
+        for _ in range(max_iteraciones):
+            t = theta[activos]
+            residuo = t - np.sin(t) - objetivo[activos]
+            pendiente = np.abs(residuo) > tolerancia
+            activos, t, residuo = activos[pendiente], t[pendiente], residuo[pendiente]
+            if activos.size == 0:
+                break
+            inferior[activos] = np.where(residuo < 0, t, inferior[activos])
+            superior[activos] = np.where(residuo > 0, t, superior[activos])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = t - residuo / (1 - np.cos(t))
+            dentro = (newton >= inferior[activos]) & (newton <= superior[activos])
+            theta[activos] = np.where(dentro, newton, 0.5 * (inferior[activos] + superior[activos]))
+        theta = theta.reshape(fraccion_bajante.shape)
+        # Un bajante mayor que medio círculo no tiene sentido físico
+        return np.where((fraccion_bajante >= 0) & (fraccion_bajante <= 0.5), theta, np.nan)
+
+    @staticmethod
+    def calcular_longitud_presa(diametro_columna, fraccion_bajante=FRACCION_BAJANTE):
+        theta = MotorPlatos.resolver_angulo_cuerda(fraccion_bajante)
+        return np.asarray(diametro_columna, dtype=float) * np.sin(theta / 2)
+
+    @staticmethod
+    def clasificar_flujo(flujo_liq, diametro_columna):
+        # Tipo de flujo sobre el plato para el caudal volumétrico de líquido y el diámetro de la columna,
+        # con los caudales de las dos fronteras de la gráfica para ese diámetro
+        log_diametro = np.log10(np.asarray(diametro_columna, dtype=float))
+        limite_invertido = 10 ** np.polyval(MotorPlatos.AJUSTES_FLUJO["invertido"], log_diametro)
+        limite_doble = 10 ** np.polyval(MotorPlatos.AJUSTES_FLUJO["doble"], log_diametro)
+        flujo_liq = np.asarray(flujo_liq, dtype=float)
+        invertido, cruzado, doble = MotorPlatos.TIPOS_FLUJO
+        return {
+            "patron_flujo": np.select([flujo_liq < limite_invertido, flujo_liq > limite_doble], [invertido, doble],
+                                      default=cruzado),
+            "flujo_limite_invertido": limite_invertido,
+            "flujo_limite_doble": limite_doble,
+        }
+
+    @staticmethod
+    def calculo_de_areas_en_la_columna(const_agujero, diametro_columna, fraccion_bajante=FRACCION_BAJANTE):
+        diametro_columna = np.asarray(diametro_columna, dtype=float)
+        area_columna = (np.pi / 4) * (diametro_columna ** 2)
+        area_bajante = area_columna * fraccion_bajante
+        area_neta = area_columna - area_bajante
+        area_activa = area_columna - (2 * area_bajante)
+        area_agujeros = np.asarray(const_agujero) * area_activa
+        longitud_presa = MotorPlatos.calcular_longitud_presa(diametro_columna, fraccion_bajante)
+        return {
+            "area_columna": area_columna,
+            "area_bajante": area_bajante,
+            "area_neta": area_neta,
+            "area_activa": area_activa,
+            "area_agujeros": area_agujeros,
+            "longitud_presa": longitud_presa,
+        }
+
+    @staticmethod
+    def comprobar_weeping(flujo_volumetrico_liquido, longitud_presa, area_agujero, densidad_residuo, altura_presa,
+                          diametro_agujeros, flujo_vap_max_bottom):
+        tasa_max_liq = np.asarray(flujo_volumetrico_liquido) * densidad_residuo
+        tasa_min_liq = 0.7 * tasa_max_liq
+        max_altura_sobre_presa = 1000 * (tasa_max_liq / (longitud_presa * np.asarray(densidad_residuo))) ** (2 / 3)
+        min_altura_sobre_presa = 1000 * (tasa_min_liq / (longitud_presa * np.asarray(densidad_residuo))) ** (2 / 3)
+        altura_liq_tasa_min = min_altura_sobre_presa + altura_presa
+        K2p = (5e-6 * altura_liq_tasa_min ** 3 - 0.0013 * altura_liq_tasa_min ** 2
+               + 0.1286 * altura_liq_tasa_min + 26.221)
+        velocidad_min_teorica = (K2p - 0.9 * (25.4 - np.asarray(diametro_agujeros))) / (0.693 ** 0.5)
+        velocidad_min_real = (0.7 * np.asarray(flujo_vap_max_bottom)) / area_agujero
+        return {
+            "tasa_max_liq": tasa_max_liq,
+            "tasa_min_liq": tasa_min_liq,
+            "max_altura_sobre_presa": max_altura_sobre_presa,
+            "min_altura_sobre_presa": min_altura_sobre_presa,
+            "altura_liq_tasa_min": altura_liq_tasa_min,
+            "K2p": K2p,
+            "velocidad_min_teorica": velocidad_min_teorica,
+            "velocidad_min_real": velocidad_min_real,
+            "tiene_weeping": velocidad_min_real < velocidad_min_teorica,
+        }
+
+    @staticmethod
+    def obtener_presion(area_agujeros, flujo_vap_max_bottom, densidad_res_liq, densidad_res_vap, altura_presa):
+        velocidad_max = np.asarray(flujo_vap_max_bottom) / area_agujeros
+        Co = 0.0087 * 0.07 + 0.7579
+        perdida_plato_seco = 51 * ((velocidad_max / Co) ** 2) * (np.asarray(densidad_res_vap) / densidad_res_liq)
+        perdida_residual = 12500 / np.asarray(densidad_res_liq)
+        perdida_total = perdida_plato_seco + perdida_residual + altura_presa + 25
+        return {
+            "velocidad_max": velocidad_max,
+            "Co": Co,
+            "perdida_plato_seco": perdida_plato_seco,
+            "perdida_residual": perdida_residual,
+            "perdida_total": perdida_total,
+            "dif_presion": perdida_total * 0.00981 * np.asarray(densidad_res_liq),
+        }
+
+    @staticmethod
+    def nivel_de_liquido_en_el_bajante(altura_presa, longitud_presa, area_bajante, tasa_max_liq, densidad_res_liq,
+                                       altura_total, espaciado_seleccionado):
+        altura_apron = np.asarray(altura_presa) - 10
+        area_apron = longitud_presa * (altura_apron / 1000)
+        perdida_bajante = 166 * (np.asarray(tasa_max_liq) / (np.asarray(densidad_res_liq) * area_apron)) ** 2
+        nivel_bajante = perdida_bajante + altura_total + altura_presa + 25
+        EspP = np.asarray(espaciado_seleccionado, dtype=float) * 1000.0
+        nivel_bajante_maximo = 0.5 * (EspP + 50)
+        return {
+            "altura_apron": altura_apron,
+            "area_apron": area_apron,
+            "usa_area_apron": area_apron < area_bajante,
+            "perdida_bajante": perdida_bajante,
+            "nivel_bajante": nivel_bajante,
+            "nivel_bajante_maximo": nivel_bajante_maximo,
+            "bajante_aceptable": nivel_bajante <= nivel_bajante_maximo,
+        }
+
+    @staticmethod
+    def calculo_tiempo_residencia(area_bajante, nivel_bajante, densidad_r_liq, tasa_liq_max):
+        return np.asarray(area_bajante) * nivel_bajante * 0.001 * densidad_r_liq / tasa_liq_max
+
+    @staticmethod
+    def porcentaje_flooding(flujo_vol_bottom, area_neta, vel_bottom):
+        velocidad_area_neta = np.asarray(flujo_vol_bottom) / area_neta
+        return {
+            "velocidad_area_neta": velocidad_area_neta,
+            "porcentaje_inundacion": (velocidad_area_neta / vel_bottom) * 100,
+        }
+
+    @staticmethod
+    def calcular_arrastre(flv, porcentaje_inundacion, eficiencia):
+        # Arrastre fraccional ψ de la gráfica de Fair, interpolado entre las curvas de inundación. Fuera de la
+        # gráfica se usa su borde: por debajo del 30 % de inundación el arrastre es despreciable y por encima
+        # del 95 % ya falla la comprobación de inundación. La eficiencia se corrige con la ecuación de
+        # Colburn: Ea = E / (1 + E·ψ / (1 - ψ)).
+        flv_min, flv_max = MotorPlatos.RANGO_FLV_K1
+        log_flv = np.log10(np.clip(np.asarray(flv, dtype=float), flv_min, flv_max))
+        inundaciones = MotorPlatos.INUNDACIONES_ARRASTRE
+        porcentaje = np.clip(np.asarray(porcentaje_inundacion, dtype=float), inundaciones[0], inundaciones[-1])
+        arrastre = 10 ** MotorPlatos._evaluar_curvas(log_flv, porcentaje, inundaciones,
+                                                     MotorPlatos.COEFICIENTES_ARRASTRE)
+        eficiencia = np.asarray(eficiencia, dtype=float)
+        return {
+            "arrastre_fraccional": arrastre,
+            "eficiencia_con_arrastre": eficiencia / (1 + eficiencia * arrastre / (1 - arrastre)),
+            "arrastre_aceptable": arrastre < MotorPlatos.ARRASTRE_MAXIMO,
+        }
+
+    @staticmethod
+    def calcular_area_perforada(diametro_columna, area_columna, longitud_presa, diametro_agujero, area_agujeros):
+        angulo_borde_plato = 180 - 99
+        diametro_bandas_sin_perforar = (np.asarray(diametro_columna) - 0.05) * np.pi * (angulo_borde_plato / 180)
+        area_bandas_sin_perforar = 0.05 * diametro_bandas_sin_perforar
+        diametro_zonas_de_calma = np.asarray(longitud_presa) + 0.05
+        area_zonas_de_calma = 2 * (diametro_zonas_de_calma * 0.05)
+        area_perforada = np.asarray(area_columna) - area_bandas_sin_perforar - area_zonas_de_calma
+        area_de_un_agujero = (np.pi / 4) * (np.asarray(diametro_agujero) / 1000) ** 2
+        return {
+            "angulo_borde_plato": angulo_borde_plato,
+            "diametro_bandas_sin_perforar": diametro_bandas_sin_perforar,
+            "area_bandas_sin_perforar": area_bandas_sin_perforar,
+            "diametro_zonas_de_calma": diametro_zonas_de_calma,
+            "area_zonas_de_calma": area_zonas_de_calma,
+            "area_perforada": area_perforada,
+            "area_de_un_agujero": area_de_un_agujero,
+            "numero_agujeros": np.asarray(area_agujeros) / area_de_un_agujero,
+        }
+
+    @staticmethod
+    def calcular_precio_sinot(diametro_columna, espesor_par, densidad_mat, num_pisos, espaciado_plato,
+                              factor_instalacion=FACTOR_INSTALACION):
+        diametro_columna = np.asarray(diametro_columna, dtype=float)
+        num_pisos = np.asarray(num_pisos, dtype=float)
+        longitud_carcasa = num_pisos * espaciado_plato
+        peso_carcasa = np.pi * diametro_columna * longitud_carcasa * espesor_par * densidad_mat
+        coste_carcasa = 17.400 + 79 * peso_carcasa ** 0.85  # Coste solo cáscara
+        coste_platos = 130 + 440 * diametro_columna ** 1.8  # Coste por cada plato
+        coste_total = coste_carcasa + num_pisos * coste_platos
+        coste_cepci = CEPCI.adjust_for_inflation_sinot(coste_total)
+        coste_instalacion = coste_cepci * factor_instalacion  # Coste total contando la instalación
+        return {
+            "longitud_carcasa": longitud_carcasa,
+            "peso_carcasa": peso_carcasa,
+            "coste_carcasa": coste_carcasa,
+            "coste_platos": coste_platos,
+            "coste_total": coste_total,
+            "coste_cepci": coste_cepci,
+            "coste_instalacion": coste_instalacion,
+        }
+
+    @staticmethod
+    def calcular_precio_walas(peso, longitud, diametro, espesor_par, num_pisos, presion, esfuerzo,
+                              factor_instalacion=FACTOR_INSTALACION):
+        # Desglose actualizado con el CEPCI: carcasa (Cb con el factor de material f1), platos y plataformas
+        diametro = np.asarray(diametro, dtype=float)
+        presion = np.asarray(presion, dtype=float)
+        num_pisos = np.asarray(num_pisos, dtype=float)
+        D_pies = diametro * 3.281
+        L_pies = np.asarray(longitud) * 3.281
+        Peso_libras = np.asarray(peso) * 2.205
+        espesor_pies = np.asarray(espesor_par) * 3.281
+        espesor_trabajo = ((presion * diametro) / (2 * np.asarray(esfuerzo) * 1 + 1.2 * presion)) * 3.281
+        f1 = 1.7
+        f2 = 1.189 + 0.0577 * D_pies
+        f3 = 0.85
+        f4 = 2.25 / (1.0414) ** num_pisos
+        Cb = np.exp(7.123 + 0.1478 * np.log(Peso_libras) + 0.02488 * np.log(Peso_libras) ** 2 + 0.01580 * (
+                L_pies / D_pies) * np.log(espesor_pies / espesor_trabajo))
+        C_tray = 375.8 * np.exp(0.1739 * D_pies)
+        C_p1 = 204.9 * D_pies ** 0.6332 * L_pies ** 0.8016
+        carcasa = CEPCI.adjust_for_inflation_walas(f1 * Cb)
+        platos = CEPCI.adjust_for_inflation_walas(num_pisos * f2 * f3 * f4 * C_tray)
+        plataformas = CEPCI.adjust_for_inflation_walas(C_p1)
+        return {
+            "coste_walas_carcasa": carcasa,
+            "coste_walas_platos": platos,
+            "coste_walas_plataformas": plataformas,
+            "coste_walas": (carcasa + platos + plataformas) * factor_instalacion,
+        }
+
+    @staticmethod
+    def costes_columna(diametro_columna, num_pisos, espaciado_plato, espesor_pared, presion_trabajo,
+                       densidad_material, esfuerzo, factor_instalacion=FACTOR_INSTALACION):
+        # Coste de muchas columnas a la vez por los dos métodos, a partir de las variables de diseño.
+        # Todas las entradas admiten arrays con broadcasting; devuelve el desglose de ambos métodos
+        # con la forma común de las entradas.
+        sinot = MotorPlatos.calcular_precio_sinot(diametro_columna, espesor_pared, densidad_material, num_pisos,
+                                                  espaciado_plato, factor_instalacion)
+        walas = MotorPlatos.calcular_precio_walas(sinot["peso_carcasa"], sinot["longitud_carcasa"], diametro_columna,
+                                                  espesor_pared, num_pisos, presion_trabajo, esfuerzo,
+                                                  factor_instalacion)
+        resultados = {**sinot, **walas, "factor_instalacion": np.asarray(factor_instalacion, dtype=float)}
+        forma = np.broadcast_shapes(*(np.shape(valor) for valor in resultados.values()))
+        return {nombre: np.broadcast_to(valor, forma) for nombre, valor in resultados.items()}
+
+    @staticmethod
+    def comprobar_diseño(resultados):
+        # Comprobaciones en el orden del flujo de trabajo (paso 5: tipo de flujo, paso 7: goteo, paso 9: nivel
+        # en el bajante, paso 11: arrastre).
+        # Devuelve la factibilidad y el nombre de la primera comprobación que falla ("" si es factible).
+        comprobaciones = {
+            "k1_fuera_de_grafica": np.isfinite(resultados["K1"]) & np.isfinite(resultados["K2"]),
+            "patron_flujo": np.asarray(resultados["patron_flujo"]) == "cruzado",
+            "goteo": ~np.asarray(resultados["tiene_weeping"], dtype=bool),
+            "nivel_bajante": np.asarray(resultados["bajante_aceptable"], dtype=bool),
+            "arrastre": np.asarray(resultados["arrastre_aceptable"], dtype=bool),
+        }
+        factible = np.logical_and.reduce(list(comprobaciones.values()))
+        fallo = np.select([~valido for valido in comprobaciones.values()], list(comprobaciones), default="")
+        return {"factible": factible, "fallo": fallo}
+
+    @staticmethod
+    def calcular(funcion, valores, salidas):
+        # Ejecuta uno de los CALCULOS y devuelve sus salidas como diccionario
+        resultado = getattr(MotorPlatos, funcion)(*valores)
+        if isinstance(resultado, dict):
+            return {nombre: resultado[nombre] for nombre in salidas}
+        return {salidas[0]: resultado}
+
+    @staticmethod
+    def evaluar(**entradas):
+        # Evalúa todos los pasos de cálculo (3 a 14) para uno o muchos diseños a la vez.
+        # Devuelve un diccionario con todos los resultados intermedios y finales como arrays
+        # con la forma común (broadcast) de las entradas.
+        e = dict(MotorPlatos.VALORES_POR_DEFECTO)
+        e.update(entradas)
+        faltan = [nombre for nombre in MotorPlatos.ENTRADAS if nombre not in e]
+        if faltan:
+            raise KeyError(f"Faltan entradas para evaluar el diseño: {', '.join(faltan)}")
+        e = {nombre: np.asarray(valor, dtype=float) for nombre, valor in e.items()}
+        r = {}
+        for funcion, nombres_entrada, salidas in MotorPlatos.CALCULOS:
+            r.update(MotorPlatos.calcular(funcion, [r[n] if n in r else e[n] for n in nombres_entrada], salidas))
+
+        forma = np.broadcast_shapes(*(np.shape(valor) for valor in e.values()))
+        return {nombre: np.broadcast_to(valor, forma) for nombre, valor in r.items()}
+
+
+
+# Tablas de las familias de curvas, sustituidas por los ajustes digitalizados de las gráficas
+# (AjustesGraficas.py) si se han generado y son válidos
+MotorPlatos.usar_ajustes_k1(MotorPlatos.AJUSTES_K1)
+MotorPlatos.usar_ajustes_arrastre(MotorPlatos.AJUSTES_ARRASTRE)
+cargar_en_motor(MotorPlatos)
@@ -0,0 +1,133 @@
+import os
+
+import numpy as np
+
+from CargaDiferida import importar_diferido
+
+pd = importar_diferido("pandas")
+
+
+class MotorPropiedades:
+    # Propiedades físicas en función de la composición y la temperatura, interpoladas (bilinealmente)
+    # sobre una tabla. Las esquinas de cada celda de la tabla se reúnen una sola vez al crear el
+    # motor, de modo que evaluar miles de puntos cuesta una búsqueda binaria y unas pocas operaciones
+    # por punto. Fuera de la tabla se toma el valor del borde (no se extrapola).
+    # Los motores ya construidos se guardan en memoria por sistema para el resto de la sesión.
+
+    # Propiedades del libro de propiedades que corresponden a cada propiedad del motor
+    # (destilado, residuo)
+    EXTREMOS = {
+        "temperatura": ("temperatura_dest", "temperatura_res"),
+        "densidad_liq": ("densidad_dest_liq", "densidad_res_liq"),
+        "densidad_vap": ("densidad_dest_vap", "densidad_res_vap"),
+        "viscosidad_liq": ("viscosidad_dest_liq", "viscosidad_res_liq"),
+        "viscosidad_vap": ("viscosidad_dest_vap", "viscosidad_res_vap"),
+        "peso_molecular": ("peso_molecular_dest", "peso_molecular_res"),
+        "tension_superficial": ("tension_superficial_dest", "tension_superficial_res"),
+    }
+
+    # Motores construidos en esta sesión, por sistema
+    _sistemas = {}
+
+    def __init__(self, composiciones, tablas, temperaturas=None):
+        # `tablas` tiene, por propiedad, un array (composiciones × temperaturas), o solo por composición
+        # si no se dan temperaturas
+        composiciones = np.asarray(composiciones, dtype=float)
+        temperaturas = np.zeros(1) if temperaturas is None else np.asarray(temperaturas, dtype=float)
+        if not tablas:
+            raise ValueError("La tabla de propiedades está vacía")
+        self.nombres = tuple(tablas)
+        valores = np.stack([np.asarray(tablas[nombre], dtype=float).reshape(composiciones.size, temperaturas.size)
+                            for nombre in self.nombres])
+
+        orden_x, orden_t = np.argsort(composiciones), np.argsort(temperaturas)
+        composiciones, temperaturas = composiciones[orden_x], temperaturas[orden_t]
+        valores = valores[:, orden_x][:, :, orden_t]
+        if np.any(np.diff(composiciones) == 0) or np.any(np.diff(temperaturas) == 0):
+            raise ValueError("La tabla de propiedades tiene composiciones o temperaturas repetidas")
+        # Un eje con un solo valor se trata como una celda en la que la propiedad no varía
+        if composiciones.size == 1:
+            composiciones = np.append(composiciones, composiciones[0] + 1)
+            valores = np.concatenate([valores, valores], axis=1)
+        if temperaturas.size == 1:
+            temperaturas = np.append(temperaturas, temperaturas[0] + 1)
+            valores = np.concatenate([valores, valores], axis=2)
+        self.composiciones = composiciones
+        self.temperaturas = temperaturas
+
+        # Valores en las cuatro esquinas de cada celda: v = (1-t)·((1-u)·v00 + u·v10) + t·((1-u)·v01 + u·v11),
+        # con u y t en [0, 1] dentro de la celda. Con esta forma los pesos valen exactamente 0 o 1 en los
+        # nodos, así que en ellos se devuelve el valor de la tabla sin error de redondeo.
+        esquinas = np.stack([valores[:, :-1, :-1], valores[:, 1:, :-1], valores[:, :-1, 1:], valores[:, 1:, 1:]])
+        # Orden (celda x, celda t, esquina, propiedad): una sola indexación recoge todas las propiedades
+        self._esquinas = np.ascontiguousarray(esquinas.transpose(2, 3, 0, 1))
+
+    @staticmethod
+    def _localizar(eje, valor):
+        valor = np.clip(valor, eje[0], eje[-1])
+        celda = np.clip(np.searchsorted(eje, valor, side="right") - 1, 0, eje.size - 2)
+        return celda, (valor - eje[celda]) / (eje[celda + 1] - eje[celda])
+
+    def evaluar(self, composicion, temperatura=None, propiedades=None):
+        # Propiedades en puntos (composición, temperatura) dados como escalares o arrays con broadcasting.
+        # Sin temperatura se usa la menor de la tabla.
+        composicion = np.asarray(composicion, dtype=float)
+        temperatura = np.asarray(self.temperaturas[0] if temperatura is None else temperatura, dtype=float)
+        composicion, temperatura = np.broadcast_arrays(composicion, temperatura)
+        i, u = self._localizar(self.composiciones, composicion)
+        j, t = self._localizar(self.temperaturas, temperatura)
+        c = self._esquinas[i, j]
+        u, t = u[..., None], t[..., None]
+        inferior = (1 - u) * c[..., 0, :] + u * c[..., 1, :]
+        superior = (1 - u) * c[..., 2, :] + u * c[..., 3, :]
+        valores = (1 - t) * inferior + t * superior
+        return {nombre: valores[..., k] for k, nombre in enumerate(self.nombres)
+                if propiedades is None or nombre in propiedades}
+
+    @classmethod
+    def desde_extremos(cls, propiedades, composicion_dest, composicion_res):
+        # Tabla de dos puntos (destilado y residuo) a partir de las propiedades del libro de propiedades.
+        # La temperatura de cada extremo queda determinada por su composición, así que la tabla solo
+        # depende de la composición y la temperatura se devuelve como una propiedad más.
+        tablas = {nombre: [propiedades[dest], propiedades[res]] for nombre, (dest, res) in cls.EXTREMOS.items()
+                  if dest in propiedades and res in propiedades}
+        return cls([composicion_dest, composicion_res], tablas)
+
+    @classmethod
+    def desde_tabla(cls, ruta):
+        # Tabla en formato largo (CSV o Excel): columnas "composicion", "temperatura" (opcional) y una
+        # columna por propiedad, con una fila por cada combinación de composición y temperatura
+        if os.path.splitext(ruta)[1].lower() in (".xlsx", ".xls"):
+            hoja = pd.read_excel(ruta)
+        else:
+            hoja = pd.read_csv(ruta)
+        if "composicion" not in hoja:
+            raise ValueError(f"La tabla {ruta} no tiene columna de composición")
+        ejes = ["composicion"] + (["temperatura"] if "temperatura" in hoja else [])
+        nombres = [nombre for nombre in hoja.columns if nombre not in ejes]
+        hoja = hoja.sort_values(ejes)
+        composiciones = np.unique(hoja["composicion"].to_numpy(dtype=float))
+        temperaturas = np.unique(hoja["temperatura"].to_numpy(dtype=float)) if "temperatura" in hoja else None
+        n_temperaturas = 1 if temperaturas is None else temperaturas.size
+        if len(hoja) != composiciones.size * n_temperaturas:
+            raise ValueError(f"La tabla {ruta} no cubre todas las combinaciones de composición y temperatura")
+        tablas = {nombre: hoja[nombre].to_numpy(dtype=float).reshape(composiciones.size, n_temperaturas)
+                  for nombre in nombres}
+        return cls(composiciones, tablas, temperaturas)
+
+    @classmethod
+    def para_sistema(cls, sistema, crear):
+        # Motor del sistema indicado; solo se construye con `crear()` la primera vez
+        motor = cls._sistemas.get(sistema)
+        if motor is None:
+            motor = crear()
+            cls._sistemas[sistema] = motor
+        return motor
+
+    @classmethod
+    def olvidar(cls, sistema=None):
+        # Descarta un sistema (o todos), por ejemplo si su tabla ha cambiado
+        if sistema is None:
+            cls._sistemas.clear()
+        else:
+            cls._sistemas.pop(sistema, None)
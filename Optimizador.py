@@ -0,0 +1,113 @@
+import numpy as np
+
+from MotorPlatos import MotorPlatos
+from Barrido import DIAMETROS_COMERCIALES, FRACCIONES_AGUJERO
+
+
+# Ejes de búsqueda por defecto (alturas de presa y diámetros de agujero en mm)
+ALTURAS_PRESA = tuple(np.arange(25.0, 100.1, 5.0))
+DIAMETROS_AGUJERO = tuple(np.arange(2.5, 12.51, 0.5))
+
+# Límites de las comprobaciones que no tienen criterio propio en el motor
+TIEMPO_RESIDENCIA_MINIMO = 3.0  # s
+INUNDACION_MAXIMA = 85.0  # %, el mismo criterio con el que se dimensiona el diámetro
+
+# Holgura relativa por debajo de la cual una restricción se considera activa en el óptimo
+HOLGURA_ACTIVA = 0.05
+
+OBJETIVOS = {
+    "sinnott": ("coste_instalacion",),
+    "walas": ("coste_walas",),
+    "ambos": ("coste_instalacion", "coste_walas"),
+}
+
+RESTRICCIONES = ("patron_flujo", "goteo", "nivel_bajante", "tiempo_residencia", "inundacion", "arrastre")
+
+# Variables de diseño, con el nombre de la entrada del motor correspondiente
+VARIABLES = ("ESPACIADO_SELECCIONADO", "diametro_columna", "altura_presa", "diametro_agujeros", "CONSTANTE_AGUJERO")
+
+TAMAÑO_BLOQUE = 100_000
+
+
+def margenes(resultados, tiempo_minimo=TIEMPO_RESIDENCIA_MINIMO, inundacion_maxima=INUNDACION_MAXIMA):
+    # Holgura relativa de cada restricción: positiva si se cumple, negativa si se incumple
+    return {
+        # Flujo cruzado: el caudal de líquido debe quedar entre las dos fronteras de la gráfica
+        "patron_flujo": np.minimum(resultados["flujo_liq_max"] / resultados["flujo_limite_invertido"] - 1,
+                                   1 - resultados["flujo_liq_max"] / resultados["flujo_limite_doble"]),
+        "goteo": resultados["velocidad_min_real"] / resultados["velocidad_min_teorica"] - 1,
+        "nivel_bajante": 1 - resultados["nivel_bajante"] / resultados["nivel_bajante_maximo"],
+        "tiempo_residencia": resultados["tiempo_residencia"] / tiempo_minimo - 1,
+        "inundacion": 1 - resultados["porcentaje_inundacion"] / inundacion_maxima,
+        "arrastre": 1 - resultados["arrastre_fraccional"] / MotorPlatos.ARRASTRE_MAXIMO,
+    }
+
+
+def optimizar(entradas, objetivo="sinnott", espaciados=tuple(MotorPlatos.AJUSTES_K1), diametros=DIAMETROS_COMERCIALES,
+              alturas_presa=ALTURAS_PRESA, diametros_agujero=DIAMETROS_AGUJERO, fracciones=FRACCIONES_AGUJERO,
+              tiempo_minimo=TIEMPO_RESIDENCIA_MINIMO, inundacion_maxima=INUNDACION_MAXIMA,
+              tamaño_bloque=TAMAÑO_BLOQUE, cancelado=None):
+    # Minimiza el coste instalado sobre el producto cartesiano de las variables de diseño.
+    # `entradas` contiene el resto de entradas del motor como escalares. Los candidatos se evalúan
+    # por bloques con MotorPlatos.evaluar; a igualdad de coste se prefiere la menor caída de presión.
+    # Devuelve el diseño óptimo (None si ninguno es factible), sus resultados, la holgura de cada
+    # restricción, las restricciones activas y cuántos candidatos más baratos descarta cada una.
+    # `cancelado` es una función opcional que se consulta entre bloques; si devuelve True se abandona
+    # la búsqueda y se devuelve None.
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo desconocido: {objetivo}. Opciones: {', '.join(OBJETIVOS)}")
+    ejes = [np.asarray(eje, dtype=float) for eje in (espaciados, diametros, alturas_presa, diametros_agujero,
+                                                      fracciones)]
+    forma = tuple(eje.size for eje in ejes)
+    total = int(np.prod(forma))
+    entradas = {nombre: valor for nombre, valor in entradas.items() if nombre not in VARIABLES}
+
+    coste = np.empty(total)
+    perdida = np.empty(total)
+    dentro_de_grafica = np.empty(total, dtype=bool)
+    holguras = np.empty((total, len(RESTRICCIONES)))
+    for inicio in range(0, total, tamaño_bloque):
+        if cancelado is not None and cancelado():
+            return None
+        fin = min(inicio + tamaño_bloque, total)
+        indices = np.unravel_index(np.arange(inicio, fin), forma)
+        diseño = dict(entradas)
+        diseño.update({nombre: eje[i] for nombre, eje, i in zip(VARIABLES, ejes, indices)})
+        resultados = MotorPlatos.evaluar(**diseño)
+        coste[inicio:fin] = sum(resultados[nombre] for nombre in OBJETIVOS[objetivo]) / len(OBJETIVOS[objetivo])
+        perdida[inicio:fin] = resultados["perdida_total"]
+        dentro_de_grafica[inicio:fin] = np.isfinite(resultados["K1"]) & np.isfinite(resultados["K2"])
+        bloque = margenes(resultados, tiempo_minimo, inundacion_maxima)
+        holguras[inicio:fin] = np.column_stack([bloque[nombre] for nombre in RESTRICCIONES])
+
+    incumple = ~(holguras >= 0)  # Los NaN fuera de la gráfica de K1 cuentan como incumplimiento
+    factible = dentro_de_grafica & ~incumple.any(axis=1)
+    resumen = {"objetivo": objetivo, "evaluados": total, "factibles": int(factible.sum())}
+    if not factible.any():
+        resumen.update({"diseño": None, "coste": None, "resultados": None, "holguras": None,
+                        "restricciones_activas": [], "limitantes": {}})
+        return resumen
+
+    candidatos = np.flatnonzero(factible)
+    mejor = candidatos[np.lexsort((perdida[candidatos], coste[candidatos]))[0]]
+    diseño = {nombre: float(eje[i]) for nombre, eje, i in zip(VARIABLES, ejes, np.unravel_index(mejor, forma))}
+    # item() en lugar de float(): el tipo de flujo es un texto
+    resultados = {nombre: np.asarray(valor).item()
+                  for nombre, valor in MotorPlatos.evaluar(**entradas, **diseño).items()}
+
+    # Restricciones que impiden bajar el coste: las que descartan a los candidatos más baratos
+    mas_baratos = coste < coste[mejor]
+    limitantes = {nombre: int((incumple[:, i] & mas_baratos).sum()) for i, nombre in enumerate(RESTRICCIONES)}
+    limitantes["k1_fuera_de_grafica"] = int((~dentro_de_grafica & mas_baratos).sum())
+    limitantes = dict(sorted(((nombre, n) for nombre, n in limitantes.items() if n), key=lambda par: -par[1]))
+
+    holgura = dict(zip(RESTRICCIONES, holguras[mejor].tolist()))
+    resumen.update({
+        "diseño": diseño,
+        "coste": float(coste[mejor]),
+        "resultados": resultados,
+        "holguras": holgura,
+        "restricciones_activas": [nombre for nombre, valor in holgura.items() if valor <= HOLGURA_ACTIVA],
+        "limitantes": limitantes,
+    })
+    return resumen
@@ -0,0 +1,87 @@
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer
+
+
+class RegistroConsola(QObject):
+    # Destino de los mensajes de la consola. Los mensajes se acumulan y se vuelcan al QTextEdit por
+    # lotes con un temporizador, de modo que una ráfaga de líneas cuesta un solo repintado. El historial
+    # se limita con un buffer circular (y el widget con el mismo número máximo de líneas), y los mensajes
+    # pueden copiarse también a un archivo o a una lista para ejecuciones sin interfaz.
+
+    SIMBOLO = "•"
+    INTERVALO_VOLCADO_MS = 50
+    HISTORIAL_MAXIMO = 5000
+
+    def __init__(self, widget=None, archivo=None, lista=None, historial_maximo=HISTORIAL_MAXIMO,
+                 intervalo_ms=INTERVALO_VOLCADO_MS, parent=None):
+        super().__init__(parent)
+        self.widget = widget
+        self.lista = lista
+        self.historial = deque(maxlen=historial_maximo)
+        self._pendientes = []
+        self._archivo = open(archivo, "a", encoding="utf-8") if archivo else None
+        self._segundo = None
+        self._marca = ""
+        if widget is not None:
+            widget.document().setMaximumBlockCount(historial_maximo)
+        self._temporizador = QTimer(self)
+        self._temporizador.setSingleShot(True)
+        self._temporizador.setInterval(intervalo_ms)
+        self._temporizador.timeout.connect(self.vaciar)
+
+    def _formatear(self, texto):
+        # La marca de tiempo solo se vuelve a formatear cuando cambia el segundo
+        segundo = int(time.time())
+        if segundo != self._segundo:
+            self._segundo = segundo
+            self._marca = time.strftime("%H:%M:%S", time.localtime(segundo))
+        return f"{self.SIMBOLO} [{self._marca}] {texto}"
+
+    def escribir(self, texto):
+        linea = self._formatear(texto)
+        self.historial.append(linea)
+        self._pendientes.append(linea)
+        if not self._temporizador.isActive():
+            self._temporizador.start()
+
+    def vaciar(self):
+        # Vuelca los mensajes pendientes de una vez
+        self._temporizador.stop()
+        if not self._pendientes:
+            return
+        bloque = "\n".join(self._pendientes)
+        self._pendientes.clear()
+        if self.widget is not None:
+            self.widget.append(bloque)
+        if self.lista is not None:
+            self.lista.extend(bloque.split("\n"))
+        if self._archivo is not None:
+            self._archivo.write(bloque + "\n")
+            self._archivo.flush()
+
+    def reemplazar(self, texto):
+        # Sustituye el contenido visible por un único mensaje
+        self._pendientes.clear()
+        if self.widget is not None:
+            self.widget.clear()
+        self.escribir(texto)
+        self.vaciar()
+
+    def limpiar(self):
+        self._temporizador.stop()
+        self._pendientes.clear()
+        self.historial.clear()
+        if self.widget is not None:
+            self.widget.clear()
+
+    def texto(self):
+        # Historial completo (hasta el máximo) como texto, incluidos los mensajes aún no volcados
+        return "\n".join(self.historial)
+
+    def cerrar(self):
+        self.vaciar()
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
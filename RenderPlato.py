@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from CargaDiferida import importar_diferido
+from GeneradorMalla import GeneradorMalla
+from Rutas import directorio_cache
+
+pv = importar_diferido("pyvista")
+
+
+class _SeñalesRender(QObject):
+    mallas_listas = pyqtSignal(str, str, object)
+    fallido = pyqtSignal(str, str)
+
+
+class _TareaMallas(QRunnable):
+    # Generación de la geometría en un hilo del QThreadPool. Solo se construyen mallas y arrays: el
+    # render con OpenGL se hace en el hilo de la interfaz, que es el dueño del contexto gráfico.
+    def __init__(self, clave, parametros, ruta_imagen, señales):
+        super().__init__()
+        self.clave = clave
+        self.parametros = parametros
+        self.ruta_imagen = ruta_imagen
+        self.señales = señales
+
+    def run(self):
+        try:
+            mallas = RenderPlato.obtener_mallas(self.clave, self.parametros)
+        except Exception as error:
+            self.señales.fallido.emit(self.clave, str(error))
+            return
+        self.señales.mallas_listas.emit(self.clave, self.ruta_imagen, mallas)
+
+
+class RenderPlato(QObject):
+    # Representación 3D del plato sin bloquear la interfaz.
+    # La geometría se genera con GeneradorMalla en segundo plano a partir de los parámetros del diseño y
+    # la captura fuera de pantalla se hace después en el hilo de la interfaz (VTK no admite renderizar
+    # con OpenGL desde otros hilos mientras Qt usa su propio contexto). Las últimas
+    # mallas generadas se conservan en memoria y las capturas se guardan en disco con una clave
+    # calculada a partir de esos parámetros, de modo que volver al paso 13 es inmediato.
+    renderizado = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    TAMAÑO_CAPTURA = (1040, 760)
+
+    MALLAS_EN_MEMORIA = 4
+
+    _mallas = OrderedDict()
+    _bloqueo_mallas = threading.Lock()
+
+    def __init__(self, directorio=None, parent=None):
+        super().__init__(parent)
+        self.directorio = directorio or directorio_cache("render")
+        self._pendientes = set()
+        self._señales = _SeñalesRender()
+        self._señales.mallas_listas.connect(self._renderizar)
+        self._señales.fallido.connect(self._al_fallar)
+
+    @staticmethod
+    def obtener_mallas(clave, parametros):
+        with RenderPlato._bloqueo_mallas:
+            if clave in RenderPlato._mallas:
+                RenderPlato._mallas.move_to_end(clave)
+                return RenderPlato._mallas[clave]
+        mallas = GeneradorMalla.a_pyvista(GeneradorMalla.generar(**parametros))
+        with RenderPlato._bloqueo_mallas:
+            RenderPlato._mallas[clave] = mallas
+            while len(RenderPlato._mallas) > RenderPlato.MALLAS_EN_MEMORIA:
+                RenderPlato._mallas.popitem(last=False)
+        return mallas
+
+    def clave(self, parametros):
+        contenido = {
+            "version_geometria": GeneradorMalla.VERSION,
+            "tamaño": self.TAMAÑO_CAPTURA,
+            "parametros": {nombre: float(valor) for nombre, valor in parametros.items()},
+        }
+        return hashlib.sha1(json.dumps(contenido, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def solicitar(self, parametros):
+        # Emite `renderizado` con la ruta de la captura, desde la caché o al terminar el render.
+        # `parametros` son los argumentos de GeneradorMalla.generar.
+        clave = self.clave(parametros)
+        ruta_imagen = os.path.join(self.directorio, f"{clave}.png")
+        if os.path.exists(ruta_imagen):
+            # Se emite en la siguiente vuelta del bucle de eventos, igual que un render terminado
+            QTimer.singleShot(0, lambda: self.renderizado.emit(ruta_imagen))
+            return
+        if clave in self._pendientes:
+            return
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+        except OSError as error:
+            self.error.emit(str(error))
+            return
+        self._pendientes.add(clave)
+        QThreadPool.globalInstance().start(_TareaMallas(clave, dict(parametros), ruta_imagen, self._señales))
+
+    def _renderizar(self, clave, ruta_imagen, mallas):
+        # Captura fuera de pantalla en el hilo de la interfaz con las mallas ya generadas
+        self._pendientes.discard(clave)
+        temporal = None
+        try:
+            # Se escribe en un temporal para que nunca se lea una captura a medias
+            descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta_imagen), suffix=".png")
+            os.close(descriptor)
+            plotter = pv.Plotter(off_screen=True, window_size=self.TAMAÑO_CAPTURA)
+            try:
+                for nombre, malla in mallas.items():
+                    if malla.n_cells:
+                        plotter.add_mesh(malla, color=GeneradorMalla.COLORES[nombre])
+                plotter.view_isometric()
+                plotter.screenshot(temporal)
+            finally:
+                plotter.close()
+            os.replace(temporal, ruta_imagen)
+        except Exception as error:
+            if temporal is not None and os.path.exists(temporal):
+                os.remove(temporal)
+            self.error.emit(str(error))
+            return
+        self.renderizado.emit(ruta_imagen)
+
+    def _al_fallar(self, clave, mensaje):
+        self._pendientes.discard(clave)
+        self.error.emit(mensaje)
@@ -0,0 +1,16 @@
+import os
+import sys
+
+
+def directorio_cache(*partes):
+    # Directorio de caché del usuario para los archivos generados por la aplicación.
+    # No se usa el directorio del ejecutable porque con PyInstaller es temporal y de solo lectura.
+    base = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "PlateDesign", *partes)
+
+
+def ruta_recurso(ruta_relativa):
+    # Ruta de un recurso empaquetado (PyInstaller) o junto a los fuentes
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.realpath(__file__)))
+    return os.path.join(base, ruta_relativa)
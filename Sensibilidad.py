@@ -0,0 +1,86 @@
+import numpy as np
+
+from MotorPlatos import MotorPlatos
+
+
+# Entradas respecto a las que se deriva por defecto
+VARIABLES = (
+    "Ln_flow", "Vn_flow", "Lm_flow", "Vm_flow",
+    "densidad_dest_liq", "densidad_dest_vap", "densidad_res_liq", "densidad_res_vap",
+    "tension_superficial_dest", "tension_superficial_res",
+    "ESPACIADO_SELECCIONADO", "CONSTANTE_AGUJERO", "diametro_columna", "altura_presa", "diametro_agujeros",
+)
+
+# Resultados cuya respuesta se estudia por defecto
+SALIDAS = (
+    "diametro_columna_top", "diametro_columna_bottom", "porcentaje_inundacion", "perdida_plato_seco",
+    "perdida_total", "nivel_bajante", "coste_instalacion", "coste_walas",
+)
+
+# Entradas con un rango de validez acotado: los puntos perturbados se limitan a él, de modo que en los
+# extremos la diferencia centrada pasa a ser lateral. Se leen al usarlas por si se recargan los ajustes.
+LIMITES = {
+    "ESPACIADO_SELECCIONADO": lambda: (MotorPlatos.ESPACIADOS_K1[0], MotorPlatos.ESPACIADOS_K1[-1]),
+}
+
+PASO_RELATIVO = 1e-4
+VARIACION_TORNADO = 0.10
+
+
+def _vecinos(nombre, valor, factor):
+    # Valores inferior y superior de una entrada para las diferencias finitas o el tornado
+    bajo, alto = valor * (1 - factor), valor * (1 + factor)
+    if nombre in LIMITES:
+        minimo, maximo = LIMITES[nombre]()
+        bajo, alto = min(max(bajo, minimo), valor), max(min(alto, maximo), valor)
+    return bajo, alto
+
+
+def _evaluar_perturbaciones(entradas, variables, salidas, factor):
+    # Una sola evaluación del motor con el punto nominal seguido de los puntos bajo y alto de cada variable
+    n = len(variables)
+    diseño = {nombre: np.full(2 * n + 1, float(valor)) for nombre, valor in entradas.items()}
+    bajos, altos = np.empty(n), np.empty(n)
+    for i, nombre in enumerate(variables):
+        if nombre not in diseño:
+            raise KeyError(f"Entrada desconocida: {nombre}")
+        bajos[i], altos[i] = _vecinos(nombre, diseño[nombre][0], factor)
+        diseño[nombre][1 + i] = bajos[i]
+        diseño[nombre][1 + n + i] = altos[i]
+    with np.errstate(all="ignore"):
+        resultados = MotorPlatos.evaluar(**diseño)
+    valores = np.array([np.asarray(resultados[nombre], dtype=float) for nombre in salidas])
+    return valores[:, 0], valores[:, 1:n + 1], valores[:, n + 1:], bajos, altos
+
+
+def jacobiano(entradas, variables=VARIABLES, salidas=SALIDAS, paso_relativo=PASO_RELATIVO):
+    # Derivadas de las salidas respecto a las variables por diferencias centradas, con todos los puntos
+    # perturbados en una sola llamada a MotorPlatos.evaluar. `entradas` contiene todas las entradas del
+    # motor como escalares. Devuelve la matriz (salidas × variables) de derivadas y la de elasticidades
+    # (variación relativa de la salida por variación relativa de la entrada).
+    nominal, bajo, alto, x_bajo, x_alto = _evaluar_perturbaciones(entradas, variables, salidas, paso_relativo)
+    x = np.array([float(entradas[nombre]) for nombre in variables])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        derivadas = (alto - bajo) / (x_alto - x_bajo)
+        elasticidades = derivadas * x / nominal[:, None]
+    return {
+        "variables": tuple(variables),
+        "salidas": tuple(salidas),
+        "nominal": dict(zip(salidas, nominal.tolist())),
+        "jacobiano": derivadas,
+        "elasticidades": elasticidades,
+    }
+
+
+def tornado(entradas, salida, variables=VARIABLES, variacion=VARIACION_TORNADO):
+    # Respuesta de una salida al variar cada entrada un ±`variacion` relativo (sin salir de su rango si
+    # está acotada), ordenada de mayor a menor amplitud. Cada fila es
+    # (variable, valor con la entrada baja, valor con la entrada alta, amplitud).
+    nominal, bajo, alto, _, _ = _evaluar_perturbaciones(entradas, variables, (salida,), variacion)
+    amplitud = np.abs(alto[0] - bajo[0])
+    orden = np.argsort(-np.nan_to_num(amplitud, nan=-1.0), kind="stable")
+    return {
+        "salida": salida,
+        "nominal": float(nominal[0]),
+        "filas": [(variables[i], float(bajo[0, i]), float(alto[0, i]), float(amplitud[i])) for i in orden],
+    }
@@ -1,20 +1,28 @@
+import multiprocessing
 import os
 from enum import Enum
-from time import sleep, time
 
-import pandas as pd
 import numpy as np
-from scipy.optimize import fsolve
 import sys
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QPixmap
 
-from CEPCI import CEPCI
 from ChemicalProcessInterface import ChemicalProcessInterface
 from ChemicalProcessInterface import Item
-
-import pyvista as pv
-
+from AlmacenPropiedades import AlmacenPropiedades
+from AlmacenParametros import AlmacenParametros
+from MotorPlatos import MotorPlatos
+from DistribucionAgujeros import DistribucionAgujeros
+from Barrido import barrer
+from Optimizador import optimizar
+from MonteCarlo import montecarlo
+from Sensibilidad import jacobiano
+from ValoracionPlatos import perfil_por_composicion, valorar_platos
+from MotorPropiedades import MotorPropiedades
+from GrafoCalculo import GrafoCalculo
+from EjecucionPasos import EjecutorPasos
+from RenderPlato import RenderPlato
+from Rutas import ruta_recurso
 
 
 class TFG:
@@ -26,6 +34,11 @@ class TFG:
     error = False
     # Buffer para almacenar temporalmente los cambios antes de aplicarse.
     buffer_cambios = []
+    # Resultados que fija la distribución de agujeros del paso 12; el grafo de cálculo no los sobrescribe
+    # con la estimación del motor (número de agujeros como cociente de áreas) sino que rehace la distribución
+    RESULTADOS_DISTRIBUCION = ("numero_agujeros", "paso_agujeros", "fraccion_abierta")
+    # Entradas con las que se hizo la última distribución de agujeros (None si aún no se ha hecho)
+    entradas_distribucion = None
 
     # Mantenemos agrupadas las opciones de espaciado de platos
     class ESPACIADO_ENTRE_PLATOS(Enum):
@@ -82,6 +95,8 @@ class TFG:
         self.diametro_columna_top = Item("Diámetro de la columna en la parte superior", 0.0, "m", False)
         self.diametro_columna_bottom = Item("Diámetro de la columna en la parte inferior", 0.0, "m", False)
         self.flujo_liq_max = Item("Flujo líquido máximo", 0.0, "m3/s", False)
+        self.flujo_limite_invertido = Item("Flujo límite del flujo invertido", 0.0, "m3/s", False)
+        self.flujo_limite_doble = Item("Flujo límite del doble paso", 0.0, "m3/s", False)
         self.diametro_columna = Item("Diámetro de la columna a asignar", 0.0, "m", False)
         self.area_columna = Item("Área de la columna", 0.0, "m2", False)
         self.area_bajante = Item("Área del bajante", 0.0, "m2", False)
@@ -116,6 +131,8 @@ class TFG:
         self.tiempo_residencia = Item("Tiempo de residencia", 0.0, "s", False)
         self.velocidad_area_neta = Item("Velocidad de paso sobre el área neta", 0.0, "m/s", False)
         self.porcentaje_inundacion = Item("Porcentaje de inundación", 0.0, "%", False)
+        self.arrastre_fraccional = Item("Arrastre fraccional", 0.0, "_", False)
+        self.eficiencia_con_arrastre = Item("Eficiencia corregida por el arrastre", 0.0, "%", False)
         self.angulo_borde_plato = Item("Ángulo del borde del plato", 0.0, "Grados", False)
         self.diametro_bandas_sin_perforar = Item("Diámetro de las bandas sin perforar", 0.0, "m", False)
         self.area_bandas_sin_perforar = Item("Área de bandas sin perforar", 0.0, "m2", False)
@@ -125,6 +142,8 @@ class TFG:
         self.area_perforada = Item("Área perforada", 0.0, "m2", False)
         self.area_de_un_agujero = Item("Área de un agujero", 0.0, "m2", False)
         self.numero_agujeros = Item("Número de agujeros", 0, "_", False)
+        self.paso_agujeros = Item("Paso triangular entre agujeros", 0.0, "m", False)
+        self.fraccion_abierta = Item("Fracción de agujeros sobre el área activa", 0.0, "_", False)
         self.longitud_carcasa = Item("Longitud de la carcasa", 0.0, "m", False)
 
         self.peso_carcasa = Item("Peso de la carcasa", 0.0, "kg", False)
@@ -151,6 +170,9 @@ class TFG:
         self.peso_molecular_dest = Item("Peso molecular del destilado", 0.0, "g/mol", False)
         self.peso_molecular_res = Item("Peso molecular del residuo", 0.0, "g/mol", False)
 
+        # Los Item del diseño pasan a ser vistas de la fila 0 de un almacén compacto de parámetros
+        self.parametros = AlmacenParametros.desde_objeto(self)
+
         # Parámetros de ejemplo para la interfaz
         modifiable_items = [self.xd, self.Rm]
         non_modifiable_items = [self.Destilado_flow, self.diametro_columna_top]
@@ -164,6 +186,20 @@ class TFG:
 
         self.script_dir = os.path.dirname(os.path.realpath(__file__))
 
+        # Dependencias entre las magnitudes, para recalcular solo lo afectado al modificar una entrada
+        self.grafo = GrafoCalculo()
+
+        # Cálculos largos de los pasos en segundo plano, con indicador de actividad en la interfaz
+        self.propiedades_cargadas = False
+        self.ejecutor = EjecutorPasos()
+        self.ejecutor.ocupado.connect(self.interface.set_busy)
+
+        # Representación 3D del plato (paso 13)
+        self.render_plato = RenderPlato()
+        self.render_plato.renderizado.connect(self.mostrar_render_plato)
+        self.render_plato.error.connect(
+            lambda mensaje: self.interface.append_console_output(f"Error en la representación 3D: {mensaje}"))
+
         self.init_ui()
 
         self.performStep()
@@ -171,35 +207,75 @@ class TFG:
    
     @staticmethod
     def resource_path(relative_path):
-       
-        try:
-         
-            base_path = sys._MEIPASS
-        except Exception:
-            base_path = os.path.abspath(".")
+        return ruta_recurso(relative_path)
+
+    def mostrar_barrido(self, barrido):
+        factibles = barrido[barrido["factible"]]
+        if len(factibles):
+            self.interface.append_console_output(
+                f"Diámetros comerciales que superan todas las comprobaciones del diseño (rango de la gráfica K1, "
+                f"tipo de flujo, goteo, nivel en el bajante y arrastre) (m): "
+                f"{', '.join(f'{d:.3f}' for d in factibles['diametro_columna'])}")
+        else:
+            self.interface.append_console_output(
+                "Ningún diámetro comercial supera las comprobaciones con el espaciado y el área de agujeros actuales")
 
-        return os.path.join(base_path, relative_path)   
+    def mostrar_render_plato(self, ruta_imagen):
+        # El render puede terminar cuando el usuario ya ha cambiado de paso
+        if self.current_step == 13:
+            self.interface.update_graphics(ruta_imagen)
 
     def init_ui(self):
-        diametros_image_path = self.resource_path('imágenes/diametros_comerciales.png' )
-        gráfica_k1_image_path = self.resource_path('imágenes/gráfico_k1.JPG' )
-        gráfica_flujoplato_image_path =self.resource_path('imágenes/gráfica_flujoplato.JPG' )
-        gráfica_arrastre_diametros_image_path = self.resource_path('imágenes/gráfica_arrastre.PNG' )
-       
-        self.gráfica_k1_pixmap = QPixmap(gráfica_k1_image_path)
-        self.diametros_pixmap = QPixmap(diametros_image_path)
-        self.flujoplato_pixmap = QPixmap (gráfica_flujoplato_image_path)
-        self.arrastre_pixmap = QPixmap(gráfica_arrastre_diametros_image_path)
-
-        if self.diametros_pixmap.isNull():
+        # Solo se guardan las rutas: la caché de imágenes de la interfaz las carga y escala una vez, en cuanto
+        # la ventana está en pantalla (sin retrasar su aparición), para que ningún paso tenga que leer el disco
+        self.diametros_imagen = self.resource_path('imágenes/diametros_comerciales.png' )
+        self.gráfica_k1_imagen = self.resource_path('imágenes/gráfico_k1.JPG' )
+        self.flujoplato_imagen = self.resource_path('imágenes/gráfica_flujoplato.JPG' )
+        self.arrastre_imagen = self.resource_path('imágenes/gráfica_arrastre.PNG' )
+        QTimer.singleShot(0, lambda: self.interface.precargar_graficas(
+            [self.diametros_imagen, self.gráfica_k1_imagen, self.flujoplato_imagen, self.arrastre_imagen]))
+
+        if not os.path.exists(self.diametros_imagen):
             print("Error: No se pudo cargar la imagen")
     
     def actualizar_parametros(self):
         for item, new in self.buffer_cambios:
             if item.value != new:
-                item.value = new
+                try:
+                    item.value = new
+                except ValueError:
+                    # El texto no es numérico; apply_modifications ya ha informado del error
+                    pass
 
         self.buffer_cambios.clear()
+        self.recalcular_dependientes()
+
+    def recalcular_dependientes(self):
+        # Recalcula solo las magnitudes que dependen de las entradas modificadas
+        self.grafo.actualizar(self.entradas_motor())
+        cambios = self.grafo.recalcular()
+        self.asignar_resultados({nombre: nuevo for nombre, (_, nuevo) in cambios.items()
+                                 if nombre not in self.RESULTADOS_DISTRIBUCION})
+        cambios = {nombre: cambio for nombre, cambio in cambios.items() if nombre not in self.RESULTADOS_DISTRIBUCION}
+        if hasattr(self, "diseño_de_plato_provisional"):
+            self.diseño_de_plato_provisional = self.diseño_provisional()
+        # La distribución de agujeros no es un cálculo del grafo: se rehace si cambian sus entradas
+        if self.entradas_distribucion is not None and self.entradas_distribucion != self.entradas_de_distribucion():
+            anteriores = {nombre: getattr(self, nombre).value for nombre in self.RESULTADOS_DISTRIBUCION}
+            try:
+                self.distribuir_agujeros()
+            except ValueError as error:
+                self.entradas_distribucion = None
+                self.error = True
+                self.interface.append_console_output(f"{error}. Reduzca el porcentaje para el área de agujeros o "
+                                                     f"aumente su diámetro")
+            else:
+                cambios.update({nombre: (anterior, getattr(self, nombre).value)
+                                for nombre, anterior in anteriores.items() if getattr(self, nombre).value != anterior})
+        nombres = [getattr(self, nombre).name for nombre in cambios if isinstance(getattr(self, nombre, None), Item)]
+        if nombres and self.current_step > 2:
+            self.interface.append_console_output(f"Valores recalculados ({len(nombres)}): {', '.join(nombres)}")
+        return cambios
 
 
     def handle_parameter_modification(self, item, value):
@@ -207,6 +283,9 @@ class TFG:
 
 
     def handle_button_click(self, button_name):
+        # Al cambiar de paso se descartan los cálculos en segundo plano del paso anterior
+        if button_name in ("Anterior", "Siguiente"):
+            self.ejecutor.cancelar()
         if button_name == "Aplicar":
             self.interface.apply_modifications()
             self.error = False
@@ -219,14 +298,14 @@ class TFG:
             case "Siguiente":
                 if self.error:
                     self.interface.append_console_output("Soluciona el error señalado para continuar avanzando")
-                    # Cuando da error, podemos estar en la comprobación del weeping (paso 7) o del líquido en bajante
-                    # (paso 9).
+                    # Cuando da error, podemos estar en la lectura de K1 (paso 3), la comprobación del weeping (paso 7),
+                    # la del líquido en bajante (paso 9) o la distribución de agujeros (paso 12).
                     match self.current_step:
-                        # Weeping, retornamos al paso 4 (definir el valor del área de agujeros)
-                        case 7:
+                        # Weeping o agujeros que no caben, retornamos al paso 4 (definir el valor del área de agujeros)
+                        case 7 | 12:
                             self.performStep(4)
-                        # Líquido en bajante, retornamos al paso 2 (definir el espaciado de platos)
-                        case 9:
+                        # K1 fuera de la gráfica o líquido en bajante, retornamos al paso 2 (definir el espaciado de platos)
+                        case 3 | 9:
                             self.performStep(2)
                 else:
                     if self.current_step < self.TOTAL_STEPS:
@@ -240,13 +319,120 @@ class TFG:
             case "Aplicar":
                 self.actualizar_parametros()
                 self.performStep()
+            case "Optimizar":
+                self.optimizar_diseño()
+            case "Incertidumbre":
+                self.analizar_incertidumbre()
+            case "Sensibilidad":
+                self.mostrar_sensibilidad()
+            case "Por platos":
+                self.valorar_columna()
             case "B":
                 None
    
         
     
 
-    def cargar_propiedades(self):
+    def optimizar_diseño(self):
+        # Busca el diseño de menor coste que cumple todas las comprobaciones y retoma el cálculo desde el
+        # paso 3 con él, en lugar de iterar a mano con los retrocesos por goteo o nivel en el bajante
+        if self.current_step < 2:
+            self.interface.append_console_output("Avance al paso 2 para cargar las propiedades antes de optimizar")
+            return
+        self.interface.append_console_output("Optimizando el diseño...")
+        entradas = self.entradas_motor()
+        self.ejecutor.ejecutar(lambda cancelado: optimizar(entradas, cancelado=cancelado),
+                               self.aplicar_optimizacion, self.error_en_segundo_plano)
+
+    def aplicar_optimizacion(self, resultado):
+        self.interface.append_console_output(
+            f"Optimización: {resultado['factibles']} diseños factibles de {resultado['evaluados']} evaluados")
+        if resultado["diseño"] is None:
+            self.interface.append_console_output("Ningún diseño cumple todas las comprobaciones")
+            return
+        diseño = resultado["diseño"]
+        for nombre, valor in diseño.items():
+            getattr(self, nombre).value = valor
+        self.interface.append_console_output(
+            f"Diseño de menor coste ($ {resultado['coste']:.3f}): espaciado {diseño['ESPACIADO_SELECCIONADO']} m, "
+            f"diámetro {diseño['diametro_columna']:.3f} m, presa {diseño['altura_presa']:.0f} mm, "
+            f"agujeros de {diseño['diametro_agujeros']} mm, área de agujeros {diseño['CONSTANTE_AGUJERO']:.3f}")
+        activas = ", ".join(resultado["restricciones_activas"]) or "ninguna"
+        limitantes = ", ".join(f"{nombre} ({n})" for nombre, n in resultado["limitantes"].items()) or "ninguna"
+        self.interface.append_console_output(f"Restricciones activas en el óptimo: {activas}")
+        self.interface.append_console_output(f"Restricciones que descartan diseños más baratos: {limitantes}")
+        self.error = False
+        self.performStep(3)
+
+    def analizar_incertidumbre(self):
+        # Probabilidad de que el diseño actual incumpla cada comprobación si las propiedades y los caudales
+        # varían alrededor de sus valores (Monte Carlo con las incertidumbres por defecto)
+        if self.current_step < 6:
+            self.interface.append_console_output(
+                "Complete el diseño provisional (paso 6) antes de analizar la incertidumbre")
+            return
+        self.interface.append_console_output("Propagando la incertidumbre de las entradas...")
+        entradas = self.entradas_motor()
+        self.ejecutor.ejecutar(lambda cancelado: montecarlo(entradas, cancelado=cancelado),
+                               self.mostrar_incertidumbre, self.error_en_segundo_plano)
+
+    def mostrar_incertidumbre(self, resultado):
+        self.interface.append_console_output(f"Análisis de incertidumbre con {resultado['muestras']} muestras:")
+        for nombre, probabilidad in resultado["probabilidad_fallo"].items():
+            self.interface.append_console_output(f"Probabilidad de fallo por {nombre}: {100 * probabilidad:.2f} %")
+        self.interface.append_console_output(
+            f"Probabilidad de incumplir alguna comprobación: {100 * resultado['probabilidad_fallo_total']:.2f} %")
+        for nombre, bandas in resultado["percentiles"].items():
+            if nombre in resultado["deterministas"]:
+                texto = f"{resultado['media'][nombre]:.4g} (determinista: no depende de las entradas inciertas)"
+            else:
+                texto = ", ".join(f"P{p}: {valor:.4g}" for p, valor in bandas.items())
+            self.interface.append_console_output(f"{nombre}: {texto}")
+
+    def mostrar_sensibilidad(self, n_variables=3):
+        # Entradas a las que más responde cada resultado del diseño actual, por su elasticidad
+        if self.current_step < 6:
+            self.interface.append_console_output(
+                "Complete el diseño provisional (paso 6) antes de analizar la sensibilidad")
+            return
+        resultado = jacobiano(self.entradas_motor())
+        self.interface.append_console_output("Elasticidades (variación relativa del resultado por la de la entrada):")
+        for i, salida in enumerate(resultado["salidas"]):
+            elasticidades = resultado["elasticidades"][i]
+            orden = np.argsort(-np.nan_to_num(np.abs(elasticidades), nan=-1.0), kind="stable")[:n_variables]
+            texto = ", ".join(f"{resultado['variables'][j]} {elasticidades[j]:+.3f}" for j in orden
+                              if elasticidades[j] != 0) or "ninguna entrada"
+            self.interface.append_console_output(f"{salida}: {texto}")
+
+    def valorar_columna(self):
+        # Comprobaciones hidráulicas en cada uno de los Num_pisos platos, con las propiedades interpoladas
+        # según la composición, que se supone lineal entre la cabeza y el fondo de la columna
+        if self.current_step < 6:
+            self.interface.append_console_output(
+                "Complete el diseño provisional (paso 6) antes de valorar la columna plato a plato")
+            return
+        entradas = self.entradas_motor()
+        xd, xr = float(self.xd.value), float(self.xr.value)
+        composiciones = np.linspace(xd, xr, int(round(float(self.Num_pisos.value))))
+        valoracion = valorar_platos(perfil_por_composicion(entradas, self.motor_propiedades(), composiciones),
+                                    entradas)
+        self.interface.append_console_output(f"Valoración de los {valoracion['platos'].size} platos:")
+        for nombre, plato in valoracion["plato_limitante"].items():
+            if nombre == "k1_fuera_de_grafica":
+                if not valoracion["holgura_minima"][nombre] >= 0:
+                    self.interface.append_console_output(f"K1 fuera de la gráfica en el plato {int(plato)}")
+                continue
+            self.interface.append_console_output(
+                f"{nombre}: plato limitante {int(plato)}, holgura {float(valoracion['holgura_minima'][nombre]):.3f}")
+        self.interface.append_console_output(
+            f"Caída de presión total en la columna: {float(valoracion['caida_presion_total']):.1f} Pa")
+        if not valoracion["factible"]:
+            self.interface.append_console_output("Algún plato no cumple todas las comprobaciones")
+
+    def error_en_segundo_plano(self, mensaje):
+        self.interface.append_console_output(f"Error en el cálculo: {mensaje}")
+
+    def ruta_propiedades(self):
             
         if hasattr(sys, '_MEIPASS'):
             
@@ -256,213 +442,132 @@ class TFG:
             base_path = os.path.dirname(__file__)
 
         
-        excel_path = os.path.join(base_path, "propiedades.xlsx")
-
-        # Cargar el archivo Excel
-        properties = pd.read_excel(excel_path)
-        self.densidad_dest_liq.value = properties.iloc[3, 1]
-        self.densidad_dest_vap.value = properties.iloc[3, 3]
-        self.densidad_res_liq.value = properties.iloc[3, 2]
-        self.densidad_res_vap.value = properties.iloc[3, 4]
-        self.tension_superficial_dest.value = properties.iloc[6, 1]
-        self.tension_superficial_res.value = properties.iloc[6, 2]
-        self.viscosidad_dest_liq.value = properties.iloc[4, 1]
-        self.viscosidad_dest_vap.value = properties.iloc[4, 3]
-        self.viscosidad_res_liq.value = properties.iloc[4, 2]
-        self.viscosidad_res_vap.value = properties.iloc[4, 4]
-        self.peso_molecular_dest.value = properties.iloc[5, 1]
-        self.peso_molecular_res.value = properties.iloc[5, 2]
+        return os.path.join(base_path, "propiedades.xlsx")
+
+    @staticmethod
+    def leer_propiedades(excel_path):
+        # Cargar las propiedades (el Excel solo se analiza si ha cambiado desde la última vez).
+        # No toca la interfaz, así que se puede ejecutar en segundo plano.
+        propiedades = AlmacenPropiedades(excel_path)
+        return {nombre: propiedades[nombre] for nombre in propiedades.nombres}
+
+    def asignar_propiedades(self, propiedades):
+        for nombre, valor in propiedades.items():
+            item = getattr(self, nombre, None)
+            if isinstance(item, Item):
+                item.value = valor
+        self.propiedades_cargadas = True
+        # Estado de partida del grafo, para que después solo se informe de lo que cambia
+        self.grafo.actualizar(self.entradas_motor())
+        self.grafo.recalcular()
+
+    def motor_propiedades(self):
+        # Propiedades en función de la composición a partir de los dos extremos del libro de propiedades;
+        # se construye una vez por libro y composiciones de destilado y residuo
+        ruta = self.ruta_propiedades()
+        xd, xr = float(self.xd.value), float(self.xr.value)
+        return MotorPropiedades.para_sistema(
+            (ruta, xd, xr), lambda: MotorPropiedades.desde_extremos(self.leer_propiedades(ruta), xd, xr))
+
+    def cargar_propiedades(self):
+        self.asignar_propiedades(self.leer_propiedades(self.ruta_propiedades()))
+
+    def cargar_propiedades_en_segundo_plano(self):
+        # La carga no se cancela al cambiar de paso: sus valores se necesitan en todos los pasos siguientes
+        excel_path = self.ruta_propiedades()
+        self.ejecutor.ejecutar(lambda cancelado: self.leer_propiedades(excel_path), self.asignar_propiedades,
+                               self.error_en_segundo_plano, cancelable=False)
 
 
     def obtener_flv(self, _Ln_flow, _Vn_flow, _Lm_flow, _Vm_flow, _densidad_dest_vap, _densidad_dest_liq,
                     _densidad_res_vap,
                     _densidad_res_liq):
-        tmp1 = _densidad_dest_vap.value / _densidad_dest_liq.value
-        tmp2 = _densidad_res_vap.value / _densidad_res_liq.value
-        self.Factor_liqvap_top.value = (_Ln_flow.value / _Vn_flow.value) * np.sqrt(tmp1)
-        self.Factor_liqvap_bottom.value = (_Lm_flow.value / _Vm_flow.value) * np.sqrt(tmp2)
+        self.Factor_liqvap_top.value = float(MotorPlatos.obtener_flv(_Ln_flow.value, _Vn_flow.value,
+                                                                     _densidad_dest_vap.value, _densidad_dest_liq.value))
+        self.Factor_liqvap_bottom.value = float(MotorPlatos.obtener_flv(_Lm_flow.value, _Vm_flow.value,
+                                                                        _densidad_res_vap.value, _densidad_res_liq.value))
         self.interface.append_console_output(
             f"Valor de Factor líquido-vapor calculado de la parte superior: {self.Factor_liqvap_top.value:.4f}")
         self.interface.append_console_output(
             f"Valor de Factor líquido-vapor calculado de la parte inferior: {self.Factor_liqvap_bottom.value:.4f}")
 
     def calcular_ajustes_grafica_k1(self, flv):
-        k = None
-        if float(self.ESPACIADO_SELECCIONADO.value) == TFG.ESPACIADO_ENTRE_PLATOS.VALOR_0_25.value:
-            k = 0.0278 * flv ** 2 - 0.0593 * flv + 0.053
-        elif float(self.ESPACIADO_SELECCIONADO.value) == TFG.ESPACIADO_ENTRE_PLATOS.VALOR_0_3.value:
-            k = 0.0372 * flv ** 2 - 0.0786 * flv + 0.0653
-        elif float(self.ESPACIADO_SELECCIONADO.value) == TFG.ESPACIADO_ENTRE_PLATOS.VALOR_0_45.value:
-            k = 0.0561 * flv ** 2 - 0.1097 * flv + 0.0848
-        elif float(self.ESPACIADO_SELECCIONADO.value) == TFG.ESPACIADO_ENTRE_PLATOS.VALOR_0_5.value:
-            k = 0.0496 * flv ** 2 - 0.1121 * flv + 0.0938
-        elif float(self.ESPACIADO_SELECCIONADO.value) == TFG.ESPACIADO_ENTRE_PLATOS.VALOR_0_6.value:
-            k = -0.2942 * flv ** 3 + 0.595 * flv ** 2 - 0.4105 * flv + 0.1442
-        return k
+        k = float(MotorPlatos.calcular_ajustes_grafica_k1(flv, float(self.ESPACIADO_SELECCIONADO.value)))
+        return None if np.isnan(k) else k
 
-    @staticmethod
-    def calcular_correccion_k1(t_sup, k1):
-        return (t_sup / 20) ** 0.2 * k1
-
-    @staticmethod
-    def calcular_velocidad_maxima(k1, densidad_liquido, densidad_vapor):
-        return k1 * np.sqrt((densidad_liquido.value - densidad_vapor.value) / densidad_vapor.value)
-
-    @staticmethod
-    def velocidad_maxima_85(velocidad):
-        return velocidad * 0.85
-
-    @staticmethod
-    def calcular_flujo_volumetrico(caudal, peso_molecular, densidad_vapor):
-        return caudal * peso_molecular / (3600 * densidad_vapor)
-
-    @staticmethod
-    def calcular_areas(flujo_volumetrico, velocidad_al_85):
-        area_sin = flujo_volumetrico / velocidad_al_85
-        return area_sin / 0.88
-
-    @staticmethod
-    def calculo_diametro(area):
-        return np.sqrt(area * 4 / np.pi)
-
-    @staticmethod
-    def calculo_flujo_liq_maximo(flujom, peso_molecular, densidad):
-        return flujom.value * peso_molecular.value / densidad.value / 3600
+    def entradas_motor(self):
+        # Valores actuales de los Item que necesita el motor de cálculo
+        return {nombre: float(getattr(self, nombre).value) for nombre in MotorPlatos.ENTRADAS
+                if isinstance(getattr(self, nombre, None), Item)}
 
-    @staticmethod
-    def calculo_de_areas_en_la_columna(const_agujero, diametro_columna):
-        area_columna = (np.pi/4)*(diametro_columna**2)
-        area_bajante = area_columna * 0.12
-        area_neta = area_columna - area_bajante
-        area_activa = area_columna - (2 * area_bajante)
-        area_agujeros = const_agujero * area_activa 
-        def equation(theta):
-            return diametro_columna ** 2 / 8 * (theta - np.sin(theta)) - area_bajante
-
-        theta_solution = fsolve(equation, 1)
-
-        longitud_presa = diametro_columna * np.sin(theta_solution / 2)
-        altura_presa = 50.00  # En mm. 
-        diametro_agujeros = 5.00  # En mm.
-        espesor_de_plato = 5.00  # En mm.
+    def diseño_provisional(self):
         return {
-            "Área de la columna": float(area_columna),
-            "Área del bajante": float(area_bajante),
-            "Área neta": float(area_neta),
-            "Área activa": float(area_activa),
-            "Área de los agujeros": float(area_agujeros),
-            "Longitud de la presa": float(longitud_presa[0]),
-            "Altura de la presa": altura_presa,
-            "Diámetro de agujeros": diametro_agujeros,
-            "Espesor de plato": espesor_de_plato
+            "Área de la columna": self.area_columna.value,
+            "Área del bajante": self.area_bajante.value,
+            "Área neta": self.area_neta.value,
+            "Área activa": self.area_activa.value,
+            "Área de los agujeros": self.area_agujeros.value,
+            "Longitud de la presa": self.longitud_presa.value,
+            "Altura de la presa": float(self.altura_presa.value),
+            "Diámetro de agujeros": float(self.diametro_agujeros.value),
+            "Espesor de plato": self.espesor_de_plato.value
         }
 
+    def entradas_de_distribucion(self):
+        return (float(self.diametro_columna.value), self.longitud_presa.value, float(self.diametro_agujeros.value),
+                self.area_agujeros.value, self.area_activa.value)
+
+    def distribuir_agujeros(self):
+        # Distribución al tresbolillo sobre la zona perforada real: da el número exacto de agujeros, el paso y
+        # la fracción abierta. Lanza ValueError si el área de agujeros no cabe con el paso mínimo.
+        diametro_columna, longitud_presa, diametro_agujeros, area_agujeros, area_activa = \
+            entradas = self.entradas_de_distribucion()
+        distribucion = DistribucionAgujeros.distribuir(diametro_columna, longitud_presa, diametro_agujeros,
+                                                       area_agujeros=area_agujeros, area_activa=area_activa)
+        self.numero_agujeros.value = distribucion["numero_agujeros"]
+        self.paso_agujeros.value = distribucion["paso"]
+        self.fraccion_abierta.value = distribucion["fraccion_abierta_activa"]
+        self.entradas_distribucion = entradas
+        return distribucion
+
+    def asignar_resultados(self, resultados):
+        # Copia los resultados escalares del motor en los Item homónimos
+        for nombre, valor in resultados.items():
+            item = getattr(self, nombre, None)
+            if isinstance(item, Item):
+                item.value = float(valor)
 
     def tiene_weeping(self, flujo_volumetrico_liquido, longitud_presa, area_agujero, densidad_residuo, altura__presa,
                       diametro__agujeros, flujo_vap_max_bottom):
-        self.tasa_max_liq.value = flujo_volumetrico_liquido * densidad_residuo
-        self.tasa_min_liq.value = 0.7 * self.tasa_max_liq.value
-        max_altura_sobre_presa = 1000 * (self.tasa_max_liq.value / (longitud_presa * densidad_residuo)) ** (2 / 3)
-        min_altura_sobre_presa = 1000 * (self.tasa_min_liq.value / (longitud_presa * densidad_residuo)) ** (2 / 3)
-        altura_liq_tasa_min = min_altura_sobre_presa + altura__presa
-        K2p = 5e-6 * altura_liq_tasa_min ** 3 - 0.0013 * altura_liq_tasa_min ** 2 + 0.1286 * altura_liq_tasa_min + 26.221
-        velocidad_min_teorica = (K2p - 0.9 * (25.4 - diametro__agujeros)) / (0.693 ** 0.5)
-        velocidad_min_real = (0.7 * flujo_vap_max_bottom) / area_agujero
-
-        return velocidad_min_real < velocidad_min_teorica
-
-    @staticmethod
-    def obtener_presion(area_agujeros, flujo_vap_max_bottom, densidad_res_liq, densidad_res_vap, altura_presa):
-        velocidad_max = flujo_vap_max_bottom.value / area_agujeros
-        Co = 0.0087 * 0.07 + 0.7579
-        perdida_plato_seco = 51 * ((velocidad_max / Co) ** 2) * (densidad_res_vap.value / densidad_res_liq.value)
-        perdida_residual = 12500 / densidad_res_liq.value
-        perdida_total = perdida_plato_seco + perdida_residual + altura_presa + 25
-        return perdida_total
+        resultado = MotorPlatos.comprobar_weeping(flujo_volumetrico_liquido, longitud_presa, area_agujero,
+                                                  densidad_residuo, altura__presa, diametro__agujeros,
+                                                  flujo_vap_max_bottom)
+        self.asignar_resultados(resultado)
+        return bool(resultado["tiene_weeping"])
 
     def nivel_de_líquido_en_el_bajante(self, altura_presa, longitud_presa, area_bajante, tasa_max_liq, densidad_res_liq,
                                        altura_total, espaciado_seleccionado):
-        altura_apron = altura_presa - 10
-        area_apron = longitud_presa * (altura_apron / 1000)
-        if area_apron < area_bajante:
+        resultado = MotorPlatos.nivel_de_liquido_en_el_bajante(altura_presa, longitud_presa, area_bajante, tasa_max_liq,
+                                                               densidad_res_liq.value, altura_total,
+                                                               espaciado_seleccionado)
+        if resultado["area_apron"] < area_bajante:
             self.interface.append_console_output(
                 "Se usará el área de paso entre el final del bajante y el suelo del plato en el cálculo de la ecuación 2.11 ")
-        elif area_bajante < area_apron:
+        elif area_bajante < resultado["area_apron"]:
             self.interface.append_console_output("Se usará el área del bajante en el cálculo de la ecuación 2.11")
-        perdida_bajante = 166 * (tasa_max_liq / (densidad_res_liq.value * area_apron)) ** 2
-        self.nivel_bajante.value = perdida_bajante + altura_total + altura_presa + 25
+        self.asignar_resultados(resultado)
         self.interface.append_console_output(f"El nivel de líquido en el bajante en (mm) es: {self.nivel_bajante.value:.4f}")
-        espaciado_plato = espaciado_seleccionado
-        EspP = espaciado_plato * 1000.0
-        if self.nivel_bajante.value > 0.5 * (EspP + 50):
-            return False
-        else:
-            return True
-
-
-    @staticmethod
-    def calculo_tiempo_residencia(area_bajante, nivel_bajante, densidad_r_liq, tasa_liq_max):
-        return area_bajante * nivel_bajante * 0.001 * densidad_r_liq / tasa_liq_max
-
-    @staticmethod
-    def porcentaje_flooding(flujo_vol_bottom, area_neta, vel_bottom):
-        velocidad_area_neta = flujo_vol_bottom / area_neta
-        return (velocidad_area_neta / vel_bottom) * 100
-
-    @staticmethod
-    def calcular_area_perforada(diametro_columna, area_columna, longitud_presa, diametro_agujero, area_agujeros):
-        angulo_borde_plato = 180 - 99
-        diametro_bandas_sin_perforar = (diametro_columna - 0.05) * np.pi * (angulo_borde_plato / 180)
-        area_bandas_sin_perforar = 0.05 * diametro_bandas_sin_perforar
-        diametro_zonas_de_calma = longitud_presa + 0.05
-        area_zonas_de_calma = 2 * (diametro_zonas_de_calma * 0.05)
-        area_perforada = area_columna - area_bandas_sin_perforar - area_zonas_de_calma
-        area_de_un_agujero = (np.pi / 4) * (diametro_agujero / 1000) ** 2
-        numero_agujeros = area_agujeros / area_de_un_agujero
-        return numero_agujeros
-
-
-    @staticmethod
-    def calcular_precio_sinot(diametro_columna, espesor_par, densidad_mat, num_pisos, espaciado_plato):
-        longitud_carcasa = num_pisos * espaciado_plato
-        peso_carcasa = np.pi * diametro_columna * longitud_carcasa * espesor_par * densidad_mat
-        coste_carcasa = 17.400 + 79 * peso_carcasa ** 0.85  # Coste solo cáscara
-        coste_platos = 130 + 440 * diametro_columna ** 1.8  # Coste por cada plato
-        coste_total = coste_carcasa + num_pisos * coste_platos  # Coste total de la columna con 17 platos
-        coste_cepci = CEPCI.adjust_for_inflation_sinot(coste_total) 
-        coste_instalacion = coste_cepci * 4  # Coste total contando la instalación
-        return {
-            "coste_final": coste_instalacion,
-            "longitudad_carcasa": longitud_carcasa,
-            "peso_carcasa": peso_carcasa
-        }
-
-
-    @staticmethod
-    def calcular_precio_walas(peso, longitud, diámetro, espesor_par, num_pisos, presión, esfuerzo):
-        D_pies = diámetro.value * 3.281
-        L_pies = longitud * 3.281
-        Peso_libras = peso * 2.205
-        espesor_pies = espesor_par.value * 3.281
-        espesor_trabajo = (((presión.value * diámetro.value) / (2 * esfuerzo.value * 1 + 1.2 * presión.value)) * 3.281)
-        f1 = 1.7
-        f2 = 1.189 + 0.0577 * D_pies
-        f3 = 0.85
-        f4 = 2.25 / (1.0414) ** num_pisos.value
-        Cb = np.exp(7.123 + 0.1478 * np.log(Peso_libras) + 0.02488 * np.log(Peso_libras) ** 2 + 0.01580 * (
-                L_pies / D_pies) * np.log(espesor_pies / espesor_trabajo))
-        C_tray = 375.8 * np.exp(0.1739 * D_pies)
-        C_p1 = 204.9 * D_pies ** 0.6332 * L_pies ** 0.8016
-        C_total = f1 * Cb + num_pisos.value * f2 * f3 * f4 * C_tray + C_p1
-        C_act = CEPCI.adjust_for_inflation_walas(C_total)  
-        C_ins = C_act * 4
-        return C_ins
+        return bool(resultado["bajante_aceptable"])
 
 
     def performStep(self, step=0):
         if step != 0:
             self.current_step = step
 
+        # Si se avanza antes de que termine la carga en segundo plano, las propiedades se leen ahora
+        if self.current_step >= 2 and not self.propiedades_cargadas:
+            self.cargar_propiedades()
+
         match self.current_step:
             case 1:
                 # 1. Presentación de propiedades / Enunciado
@@ -480,7 +585,7 @@ class TFG:
                 new_non_modifiable_items = []
                 self.interface.replace_parameter_list(new_modifiable_items, new_non_modifiable_items)
 
-                self.cargar_propiedades()
+                self.cargar_propiedades_en_segundo_plano()
                 self.init_ui()
                 # Anunciar los valores que han sido cargados.
 
@@ -500,43 +605,48 @@ class TFG:
                                  self.densidad_dest_liq, self.densidad_res_vap, self.densidad_res_liq)
                 
                 self.interface.append_console_output("Una vez se ha calculado el Factor líquido-vapor se obtiene la constante K1")
-                self.interface.update_graphics(self.gráfica_k1_pixmap)
+                self.interface.update_graphics(self.gráfica_k1_imagen)
                 # Cálculo de K1 y K2
                 self.K1.value = self.calcular_ajustes_grafica_k1(self.Factor_liqvap_top.value)
                 self.K2.value = self.calcular_ajustes_grafica_k1(self.Factor_liqvap_bottom.value)
+                if self.K1.value is None or self.K2.value is None:
+                    self.interface.append_console_output(
+                        f"El factor líquido-vapor queda fuera de la gráfica de K1 ({MotorPlatos.RANGO_FLV_K1[0]} a "
+                        f"{MotorPlatos.RANGO_FLV_K1[1]}). Revise los caudales o seleccione otro espaciado de plato")
+                    self.error = True
+                    return
 
                 # Corrección del factor K1 con la tensión superficial
-                self.K1_c.value = self.calcular_correccion_k1(self.tension_superficial_dest.value, self.K1.value)
-                self.K2_c.value = self.calcular_correccion_k1(self.tension_superficial_res.value, self.K2.value)
+                self.K1_c.value = float(MotorPlatos.calcular_correccion_k1(self.tension_superficial_dest.value, self.K1.value))
+                self.K2_c.value = float(MotorPlatos.calcular_correccion_k1(self.tension_superficial_res.value, self.K2.value))
                 self.interface.append_console_output(f"Valor de K1 corregido: {self.K1_c.value:.3f}")
                 self.interface.append_console_output(f"Valor de K2 corregido: {self.K2_c.value:.3f}")
 
                 # Cálculo de la velocidad máxima arriba y abajo
-                self.velocidad_inundación_top.value = self.calcular_velocidad_maxima(self.K1_c.value,
-                                                                                     self.densidad_dest_liq,
-                                                                                     self.densidad_dest_vap)
-                self.velocidad_inundación_bottom.value = self.calcular_velocidad_maxima(self.K2_c.value,
-                                                                                        self.densidad_res_liq,
-                                                                                        self.densidad_res_vap)
+                self.velocidad_inundación_top.value = float(MotorPlatos.calcular_velocidad_maxima(
+                    self.K1_c.value, self.densidad_dest_liq.value, self.densidad_dest_vap.value))
+                self.velocidad_inundación_bottom.value = float(MotorPlatos.calcular_velocidad_maxima(
+                    self.K2_c.value, self.densidad_res_liq.value, self.densidad_res_vap.value))
                 self.interface.append_console_output(
                     f"Valor de velocidad de inundación máximo en la parte superior (m/s): {self.velocidad_inundación_top.value:.3f}")
                 self.interface.append_console_output(
                     f"Valor de velocidad de inundación máximo en la parte inferior (m/s): {self.velocidad_inundación_bottom.value:.3f}")
 
                 # Corrección de la velocidad al 85% para evitar el flooding
-                self.velocidad_inundación_top_correc.value = self.velocidad_maxima_85(self.velocidad_inundación_top.value)
-                self.velocidad_inundación_bottom_correc.value = self.velocidad_maxima_85(
-                    self.velocidad_inundación_bottom.value)
+                self.velocidad_inundación_top_correc.value = float(MotorPlatos.velocidad_maxima_85(
+                    self.velocidad_inundación_top.value))
+                self.velocidad_inundación_bottom_correc.value = float(MotorPlatos.velocidad_maxima_85(
+                    self.velocidad_inundación_bottom.value))
                 self.interface.append_console_output(
                     f"Valor de velocidad de inundación corregido al 85% en la parte superior (m/s): {self.velocidad_inundación_top_correc.value:.3f}")
                 self.interface.append_console_output(
                     f"Valor de velocidad de inundación corregido al 85% en la parte inferior (m/s): {self.velocidad_inundación_bottom_correc.value:.3f}")
 
                 # Cálculo del flujo sobre plato
-                self.flujo_vap_max_top.value = self.calcular_flujo_volumetrico(self.Vn_flow.value, self.peso_molecular_dest.value,
-                                                                    self.densidad_dest_vap.value)
-                self.flujo_vap_max_bottom.value = self.calcular_flujo_volumetrico(self.Vm_flow.value, self.peso_molecular_res.value,
-                                                                       self.densidad_res_vap.value)
+                self.flujo_vap_max_top.value = float(MotorPlatos.calcular_flujo_volumetrico(
+                    self.Vn_flow.value, self.peso_molecular_dest.value, self.densidad_dest_vap.value))
+                self.flujo_vap_max_bottom.value = float(MotorPlatos.calcular_flujo_volumetrico(
+                    self.Vm_flow.value, self.peso_molecular_res.value, self.densidad_res_vap.value))
 
                 self.interface.append_console_output(
                     f"Valor de caudal en la parte superior (m3/s): {self.flujo_vap_max_top.value:.3f}")
@@ -544,18 +654,18 @@ class TFG:
                     f"Valor de caudal en la parte inferior(m3/s): {self.flujo_vap_max_bottom.value:.3f}")
 
                 # Cálculo de las áreas necesarias
-                self.area_total_top.value = self.calcular_areas(self.flujo_vap_max_top.value,
-                                                                self.velocidad_inundación_top_correc.value)
-                self.area_total_bottom.value = self.calcular_areas(self.flujo_vap_max_bottom.value,
-                                                                   self.velocidad_inundación_bottom_correc.value)
+                self.area_total_top.value = float(MotorPlatos.calcular_areas(self.flujo_vap_max_top.value,
+                                                                      self.velocidad_inundación_top_correc.value))
+                self.area_total_bottom.value = float(MotorPlatos.calcular_areas(self.flujo_vap_max_bottom.value,
+                                                                         self.velocidad_inundación_bottom_correc.value))
                 self.interface.append_console_output(
                     f"Valor área calculado tomando el 12% del área del bajante en la parte superior (m2): {self.area_total_top.value:.3f}")
                 self.interface.append_console_output(
                     f"Valor área calculado tomando el 12% del área del bajante en la parte inferior (m2): {self.area_total_bottom.value:.3f}")
 
                 # Diámetro de la columna
-                self.diametro_columna_top.value = self.calculo_diametro(self.area_total_top.value)
-                self.diametro_columna_bottom.value = self.calculo_diametro(self.area_total_bottom.value)
+                self.diametro_columna_top.value = float(MotorPlatos.calculo_diametro(self.area_total_top.value))
+                self.diametro_columna_bottom.value = float(MotorPlatos.calculo_diametro(self.area_total_bottom.value))
                 self.interface.append_console_output(
                     f"Diámetro superior de la columna (m): {self.diametro_columna_top.value:.3f} ")
                 self.interface.append_console_output(
@@ -566,10 +676,17 @@ class TFG:
                 # Selección del diámetro
                 self.interface.append_console_output( "Se usará el mismo diámetro tanto en la parte superior como en la parte de cola, además se tendrán que normalizar los diámetros a valores existentes en el mercado, en este caso: diámetro de columna = 36in o 0.914m", )
                 
-                self.interface.update_graphics(self.diametros_pixmap)
+                self.interface.update_graphics(self.diametros_imagen)
                 self.interface.append_console_output(f"Diámetro calculado: {self.diametro_columna_top.value:.3f}")
                 self.interface.append_console_output("Por favor, seleccione el diámetro comercial compatible")
 
+                # Barrido de diámetros comerciales para el espaciado y el área de agujeros actuales
+                entradas = self.entradas_motor()
+                espaciado, fraccion = float(self.ESPACIADO_SELECCIONADO.value), float(self.CONSTANTE_AGUJERO.value)
+                self.ejecutor.ejecutar(
+                    lambda cancelado: barrer(entradas, espaciados=[espaciado], fracciones=[fraccion], procesos=1),
+                    self.mostrar_barrido, self.error_en_segundo_plano)
+
                 # Reemplazar parámetros de ejemplo
                 if self.error:
                     new_modifiable_items = [self.diametro_columna, self.CONSTANTE_AGUJERO]
@@ -582,15 +699,28 @@ class TFG:
                 # Cálculo del flujo volumétrico de líquido máximo del bottom para elegir el tipo de plato
                 self.interface.append_console_output("Para la selección de flujo sobre el plato se usará la siguiente gráfica, junto al flujo volumétrico máximo y el diámetro")
                 
-                self.interface.update_graphics(self.flujoplato_pixmap)
-                self.flujo_liq_max.value = self.calculo_flujo_liq_maximo(self.Lm_flow, self.peso_molecular_res,
-                                                                         self.densidad_res_liq)
+                self.interface.update_graphics(self.flujoplato_imagen)
+                self.flujo_liq_max.value = float(MotorPlatos.calculo_flujo_liq_maximo(
+                    self.Lm_flow.value, self.peso_molecular_res.value, self.densidad_res_liq.value))
                 
                 self.interface.append_console_output(f"Flujo volumétrico máximo calculado (m3/s): {self.flujo_liq_max.value:.4f}")
                 self.interface.append_console_output(f"Diámetro seleccionado (m): {float(self.diametro_columna.value):.3f}")
+                flujo = MotorPlatos.clasificar_flujo(self.flujo_liq_max.value, float(self.diametro_columna.value))
+                self.asignar_resultados({nombre: flujo[nombre] for nombre in ("flujo_limite_invertido", "flujo_limite_doble")})
+                self.interface.append_console_output(
+                    f"Para este diámetro el flujo es cruzado entre {self.flujo_limite_invertido.value:.4f} y "
+                    f"{self.flujo_limite_doble.value:.4f} m3/s. Tipo de flujo: {flujo['patron_flujo']}")
+                if flujo["patron_flujo"] != "cruzado":
+                    self.interface.append_console_output(
+                        "El diseño de plato supone flujo cruzado de un solo paso; los cálculos siguientes no son "
+                        "representativos de este tipo de flujo. Considere modificar el diámetro de la columna")
             case 6:
                 # Cálculo de las medidas del plato provisionales
-                self.diseño_de_plato_provisional = self.calculo_de_areas_en_la_columna(float(self.CONSTANTE_AGUJERO.value), float(self.diametro_columna.value))
+                areas = MotorPlatos.calculo_de_areas_en_la_columna(float(self.CONSTANTE_AGUJERO.value),
+                                                                   float(self.diametro_columna.value))
+                self.asignar_resultados(areas)
+                self.espesor_de_plato.value = MotorPlatos.ESPESOR_DE_PLATO
+                self.diseño_de_plato_provisional = self.diseño_provisional()
                 self.interface.append_console_output(
                     "Se obtienen los siguientes valores para el diseño provisional de plato, áreas en (m2), longitud en (m) y altura de presa, diámetro de agujeros y espesor de plato en (mm):")
                 for var_name, var_value in self.diseño_de_plato_provisional.items():
@@ -614,12 +744,11 @@ class TFG:
                     self.interface.append_console_output("La columna no presenta goteo.")
             case 8:
                 # Caída de presión
-                self.perdida_total.value = self.obtener_presion(self.diseño_de_plato_provisional["Área de los agujeros"],
-                                     self.flujo_vap_max_bottom, self.densidad_res_liq,
-                                     self.densidad_res_vap,
-                                     self.diseño_de_plato_provisional[
-                                         "Altura de la presa"])
-                self.dif_presion.value = self.perdida_total.value * 0.00981 * self.densidad_res_liq.value
+                self.asignar_resultados(MotorPlatos.obtener_presion(self.diseño_de_plato_provisional["Área de los agujeros"],
+                                                                    self.flujo_vap_max_bottom.value,
+                                                                    self.densidad_res_liq.value,
+                                                                    self.densidad_res_vap.value,
+                                                                    self.diseño_de_plato_provisional["Altura de la presa"]))
                 self.interface.append_console_output(
                     f"La diferencia de presión total calculada es algo superior pero es válida dentro de los límites (Pa): {self.dif_presion.value:.4f} o en (mm):  {self.perdida_total.value:.2f}")
 
@@ -639,83 +768,100 @@ class TFG:
 
             case 10:
                 # Tiempo de residencia/Porcentaje de flooding
-                self.tiempo_residencia.value = self.calculo_tiempo_residencia(self.diseño_de_plato_provisional["Área del bajante"],
-                                                                              self.nivel_bajante.value, self.densidad_res_liq.value,
-                                                                              self.tasa_max_liq.value)
+                self.tiempo_residencia.value = float(MotorPlatos.calculo_tiempo_residencia(
+                    self.diseño_de_plato_provisional["Área del bajante"], self.nivel_bajante.value,
+                    self.densidad_res_liq.value, self.tasa_max_liq.value))
                 self.interface.append_console_output(f"El tiempo de residencia es aceptable (s): {self.tiempo_residencia.value:.2f}")
 
             case 11:
                 self.interface.append_console_output("Se continúa con los cálculos finales.")
-                self.porcentaje_inundacion.value = self.porcentaje_flooding(self.flujo_vap_max_bottom.value, self.diseño_de_plato_provisional["Área neta"],    self.velocidad_inundación_bottom.value)
+                self.asignar_resultados(MotorPlatos.porcentaje_flooding(self.flujo_vap_max_bottom.value,
+                                                                        self.diseño_de_plato_provisional["Área neta"],
+                                                                        self.velocidad_inundación_bottom.value))
                 self.interface.append_console_output( f"El porcentaje de inundación es aceptable. Se podría reducir el diámetro de la columna pero aumentaría la caída de presión: {self.porcentaje_inundacion.value:.2f}%")
                 
-                self.interface.update_graphics(self.arrastre_pixmap)
-                self.interface.append_console_output("Con el factor líquido-vapor y el porcentaje de inundación se comprueba que el arrastre no afectará a la eficiencia de plato ")
+                self.interface.update_graphics(self.arrastre_imagen)
+                self.interface.append_console_output("Con el factor líquido-vapor y el porcentaje de inundación se obtiene el arrastre fraccional")
+                arrastre = MotorPlatos.calcular_arrastre(self.Factor_liqvap_bottom.value,
+                                                         self.porcentaje_inundacion.value, self.Efi.value)
+                self.asignar_resultados(arrastre)
+                self.interface.append_console_output(f"Arrastre fraccional: {self.arrastre_fraccional.value:.4f}")
+                if arrastre["arrastre_aceptable"]:
+                    self.interface.append_console_output(
+                        f"El arrastre es inferior a {MotorPlatos.ARRASTRE_MAXIMO} y no afectará apreciablemente a la "
+                        f"eficiencia de plato: {self.Efi.value:.3f} -> {self.eficiencia_con_arrastre.value:.3f}")
+                else:
+                    self.interface.append_console_output(
+                        f"El arrastre supera {MotorPlatos.ARRASTRE_MAXIMO}: la eficiencia se reduce a "
+                        f"{self.eficiencia_con_arrastre.value:.3f}. Considere aumentar el diámetro o el espaciado de platos")
                 new_modifiable_items = []
-                new_non_modifiable_items = [self.Factor_liqvap_bottom]
+                new_non_modifiable_items = [self.Factor_liqvap_bottom, self.porcentaje_inundacion,
+                                            self.arrastre_fraccional, self.eficiencia_con_arrastre]
                 self.interface.replace_parameter_list(new_modifiable_items, new_non_modifiable_items)
 
             case 12:
                 # Detalles de diseño del plato (de zonas de calma, áreas no perforadas)
                 self.interface.append_console_output(
                     "Se usará una construcción de tipo cartucho. Permitiendo bandas sin perforar en el filo del plato y zonas de calma de 50mm de ancho")
-                self.numero_agujeros.value = self.calcular_area_perforada(float(self.diametro_columna.value), self.area_total_top.value,
-                                                                          self.diseño_de_plato_provisional["Longitud de la presa"],
-                                                                          self.diseño_de_plato_provisional["Diámetro de agujeros"],
-                                                                          self.diseño_de_plato_provisional["Área de los agujeros"])
+                self.asignar_resultados(MotorPlatos.calcular_area_perforada(
+                    float(self.diametro_columna.value), self.area_total_top.value,
+                    self.diseño_de_plato_provisional["Longitud de la presa"],
+                    self.diseño_de_plato_provisional["Diámetro de agujeros"],
+                    self.diseño_de_plato_provisional["Área de los agujeros"]))
                 self.interface.append_console_output(f"Número de agujeros calculados: {self.numero_agujeros.value:.2f}")
 
+                # Distribución al tresbolillo sobre la zona perforada real: da el número exacto de agujeros
+                try:
+                    distribucion = self.distribuir_agujeros()
+                except ValueError as error:
+                    self.interface.append_console_output(
+                        f"{error}. Reduzca el porcentaje para el área de agujeros o aumente su diámetro")
+                    self.error = True
+                    return
+                self.interface.append_console_output(
+                    f"Distribución al tresbolillo con paso de {1000 * self.paso_agujeros.value:.2f} mm "
+                    f"({distribucion['paso_relativo']:.2f} diámetros): {self.numero_agujeros.value} agujeros, "
+                    f"fracción abierta sobre el área activa {self.fraccion_abierta.value:.4f}")
+
+                # Comprobación de goteo con el área de agujeros que realmente queda en el plato
+                goteo = MotorPlatos.comprobar_weeping(self.flujo_liq_max.value,
+                                                      self.diseño_de_plato_provisional["Longitud de la presa"],
+                                                      distribucion["area_agujeros"], self.densidad_res_liq.value,
+                                                      self.diseño_de_plato_provisional["Altura de la presa"],
+                                                      self.diseño_de_plato_provisional["Diámetro de agujeros"],
+                                                      self.flujo_vap_max_bottom.value)
+                if goteo["tiene_weeping"]:
+                    self.interface.append_console_output(
+                        "Con la distribución real de agujeros la columna presenta goteo. Revise el porcentaje para el área de agujeros")
+
             case 13:
         
                 # Finalización del diseño / muestra del archivo 3D
                 self.interface.append_console_output("Generación de la representación 3D del plato diseñado.")
 
-                # Cargar el archivo STL
-                mesh = pv.read("Plato columna.STL")
-
-                # Crear un objeto plotter
-                plotter = pv.Plotter()
-
-                # Añadir la malla STL al plotter
-                plotter.add_mesh(mesh, color='white')
+                # El render se hace fuera de pantalla en segundo plano (o sale de la caché)
+                self.render_plato.solicitar({
+                    "diametro_columna": float(self.diametro_columna.value),
+                    "longitud_presa": self.longitud_presa.value,
+                    "diametro_agujeros": float(self.diametro_agujeros.value),
+                    "paso": self.paso_agujeros.value,
+                    "altura_presa": float(self.altura_presa.value),
+                    "espesor_de_plato": self.espesor_de_plato.value,
+                    "espaciado": float(self.ESPACIADO_SELECCIONADO.value),
+                })
 
-                # Configurar la vista (opcional)
-                plotter.view_isometric()
-
-                # Mostrar la ventana de renderizado y guardar la captura
-                try:
-                    # Intentar guardar la captura de pantalla
-                    route = plotter.show(screenshot="output_plate.png")
-
-                    # Esperar hasta que el archivo se cree
-                    wait_time = 0  # Inicializar tiempo de espera
-                    max_wait_time = 5  # Tiempo máximo de espera en segundos
-                    while not os.path.exists("output_plate.png") and wait_time < max_wait_time:
-                        time.sleep(0.1)  # Esperar 100ms antes de volver a verificar
-                        wait_time += 0.1  # Incrementar el tiempo de espera
-
-                    # Verificar si la ruta es válida antes de actualizar la interfaz
-                    if os.path.exists("output_plate.png"):
-                        self.interface.update_graphics("output_plate.png")
-                    else:
-                        self.interface.append_console_output(
-                            "Error: la captura de pantalla no se generó correctamente.")
-                except RuntimeError:
-                    pass
-            
             case 14:
                 # Estimación de costes
                 self.interface.append_console_output("Se procede a la estimación de costes.")
 
-                self.Coste_sinnot = self.calcular_precio_sinot(self.diametro_columna.value, self.espesor_pared.value,
-                                                               self.Densidad_material.value, self.Num_pisos.value,
-                                                               float(self.ESPACIADO_SELECCIONADO.value))
-                self.Coste_walas = self.calcular_precio_walas(self.Coste_sinnot["peso_carcasa"],
-                                                              self.Coste_sinnot["longitudad_carcasa"],
-                                                              self.diametro_columna, self.espesor_pared,
-                                                              self.Num_pisos, self.Presion_trabajo, self.Esfuerzo)
+                costes = MotorPlatos.costes_columna(float(self.diametro_columna.value), self.Num_pisos.value,
+                                                    float(self.ESPACIADO_SELECCIONADO.value), self.espesor_pared.value,
+                                                    self.Presion_trabajo.value, self.Densidad_material.value,
+                                                    self.Esfuerzo.value)
+                self.asignar_resultados(costes)
+                self.Coste_walas = float(costes["coste_walas"])
                 self.interface.append_console_output(
-                    f"Precio final de la columna con instalación, según el método de Sinnot y Towler ($): {self.Coste_sinnot['coste_final']:.3f}")
+                    f"Precio final de la columna con instalación, según el método de Sinnot y Towler ($): {self.coste_instalacion.value:.3f}")
                 self.interface.append_console_output(
                     f"Precio final de la columna con instalación, según el método de Walas ($): {self.Coste_walas:.3f}")
 
@@ -724,5 +870,7 @@ class TFG:
                 self.interface.append_console_output("Presione Siguiente para retornar al principio.")
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos del barrido en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
     # Inicialización del proceso
     process = TFG()
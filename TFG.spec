@@ -5,8 +5,8 @@ a = Analysis(
     ['TFG.py'],
     pathex=[],
     binaries=[],
-    datas=[('imágenes/diametros_comerciales.png', '.'), ('imágenes/gráfica_arrastre.PNG', '.'), ('imágenes/gráfica_flujoplato.JPG', '.'), ('imágenes/gráfico_k1.JPG', '.'), ('output_plate.png', '.'), ('Plato columna.STL', '.'), ('propiedades.xlsx', '.')],
-    hiddenimports=[],
+    datas=[('imágenes/diametros_comerciales.png', '.'), ('imágenes/gráfica_arrastre.PNG', '.'), ('imágenes/gráfica_flujoplato.JPG', '.'), ('imágenes/gráfico_k1.JPG', '.'), ('output_plate.png', '.'), ('propiedades.xlsx', '.')],
+    hiddenimports=['pyvista', 'pandas'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,103 @@
+import numpy as np
+
+from MotorPlatos import MotorPlatos
+from Optimizador import margenes, RESTRICCIONES, TIEMPO_RESIDENCIA_MINIMO, INUNDACION_MAXIMA
+
+
+# Magnitudes de cada plato y entradas del motor (sección superior, sección inferior) que las reciben.
+# Cada plato se evalúa con las correlaciones de ambas secciones alimentadas con sus propios valores.
+PROPIEDADES_PLATO = {
+    "L": ("Ln_flow", "Lm_flow"),
+    "V": ("Vn_flow", "Vm_flow"),
+    "densidad_liq": ("densidad_dest_liq", "densidad_res_liq"),
+    "densidad_vap": ("densidad_dest_vap", "densidad_res_vap"),
+    "tension_superficial": ("tension_superficial_dest", "tension_superficial_res"),
+    "peso_molecular": ("peso_molecular_dest", "peso_molecular_res"),
+}
+
+# Resultados del motor que se devuelven plato a plato
+RESULTADOS_PLATO = {
+    "Factor_liqvap": "Factor_liqvap_bottom",
+    "velocidad_inundacion": "velocidad_inundación_bottom",
+    "porcentaje_inundacion": "porcentaje_inundacion",
+    "velocidad_min_real": "velocidad_min_real",
+    "velocidad_min_teorica": "velocidad_min_teorica",
+    "perdida_total": "perdida_total",
+    "dif_presion": "dif_presion",
+    "nivel_bajante": "nivel_bajante",
+    "nivel_bajante_maximo": "nivel_bajante_maximo",
+    "tiempo_residencia": "tiempo_residencia",
+    "arrastre_fraccional": "arrastre_fraccional",
+    "eficiencia_con_arrastre": "eficiencia_con_arrastre",
+}
+
+
+def _caudales(entradas, num_pisos, plato_alimentacion):
+    # Caudales de enriquecimiento hasta el plato de alimentación y de agotamiento por debajo.
+    # Sin plato de alimentación se toma el plato central.
+    if num_pisos < 1:
+        raise ValueError("La columna debe tener al menos un plato")
+    plato_alimentacion = (num_pisos + 1) // 2 if plato_alimentacion is None else int(plato_alimentacion)
+    enriquecimiento = np.arange(1, num_pisos + 1) <= plato_alimentacion
+    return {nombre: np.where(enriquecimiento, float(entradas[arriba]), float(entradas[abajo]))
+            for nombre, (arriba, abajo) in PROPIEDADES_PLATO.items() if nombre in ("L", "V")}
+
+
+def perfil_lineal(entradas, num_pisos=None, plato_alimentacion=None):
+    # Perfil aproximado a partir de los dos extremos que usa el método por secciones: las propiedades
+    # varían linealmente del destilado (plato 1, arriba) al residuo (último plato)
+    num_pisos = int(round(float(entradas["Num_pisos"] if num_pisos is None else num_pisos)))
+    perfil = _caudales(entradas, num_pisos, plato_alimentacion)
+    fraccion = np.arange(num_pisos) / max(num_pisos - 1, 1)
+    for nombre, (arriba, abajo) in PROPIEDADES_PLATO.items():
+        if nombre not in perfil:
+            perfil[nombre] = float(entradas[arriba]) + fraccion * (float(entradas[abajo]) - float(entradas[arriba]))
+    return perfil
+
+
+def perfil_por_composicion(entradas, motor, composiciones, temperaturas=None, plato_alimentacion=None):
+    # Perfil con las propiedades de cada plato obtenidas de un MotorPropiedades a partir de su composición
+    # (y temperatura, si la tabla depende de ella); un plato por cada composición
+    composiciones = np.asarray(composiciones, dtype=float)
+    perfil = _caudales(entradas, composiciones.size, plato_alimentacion)
+    propiedades = motor.evaluar(composiciones, temperaturas)
+    faltan = [nombre for nombre in PROPIEDADES_PLATO if nombre not in perfil and nombre not in propiedades]
+    if faltan:
+        raise KeyError(f"Faltan propiedades en la tabla: {', '.join(faltan)}")
+    perfil.update({nombre: propiedades[nombre] for nombre in PROPIEDADES_PLATO if nombre not in perfil})
+    return perfil
+
+
+def valorar_platos(perfil, diseño, tiempo_minimo=TIEMPO_RESIDENCIA_MINIMO, inundacion_maxima=INUNDACION_MAXIMA):
+    # Comprueba todos los platos de una vez (inundación, goteo, nivel en el bajante, tiempo de residencia y
+    # arrastre). `perfil` tiene un array por magnitud de PROPIEDADES_PLATO con un valor por plato (el 1 es
+    # el superior); `diseño` contiene el resto de entradas del motor, como escalares o como arrays de la
+    # misma longitud para valorar varios diseños a la vez.
+    # Los resultados plato a plato tienen forma (platos,) o (diseños, platos). Para cada comprobación se
+    # devuelve la holgura de cada plato, el plato limitante (el de menor holgura) y esa holgura mínima.
+    # La caída de presión acumulada se suma desde el plato superior.
+    perfil = {nombre: np.asarray(perfil[nombre], dtype=float) for nombre in PROPIEDADES_PLATO}
+    n_platos = np.broadcast_shapes(*(valor.shape for valor in perfil.values()))[-1]
+    entradas = {nombre: np.asarray(valor, dtype=float)[..., None]
+                for nombre, valor in diseño.items() if nombre in MotorPlatos.ENTRADAS}
+    for nombre, secciones in PROPIEDADES_PLATO.items():
+        for entrada in secciones:
+            entradas[entrada] = perfil[nombre]
+    entradas.setdefault("Num_pisos", np.asarray(float(n_platos)))
+
+    with np.errstate(all="ignore"):
+        resultados = MotorPlatos.evaluar(**entradas)
+        holguras = margenes(resultados, tiempo_minimo, inundacion_maxima)
+    holguras["k1_fuera_de_grafica"] = np.where(np.isfinite(resultados["K2"]), 0.0, -np.inf)
+
+    valoracion = {"platos": np.arange(1, n_platos + 1)}
+    valoracion.update({nombre: np.array(resultados[origen]) for nombre, origen in RESULTADOS_PLATO.items()})
+    valoracion["holguras"] = {nombre: np.array(holguras[nombre]) for nombre in ("k1_fuera_de_grafica",) + RESTRICCIONES}
+    # Los NaN cuentan como la peor holgura posible
+    peores = {nombre: np.nan_to_num(valor, nan=-np.inf) for nombre, valor in valoracion["holguras"].items()}
+    valoracion["plato_limitante"] = {nombre: np.argmin(valor, axis=-1) + 1 for nombre, valor in peores.items()}
+    valoracion["holgura_minima"] = {nombre: valor.min(axis=-1) for nombre, valor in peores.items()}
+    valoracion["factible"] = np.logical_and.reduce([valor >= 0 for valor in valoracion["holgura_minima"].values()])
+    valoracion["caida_presion_acumulada"] = np.cumsum(valoracion["dif_presion"], axis=-1)
+    valoracion["caida_presion_total"] = valoracion["caida_presion_acumulada"][..., -1]
+    return valoracion
@@ -0,0 +1,83 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Presupuesto de arranque (segundos hasta que se muestra la primera ventana)
+PRESUPUESTO_ARRANQUE = 2.0
+
+DIRECTORIO = os.path.dirname(os.path.realpath(__file__))
+
+# Se sustituye el bucle de eventos para medir el tiempo hasta la primera ventana y salir
+_MEDIR_PRIMERA_VENTANA = """
+import time
+inicio = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+
+def _primera_ventana(app):
+    app.processEvents()
+    print(f"{time.perf_counter() - inicio:.6f}")
+    return 0
+
+QApplication.exec_ = _primera_ventana
+import TFG
+TFG.TFG()
+"""
+
+
+def tiempos_de_importacion(modulo="TFG"):
+    # Tiempo acumulado de cada importación directa de `modulo` según `python -X importtime`.
+    # En esa salida los módulos importados aparecen antes que quien los importa y con un nivel más
+    # de sangría, así que las importaciones directas son las de nivel 1 previas a la línea del módulo.
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                             cwd=DIRECTORIO, capture_output=True, text=True)
+    directas = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        nombre = nombre[1:]
+        nivel = (len(nombre) - len(nombre.lstrip(" "))) // 2
+        if nivel == 0:
+            if nombre.strip() == modulo:
+                directas[f"{modulo} (total)"] = int(acumulado) / 1e6
+                break
+            directas.clear()
+        elif nivel == 1:
+            directas[nombre.strip()] = int(acumulado) / 1e6
+    return dict(sorted(directas.items(), key=lambda par: par[1], reverse=True))
+
+
+def tiempo_hasta_primera_ventana(repeticiones=3):
+    entorno = dict(os.environ)
+    entorno.setdefault("QT_QPA_PLATFORM", "offscreen")
+    tiempos = []
+    for _ in range(repeticiones):
+        proceso = subprocess.run([sys.executable, "-c", _MEDIR_PRIMERA_VENTANA], cwd=DIRECTORIO,
+                                 capture_output=True, text=True, env=entorno, check=True)
+        tiempos.append(float(proceso.stdout.strip().splitlines()[-1]))
+    return min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el tiempo de arranque de TFG.py")
+    parser.add_argument("--presupuesto", type=float, default=PRESUPUESTO_ARRANQUE,
+                        help="tiempo máximo admitido hasta la primera ventana (s)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--modulos", type=int, default=15, help="número de módulos a mostrar")
+    args = parser.parse_args()
+
+    print("Tiempo de importación por módulo (s):")
+    for nombre, segundos in list(tiempos_de_importacion().items())[:args.modulos]:
+        print(f"  {nombre:<30} {segundos:8.3f}")
+
+    primera_ventana = tiempo_hasta_primera_ventana(args.repeticiones)
+    print(f"Tiempo hasta la primera ventana (s): {primera_ventana:.3f} (presupuesto {args.presupuesto:.3f})")
+    if primera_ventana > args.presupuesto:
+        print("Se ha superado el presupuesto de arranque")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos del programa están en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def entradas():
+    # Diseño de referencia (acetona-agua) con todas las entradas del motor como escalares
+    return {
+        "Ln_flow": 54.33, "Vn_flow": 97.85, "Lm_flow": 508.87, "Vm_flow": 97.85,
+        "densidad_dest_liq": 748.0, "densidad_dest_vap": 2.048, "densidad_res_liq": 943.7, "densidad_res_vap": 0.6929,
+        "tension_superficial_dest": 22.7, "tension_superficial_res": 58.82,
+        "peso_molecular_dest": 56.08, "peso_molecular_res": 18.42,
+        "ESPACIADO_SELECCIONADO": 0.5, "diametro_columna": 0.914, "CONSTANTE_AGUJERO": 0.1,
+        "altura_presa": 50.0, "diametro_agujeros": 5.0, "fraccion_bajante": 0.12,
+        "Num_pisos": 17.0, "Efi": 0.6, "espesor_pared": 0.01905, "Densidad_material": 8000.0,
+        "Presion_trabajo": 1180000.0, "Esfuerzo": 540.0,
+    }
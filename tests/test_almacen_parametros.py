@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from AlmacenParametros import AlmacenParametros, ItemVista
+from ChemicalProcessInterface import Item
+
+
+CAMPOS = [
+    ("espaciado", "Espaciado de platos", 0.5, "m", True, [0.6, 0.5, 0.45]),
+    ("platos", "Número de platos", 17, "_", False, None),
+    ("diametro", "Diámetro de la columna", None, "m", False, None),
+]
+
+
+class Diseño:
+    def __init__(self):
+        self.espaciado = Item("Espaciado de platos", 0.5, "m", True, [0.6, 0.5])
+        self.platos = Item("Número de platos", 17, "_")
+        self.diametro = Item("Diámetro de la columna", None, "m")
+        self.nombre = "no es un Item"
+
+
+def test_conserva_los_tipos_asignados():
+    almacen = AlmacenParametros(CAMPOS)
+    assert almacen.como_diccionario() == {"espaciado": 0.5, "platos": 17, "diametro": None}
+    assert type(almacen.leer(0, almacen.indice["platos"])) is int
+    almacen.escribir(0, almacen.indice["platos"], "18.5")
+    assert almacen.leer(0, almacen.indice["platos"]) == 18.5
+    with pytest.raises(ValueError):
+        almacen.escribir(0, 0, "medio metro")
+
+
+def test_vistas_sustituyen_a_los_items_del_objeto():
+    diseño = Diseño()
+    almacen = AlmacenParametros.desde_objeto(diseño)
+    assert almacen.nombres == ("espaciado", "platos", "diametro")
+    assert isinstance(diseño.platos, ItemVista) and diseño.nombre == "no es un Item"
+    assert (diseño.espaciado.name, diseño.espaciado.unit, diseño.espaciado.is_choice, diseño.espaciado.choices) == (
+        "Espaciado de platos", "m", True, [0.6, 0.5])
+
+    diseño.diametro.value = 0.914
+    assert almacen.columna("diametro")[0] == 0.914
+    almacen.escribir(0, almacen.indice["platos"], 20)
+    assert diseño.platos.value == 20
+    # Las vistas, como los Item, no tienen __dict__
+    assert not hasattr(diseño.platos, "__dict__")
+
+
+def test_instantanea_y_restaurar():
+    almacen = AlmacenParametros(CAMPOS)
+    copia = almacen.instantanea()
+    vista = almacen.vista("diametro")
+    vista.value = 1.2
+    almacen.restaurar(copia)
+    assert vista.value is None
+
+
+def test_clonar_y_añadir_filas_crecen_el_almacen():
+    almacen = AlmacenParametros(CAMPOS)
+    assert list(almacen.clonar(veces=3)) == [1, 2, 3]
+    filas = almacen.añadir_filas({"diametro": [0.6, 0.9, 1.2, 1.5, 1.8], "desconocido": 7.0})
+    assert list(filas) == [4, 5, 6, 7, 8] and len(almacen) == 9
+    assert almacen.datos.shape[0] >= 9
+    np.testing.assert_array_equal(almacen.columna("espaciado"), np.full(9, 0.5))
+    np.testing.assert_array_equal(almacen.columna("diametro")[4:], [0.6, 0.9, 1.2, 1.5, 1.8])
+    assert almacen.leer(2, almacen.indice["diametro"]) is None
+    assert almacen.vista("platos", fila=7).value == 17
+    # Las vistas de la fila 0 no se ven afectadas
+    assert almacen.vista("diametro").value is None
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from scipy.optimize import fsolve
+
+from MotorPlatos import MotorPlatos
+
+
+def longitud_presa_fsolve(diametro_columna, fraccion_bajante):
+    # Cálculo original de calculo_de_areas_en_la_columna: fsolve desde θ = 1 sobre el área del bajante
+    area_bajante = fraccion_bajante * (np.pi / 4) * diametro_columna ** 2
+
+    def ecuacion(theta):
+        return diametro_columna ** 2 / 8 * (theta - np.sin(theta)) - area_bajante
+
+    theta = fsolve(ecuacion, 1)[0]
+    return diametro_columna * np.sin(theta / 2)
+
+
+def test_coincide_con_fsolve_en_diametros_y_fracciones_aleatorios():
+    generador = np.random.default_rng(2024)
+    diametros = generador.uniform(0.3, 10.0, 500)
+    fracciones = generador.uniform(0.01, 0.5, 500)
+    esperado = np.array([longitud_presa_fsolve(d, f) for d, f in zip(diametros, fracciones)])
+    np.testing.assert_allclose(MotorPlatos.calcular_longitud_presa(diametros, fracciones), esperado, rtol=1e-7)
+
+
+# En θ = 0 la raíz es triple y fsolve avisa de que converge lentamente
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("fraccion", [0.0, 1e-6, 0.12, 0.499999, 0.5])
+@pytest.mark.parametrize("diametro", [0.3, 0.914, 5.0])
+def test_coincide_con_fsolve_en_los_extremos(diametro, fraccion):
+    esperado = longitud_presa_fsolve(diametro, fraccion)
+    np.testing.assert_allclose(MotorPlatos.calcular_longitud_presa(diametro, fraccion), esperado,
+                               rtol=1e-7, atol=1e-7 * diametro)
+
+
+def test_valores_exactos_en_los_extremos():
+    theta = MotorPlatos.resolver_angulo_cuerda(np.array([0.0, 0.5]))
+    np.testing.assert_allclose(theta, [0.0, np.pi], atol=1e-12)
+    np.testing.assert_allclose(MotorPlatos.calcular_longitud_presa(2.0, np.array([0.0, 0.5])), [0.0, 2.0], atol=1e-12)
+
+
+def test_fracciones_fuera_de_intervalo_dan_nan():
+    assert np.isnan(MotorPlatos.resolver_angulo_cuerda(np.array([-0.1, 0.6]))).all()
+
+
+def test_conserva_la_forma_de_la_entrada():
+    fracciones = np.linspace(0, 0.5, 12).reshape(3, 4)
+    theta = MotorPlatos.resolver_angulo_cuerda(fracciones)
+    assert theta.shape == (3, 4)
+    np.testing.assert_allclose(theta - np.sin(theta), 2 * np.pi * fracciones, atol=1e-12)
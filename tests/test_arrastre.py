@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from MotorPlatos import MotorPlatos
+
+
+def flv_con_arrastre_maximo(porcentaje):
+    # FLV en el que la curva de un porcentaje de inundación de la tabla da ψ = ARRASTRE_MAXIMO
+    coeficientes = np.array(MotorPlatos.AJUSTES_ARRASTRE[porcentaje])
+    coeficientes[-1] -= np.log10(MotorPlatos.ARRASTRE_MAXIMO)
+    raices = [raiz.real for raiz in np.roots(coeficientes) if np.isreal(raiz) and -2 <= raiz.real <= 0]
+    assert len(raices) == 1
+    return 10 ** raices[0]
+
+
+@pytest.mark.parametrize("porcentaje", [30, 45, 60, 80, 95])
+@pytest.mark.parametrize("flv", [0.01, 0.05, 0.2, 1.0])
+def test_en_las_curvas_de_la_tabla(porcentaje, flv):
+    esperado = 10 ** np.polyval(MotorPlatos.AJUSTES_ARRASTRE[porcentaje], np.log10(flv))
+    resultado = MotorPlatos.calcular_arrastre(flv, porcentaje, 0.6)
+    assert resultado["arrastre_fraccional"] == pytest.approx(esperado, rel=1e-13)
+
+
+def test_entre_curvas_interpola_el_logaritmo():
+    log_flv = np.log10(0.1)
+    bajo, alto = (np.polyval(MotorPlatos.AJUSTES_ARRASTRE[p], log_flv) for p in (60, 70))
+    resultado = MotorPlatos.calcular_arrastre(0.1, 64.0, 0.6)
+    assert resultado["arrastre_fraccional"] == pytest.approx(10 ** (bajo + 0.4 * (alto - bajo)), rel=1e-13)
+
+
+@pytest.mark.parametrize("porcentaje", [70, 80, 90, 95])
+def test_clasificacion_en_la_frontera_del_arrastre_maximo(porcentaje):
+    # El arrastre disminuye al aumentar FLV: justo por encima de la frontera es aceptable
+    frontera = flv_con_arrastre_maximo(porcentaje)
+    resultado = MotorPlatos.calcular_arrastre(frontera * np.array([1 - 1e-6, 1 + 1e-6]), porcentaje, 0.6)
+    np.testing.assert_allclose(resultado["arrastre_fraccional"], MotorPlatos.ARRASTRE_MAXIMO, rtol=1e-5)
+    np.testing.assert_array_equal(resultado["arrastre_aceptable"], [False, True])
+
+
+def test_por_debajo_del_60_por_ciento_siempre_aceptable():
+    flv = np.geomspace(0.01, 1.0, 50)
+    resultado = MotorPlatos.calcular_arrastre(flv[:, None], np.array([30.0, 45.0, 60.0]), 0.6)
+    assert resultado["arrastre_aceptable"].all()
+
+
+def test_fuera_de_la_grafica_usa_el_borde():
+    borde = MotorPlatos.calcular_arrastre([0.01, 1.0, 0.1, 0.1], [50.0, 50.0, 30.0, 95.0], 0.6)
+    fuera = MotorPlatos.calcular_arrastre([0.001, 5.0, 0.1, 0.1], [50.0, 50.0, 10.0, 120.0], 0.6)
+    np.testing.assert_array_equal(fuera["arrastre_fraccional"], borde["arrastre_fraccional"])
+
+
+def test_eficiencia_de_colburn():
+    resultado = MotorPlatos.calcular_arrastre(0.05, 90.0, 0.6)
+    psi = resultado["arrastre_fraccional"]
+    assert resultado["eficiencia_con_arrastre"] == pytest.approx(0.6 / (1 + 0.6 * psi / (1 - psi)))
+    assert resultado["eficiencia_con_arrastre"] < 0.6
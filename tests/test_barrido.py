@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Barrido import barrer, COLUMNAS_RESULTADO
+from MotorPlatos import MotorPlatos
+
+
+ESPACIADOS = (0.3, 0.45, 0.6)
+DIAMETROS = (0.61, 0.762, 0.914, 1.219)
+FRACCIONES = (0.06, 0.1, 0.14)
+
+
+def test_en_paralelo_da_la_misma_tabla_que_en_un_proceso(entradas):
+    secuencial = barrer(entradas, ESPACIADOS, DIAMETROS, FRACCIONES, procesos=1)
+    # Bloques pequeños para que cada proceso evalúe varios
+    paralelo = barrer(entradas, ESPACIADOS, DIAMETROS, FRACCIONES, procesos=3, tamaño_bloque=5)
+    pd.testing.assert_frame_equal(secuencial, paralelo)
+
+
+def test_una_fila_por_diseño_en_orden_de_la_malla(entradas):
+    tabla = barrer(entradas, ESPACIADOS, DIAMETROS, FRACCIONES, procesos=1, tamaño_bloque=7)
+    assert len(tabla) == len(ESPACIADOS) * len(DIAMETROS) * len(FRACCIONES)
+    assert list(tabla.columns) == (["ESPACIADO_SELECCIONADO", "diametro_columna", "CONSTANTE_AGUJERO"]
+                                   + list(COLUMNAS_RESULTADO) + ["factible", "fallo"])
+    espaciado, diametro, fraccion = np.meshgrid(ESPACIADOS, DIAMETROS, FRACCIONES, indexing="ij")
+    np.testing.assert_array_equal(tabla["ESPACIADO_SELECCIONADO"], espaciado.ravel())
+    np.testing.assert_array_equal(tabla["diametro_columna"], diametro.ravel())
+    np.testing.assert_array_equal(tabla["CONSTANTE_AGUJERO"], fraccion.ravel())
+
+
+def test_cada_fila_coincide_con_el_motor(entradas):
+    tabla = barrer(entradas, ESPACIADOS, DIAMETROS, FRACCIONES, procesos=1)
+    for fila in tabla.sample(6, random_state=0).itertuples(index=False):
+        diseño = dict(entradas, ESPACIADO_SELECCIONADO=fila.ESPACIADO_SELECCIONADO,
+                      diametro_columna=fila.diametro_columna, CONSTANTE_AGUJERO=fila.CONSTANTE_AGUJERO)
+        with np.errstate(all="ignore"):
+            resultados = MotorPlatos.evaluar(**diseño)
+        for nombre in COLUMNAS_RESULTADO:
+            np.testing.assert_allclose(getattr(fila, nombre), resultados[nombre], rtol=1e-12)
+        comprobacion = MotorPlatos.comprobar_diseño(resultados)
+        assert fila.factible == bool(comprobacion["factible"])
+        assert fila.fallo == str(comprobacion["fallo"])
+
+
+def test_factible_solo_sin_comprobacion_fallida(entradas):
+    tabla = barrer(entradas, ESPACIADOS, DIAMETROS, FRACCIONES, procesos=1)
+    assert tabla["factible"].any() and not tabla["factible"].all()
+    assert ((tabla["fallo"] == "") == tabla["factible"]).all()
+    assert set(tabla["fallo"]) <= {"", "k1_fuera_de_grafica", "patron_flujo", "goteo", "nivel_bajante", "arrastre"}
+
+
+@pytest.mark.parametrize("fijada", ["ESPACIADO_SELECCIONADO", "diametro_columna", "CONSTANTE_AGUJERO"])
+def test_las_variables_del_barrido_sustituyen_a_las_entradas(entradas, fijada):
+    entradas[fijada] = 123.0
+    tabla = barrer(entradas, ESPACIADOS, DIAMETROS, FRACCIONES, procesos=1)
+    assert not (tabla[fijada] == 123.0).any()
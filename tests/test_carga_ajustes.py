@@ -0,0 +1,66 @@
+import json
+
+import numpy as np
+import pytest
+
+from CargaAjustes import cargar_en_motor, leer_ajustes
+from MotorPlatos import MotorPlatos
+
+
+TABLAS = ("AJUSTES_K1", "ESPACIADOS_K1", "COEFICIENTES_K1", "AJUSTES_ARRASTRE", "INUNDACIONES_ARRASTRE",
+          "COEFICIENTES_ARRASTRE", "AJUSTES_FLUJO")
+
+
+@pytest.fixture(autouse=True)
+def tablas_originales():
+    # Las pruebas que cargan ajustes cambian las tablas de la clase: se restauran al terminar
+    originales = {nombre: getattr(MotorPlatos, nombre) for nombre in TABLAS}
+    yield
+    for nombre, valor in originales.items():
+        setattr(MotorPlatos, nombre, valor)
+
+
+def escribir(directorio, grafica, curvas, ajuste="lineal"):
+    with open(directorio / f"ajustes_{grafica}.json", "w", encoding="utf-8") as archivo:
+        json.dump({"grafica": grafica, "ajuste": ajuste, "curvas": curvas}, archivo)
+
+
+def test_sin_archivos_conserva_las_tablas(tmp_path):
+    assert cargar_en_motor(MotorPlatos, tmp_path) == []
+    assert MotorPlatos.AJUSTES_K1[0.6] == (-0.2942, 0.595, -0.4105, 0.1442)
+
+
+def test_carga_ajustes_validos(tmp_path):
+    escribir(tmp_path, "k1", {"0.3": {"coeficientes": [0.01, 0.05]}, "0.6": {"coeficientes": [0.02, 0.1]}})
+    escribir(tmp_path, "flujoplato", {"invertido": {"coeficientes": [1.0, 0.0]},
+                                      "doble": {"coeficientes": [1.0, 1.0]}}, ajuste="log")
+    assert cargar_en_motor(MotorPlatos, tmp_path) == ["k1", "flujoplato"]
+    np.testing.assert_array_equal(MotorPlatos.ESPACIADOS_K1, [0.3, 0.6])
+    assert MotorPlatos.AJUSTES_FLUJO == {"invertido": (1.0, 0.0), "doble": (1.0, 1.0)}
+
+
+@pytest.mark.parametrize("grafica, curvas, ajuste, motivo", [
+    ("k1", {"curva": {"coeficientes": [0.01, 0.05]}}, "lineal", "no es un valor del parámetro"),
+    ("k1", {"0.3": {"coeficientes": [0.01, 0.05]}}, "lineal", "al menos dos curvas"),
+    ("k1", {"0.3": {"coeficientes": []}, "0.6": {"coeficientes": [0.1]}}, "lineal", "coeficientes"),
+    ("k1", {"0.3": {"coeficientes": [1.0] * 9}, "0.6": {"coeficientes": [0.1]}}, "lineal", "coeficientes"),
+    ("k1", {"0.3": {"coeficientes": ["a"]}, "0.6": {"coeficientes": [0.1]}}, "lineal", "no numéricos"),
+    ("k1", {"0.3": {"coeficientes": [0.1]}, "0.6": {"coeficientes": [0.1]}}, "log", "se esperaba"),
+    ("arrastre", {"nan": {"coeficientes": [0.1]}, "40": {"coeficientes": [0.1]}}, "log", "no es un valor finito"),
+    ("flujoplato", {"invertido": {"coeficientes": [1.0, 0.0]}}, "log", "faltan las curvas doble"),
+])
+def test_archivo_no_valido_avisa_y_conserva_las_tablas(tmp_path, grafica, curvas, ajuste, motivo):
+    escribir(tmp_path, grafica, curvas, ajuste)
+    with pytest.raises(ValueError, match=motivo):
+        leer_ajustes(grafica, tmp_path)
+
+    antes = {nombre: getattr(MotorPlatos, nombre) for nombre in TABLAS}
+    with pytest.warns(UserWarning, match=f"Ajustes de la gráfica {grafica} no válidos"):
+        assert cargar_en_motor(MotorPlatos, tmp_path) == []
+    assert all(getattr(MotorPlatos, nombre) is valor for nombre, valor in antes.items())
+
+
+def test_json_mal_formado_avisa(tmp_path):
+    (tmp_path / "ajustes_arrastre.json").write_text("{", encoding="utf-8")
+    with pytest.warns(UserWarning, match="arrastre"):
+        assert cargar_en_motor(MotorPlatos, tmp_path) == []
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from CEPCI import CEPCI
+
+
+@pytest.fixture
+def tabla_original():
+    # load_table cambia la tabla de la clase: se restaura al terminar
+    years, indices = CEPCI.years, CEPCI.cepci_indices
+    yield
+    CEPCI.years, CEPCI.cepci_indices = years, indices
+
+
+@pytest.mark.parametrize("year, indice", [(1959, 101.8), (1964, 103.3), (1980, 261.2), (2001, 394.3),
+                                          (2023, 797.9)])
+def test_indice_de_un_año(year, indice):
+    assert CEPCI.index_of(year) == indice
+
+
+def test_indices_de_varios_años_con_su_forma():
+    np.testing.assert_array_equal(CEPCI.index_of([[1959, 2023], [1980, 1964]]), [[101.8, 797.9], [261.2, 103.3]])
+    assert CEPCI.index_of(np.float64(2019.0)) == 607.5
+
+
+@pytest.mark.parametrize("year", [1958, 2024, 1800, 2000.5, [1990, 2030]])
+def test_año_fuera_de_la_tabla(year):
+    with pytest.raises(ValueError, match="fuera del rango"):
+        CEPCI.index_of(year)
+
+
+def test_escalar_costes():
+    assert CEPCI.escalate(1000.0, 1980, 2023) == pytest.approx(1000.0 * 797.9 / 261.2, rel=1e-15)
+    assert CEPCI.escalate(1000.0, 2023) == pytest.approx(1000.0)
+    np.testing.assert_allclose(CEPCI.escalate([100.0, 200.0], [1964, 1980], 2023),
+                               [100.0 * 797.9 / 103.3, 200.0 * 797.9 / 261.2], rtol=1e-15)
+    assert CEPCI.adjust_for_inflation_walas(1.0) == pytest.approx(797.9 / 103.3)
+    assert CEPCI.adjust_for_inflation_sinot(1.0) == pytest.approx(797.9 / 261.2)
+    with pytest.raises(ValueError):
+        CEPCI.escalate(1000.0, 1950)
+
+
+def test_cargar_años_recientes(tmp_path, tabla_original):
+    ruta = tmp_path / "cepci.csv"
+    ruta.write_text("año,indice\n2023,800.0\n2024,810.5\n", encoding="utf-8")
+    CEPCI.load_table(str(ruta))
+    assert CEPCI.latest_year() == 2024
+    assert CEPCI.index_of(2024) == 810.5 and CEPCI.index_of(2023) == 800.0 and CEPCI.index_of(1959) == 101.8
+
+
+@pytest.mark.parametrize("contenido", ['{"2025": 820.0}', '{"2024": -1}'])
+def test_tabla_no_valida(tmp_path, tabla_original, contenido):
+    ruta = tmp_path / "cepci.json"
+    ruta.write_text(contenido, encoding="utf-8")
+    with pytest.raises(ValueError):
+        CEPCI.load_table(str(ruta))
+    assert CEPCI.latest_year() == 2023
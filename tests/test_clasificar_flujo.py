@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from MotorPlatos import MotorPlatos
+
+
+DIAMETROS = [0.5, 0.914, 1.0, 2.5, 6.0, 10.0]
+
+
+def fronteras(diametro):
+    log_diametro = np.log10(diametro)
+    return (10 ** np.polyval(MotorPlatos.AJUSTES_FLUJO["invertido"], log_diametro),
+            10 ** np.polyval(MotorPlatos.AJUSTES_FLUJO["doble"], log_diametro))
+
+
+def test_fronteras_en_un_metro():
+    # Con log10(D) = 0 cada frontera es el término independiente de su ajuste
+    resultado = MotorPlatos.clasificar_flujo(0.005, 1.0)
+    assert resultado["flujo_limite_invertido"] == pytest.approx(10 ** -2.9373, rel=1e-14)
+    assert resultado["flujo_limite_doble"] == pytest.approx(10 ** -1.9151, rel=1e-14)
+    assert resultado["patron_flujo"] == "cruzado"
+
+
+@pytest.mark.parametrize("diametro", DIAMETROS)
+def test_clase_a_cada_lado_de_las_fronteras(diametro):
+    invertido, doble = fronteras(diametro)
+    caudales = np.array([invertido * 0.5, invertido * (1 - 1e-9), invertido, np.sqrt(invertido * doble),
+                         doble, doble * (1 + 1e-9), doble * 2])
+    resultado = MotorPlatos.clasificar_flujo(caudales, diametro)
+    # En las propias fronteras el flujo todavía es cruzado
+    assert resultado["patron_flujo"].tolist() == ["invertido", "invertido", "cruzado", "cruzado", "cruzado",
+                                                  "doble", "doble"]
+
+
+def test_fronteras_crecen_con_el_diametro():
+    resultado = MotorPlatos.clasificar_flujo(0.01, np.array(DIAMETROS))
+    assert np.all(np.diff(resultado["flujo_limite_invertido"]) > 0)
+    assert np.all(np.diff(resultado["flujo_limite_doble"]) > 0)
+    assert np.all(resultado["flujo_limite_doble"] > resultado["flujo_limite_invertido"])
+
+
+def test_broadcasting_de_caudal_y_diametro():
+    caudales = np.array([1e-5, 5e-3, 1.0])[:, None]
+    resultado = MotorPlatos.clasificar_flujo(caudales, np.array([0.914, 2.5]))
+    assert resultado["patron_flujo"].shape == (3, 2)
+    assert (resultado["patron_flujo"][0] == "invertido").all() and (resultado["patron_flujo"][2] == "doble").all()
+
+
+def test_diseño_de_referencia_con_flujo_cruzado(entradas):
+    resultados = MotorPlatos.evaluar(**entradas)
+    assert resultados["patron_flujo"] == "cruzado"
+    assert resultados["flujo_limite_invertido"] < resultados["flujo_liq_max"] < resultados["flujo_limite_doble"]
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from GrafoCalculo import GrafoCalculo
+from MotorPlatos import MotorPlatos
+
+
+@pytest.fixture
+def grafo(entradas):
+    grafo = GrafoCalculo(valores=entradas)
+    grafo.recalcular()
+    return grafo
+
+
+@pytest.fixture
+def ejecutados(monkeypatch):
+    # Salidas de cada cálculo que ejecuta el grafo, en orden
+    registro = []
+    calcular = MotorPlatos.calcular
+
+    def calcular_y_registrar(funcion, valores, salidas):
+        registro.append(tuple(salidas))
+        return calcular(funcion, valores, salidas)
+
+    monkeypatch.setattr(MotorPlatos, "calcular", staticmethod(calcular_y_registrar))
+    return registro
+
+
+def comprobar_igual_al_motor(grafo, entradas):
+    with np.errstate(all="ignore"):
+        completo = MotorPlatos.evaluar(**entradas)
+    for nombre, valor in completo.items():
+        if np.asarray(valor).dtype.kind in "fc":
+            np.testing.assert_allclose(grafo.valores[nombre], valor, rtol=1e-12, equal_nan=True, err_msg=nombre)
+        else:
+            assert grafo.valores[nombre] == valor, nombre
+
+
+def test_calculo_inicial_coincide_con_el_motor(grafo, entradas):
+    assert grafo.pendientes() == []
+    comprobar_igual_al_motor(grafo, entradas)
+
+
+@pytest.mark.parametrize("entrada, valor", [
+    ("altura_presa", 60.0), ("diametro_agujeros", 4.0), ("Efi", 0.7), ("Presion_trabajo", 1.5e6),
+    ("ESPACIADO_SELECCIONADO", 0.6), ("densidad_res_liq", 900.0),
+])
+def test_solo_recalcula_los_dependientes_de_la_entrada(grafo, entradas, ejecutados, entrada, valor):
+    dependientes = set(grafo.dependientes(entrada))
+    consumidores = [salidas for _, nombres, salidas in MotorPlatos.CALCULOS if entrada in nombres]
+
+    grafo.actualizar({entrada: valor})
+    cambios = grafo.recalcular()
+
+    assert ejecutados, "no se ha recalculado nada"
+    assert all(set(salidas) <= dependientes for salidas in ejecutados)
+    assert all(salidas in ejecutados for salidas in consumidores)
+    assert set(cambios) <= dependientes
+    comprobar_igual_al_motor(grafo, dict(entradas, **{entrada: valor}))
+
+
+def test_entrada_sin_cambios_no_recalcula_nada(grafo, entradas, ejecutados):
+    grafo.actualizar({"altura_presa": entradas["altura_presa"]})
+    assert grafo.recalcular() == {}
+    assert ejecutados == []
+
+
+def test_no_propaga_si_un_resultado_no_cambia(ejecutados):
+    # El arrastre limita el FLV a la gráfica (hasta 1): pasar de 2 a 3 no cambia su resultado y el cálculo
+    # que depende de él no se repite
+    calculos = (
+        ("calcular_arrastre", ("flv", "porcentaje", "Efi"),
+         ("arrastre_fraccional", "eficiencia_con_arrastre", "arrastre_aceptable")),
+        ("velocidad_maxima_85", ("arrastre_fraccional",), ("arrastre_85",)),
+    )
+    grafo = GrafoCalculo(calculos, {"flv": 2.0, "porcentaje": 60.0, "Efi": 0.6})
+    grafo.recalcular()
+    ejecutados.clear()
+
+    grafo.actualizar({"flv": 3.0})
+    assert grafo.recalcular() == {}
+    assert ejecutados == [calculos[0][2]]
+
+    grafo.actualizar({"flv": 0.5})
+    assert set(grafo.recalcular()) == {"arrastre_fraccional", "eficiencia_con_arrastre", "arrastre_85"}
+    assert ejecutados[1:] == [calculos[0][2], calculos[1][2]]
+
+
+def test_resultados_calculados_no_se_asignan(grafo):
+    with pytest.raises(KeyError, match="resultado calculado"):
+        grafo.actualizar({"K1": 0.1})
+
+
+def test_entrada_que_falta_deja_pendientes_sus_dependientes(entradas):
+    del entradas["Efi"]
+    grafo = GrafoCalculo(valores=entradas)
+    grafo.recalcular()
+    assert set(grafo.pendientes()) == set(grafo.dependientes("Efi"))
+    grafo.actualizar({"Efi": 0.6})
+    grafo.recalcular()
+    assert grafo.pendientes() == []
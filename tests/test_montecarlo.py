@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+import MonteCarlo
+from MonteCarlo import montecarlo, muestrear, INCERTIDUMBRES, SALIDAS
+from MotorPlatos import MotorPlatos
+
+
+# Con el diámetro incierto también varían los costes
+INCERTIDUMBRES_CON_DIAMETRO = dict(INCERTIDUMBRES, diametro_columna=("normal", 0.05))
+
+
+@pytest.fixture
+def muestras_evaluadas(monkeypatch):
+    # Resultados de cada bloque que evalúa montecarlo, para comparar con NumPy sobre todas las muestras
+    bloques = []
+    evaluar = MotorPlatos.evaluar
+
+    def evaluar_y_guardar(**entradas):
+        resultados = evaluar(**entradas)
+        n = np.size(entradas["Ln_flow"])
+        bloques.append({nombre: np.broadcast_to(resultados[nombre], (n,)).copy() for nombre in SALIDAS})
+        return resultados
+
+    monkeypatch.setattr(MotorPlatos, "evaluar", staticmethod(evaluar_y_guardar))
+
+    def todas(nombre):
+        valores = np.concatenate([bloque[nombre] for bloque in bloques])
+        return valores[np.isfinite(valores)]
+    return todas
+
+
+@pytest.mark.parametrize("tamaño_bloque", [20_000, 997, 1])
+def test_media_y_desviacion_coinciden_con_numpy(entradas, muestras_evaluadas, tamaño_bloque):
+    muestras = 20_000 if tamaño_bloque > 1 else 500
+    resultado = montecarlo(entradas, muestras, INCERTIDUMBRES_CON_DIAMETRO, tamaño_bloque=tamaño_bloque)
+    for nombre in SALIDAS:
+        valores = muestras_evaluadas(nombre)
+        assert resultado["media"][nombre] == pytest.approx(valores.mean(), rel=1e-13), nombre
+        assert resultado["desviacion"][nombre] == pytest.approx(valores.std(ddof=1), rel=1e-11), nombre
+        assert resultado["minimo"][nombre] == valores.min() and resultado["maximo"][nombre] == valores.max()
+
+
+def test_bloques_combinados_igual_que_un_bloque(entradas):
+    # Las mismas muestras evaluadas por bloques y en una sola evaluación. Cada bloque tiene su propio
+    # generador, así que el bloque único se forma repitiendo el muestreo de cada uno
+    muestras, tamaño_bloque = 6_000, 1_000
+    partido = montecarlo(entradas, muestras, tamaño_bloque=tamaño_bloque, tamaño_reserva=muestras)
+    bloques = []
+    for secuencia in np.random.SeedSequence(0).spawn(muestras // tamaño_bloque):
+        generador = np.random.default_rng(secuencia)
+        bloques.append({nombre: muestrear(generador, entradas[nombre], distribucion, dispersion, tamaño_bloque)
+                        for nombre, (distribucion, dispersion) in INCERTIDUMBRES.items()})
+    diseño = dict(entradas)
+    diseño.update({nombre: np.concatenate([bloque[nombre] for bloque in bloques]) for nombre in INCERTIDUMBRES})
+    with np.errstate(all="ignore"):
+        resultados = MotorPlatos.evaluar(**diseño)
+    for nombre in SALIDAS:
+        valores = np.broadcast_to(resultados[nombre], (muestras,))
+        assert partido["media"][nombre] == pytest.approx(np.nanmean(valores), rel=1e-13), nombre
+        assert partido["desviacion"][nombre] == pytest.approx(np.nanstd(valores, ddof=1), rel=1e-11), nombre
+
+
+def test_salidas_deterministas_sin_dispersion(entradas):
+    resultado = montecarlo(entradas, 50_000, tamaño_bloque=7_000)
+    # Los costes solo dependen del diámetro, el espaciado y la carcasa, que no se muestrean por defecto
+    assert set(resultado["deterministas"]) == {"coste_instalacion", "coste_walas"}
+    for nombre in resultado["deterministas"]:
+        assert resultado["desviacion"][nombre] == 0.0
+        nominal = float(MotorPlatos.evaluar(**entradas)[nombre])
+        assert resultado["media"][nombre] == nominal
+    assert montecarlo(entradas, 10_000, INCERTIDUMBRES_CON_DIAMETRO)["deterministas"] == ()
+
+
+def test_probabilidades_y_percentiles_con_reserva_completa(entradas, muestras_evaluadas):
+    resultado = montecarlo(entradas, 8_000, tamaño_bloque=3_000, tamaño_reserva=10_000)
+    for nombre in SALIDAS:
+        esperado = np.percentile(muestras_evaluadas(nombre), MonteCarlo.PERCENTILES)
+        np.testing.assert_allclose(list(resultado["percentiles"][nombre].values()), esperado, rtol=1e-12)
+    assert all(0 <= p <= 1 for p in resultado["probabilidad_fallo"].values())
+    assert resultado["probabilidad_fallo_total"] >= max(resultado["probabilidad_fallo"].values())
+
+
+def test_reproducible_con_la_misma_semilla(entradas):
+    primero = montecarlo(entradas, 30_000, tamaño_bloque=10_000, semilla=7)
+    assert montecarlo(entradas, 30_000, tamaño_bloque=10_000, semilla=7) == primero
+    assert montecarlo(entradas, 30_000, tamaño_bloque=10_000, semilla=8)["media"] != primero["media"]
+
+
+def test_errores_y_cancelacion(entradas):
+    assert montecarlo(entradas, 1_000, cancelado=lambda: True) is None
+    with pytest.raises(ValueError, match="positivo"):
+        montecarlo(entradas, 0)
+    with pytest.raises(KeyError, match="desconocidas"):
+        montecarlo(entradas, 100, {"caudal": ("normal", 0.1)})
+    with pytest.raises(ValueError, match="Distribución desconocida"):
+        montecarlo(entradas, 100, {"Ln_flow": ("beta", 0.1)})
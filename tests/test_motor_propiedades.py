@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from MotorPropiedades import MotorPropiedades
+
+
+@pytest.fixture
+def tabla():
+    generador = np.random.default_rng(3)
+    composiciones = np.array([0.0, 0.1, 0.35, 0.6, 0.95, 1.0])
+    temperaturas = np.array([20.0, 40.0, 65.0, 100.0])
+    tablas = {
+        "densidad_liq": generador.uniform(700, 1000, (6, 4)),
+        "tension_superficial": generador.uniform(20, 70, (6, 4)),
+    }
+    return composiciones, temperaturas, tablas
+
+
+def test_exacta_en_los_nodos(tabla):
+    composiciones, temperaturas, tablas = tabla
+    motor = MotorPropiedades(composiciones, tablas, temperaturas)
+    x, t = np.meshgrid(composiciones, temperaturas, indexing="ij")
+    valores = motor.evaluar(x, t)
+    for nombre, esperado in tablas.items():
+        np.testing.assert_array_equal(valores[nombre], esperado)
+
+
+def test_exacta_en_los_nodos_con_ejes_desordenados(tabla):
+    composiciones, temperaturas, tablas = tabla
+    orden_x, orden_t = [3, 0, 5, 1, 4, 2], [2, 0, 3, 1]
+    motor = MotorPropiedades(composiciones[orden_x], {nombre: valor[orden_x][:, orden_t]
+                                                      for nombre, valor in tablas.items()}, temperaturas[orden_t])
+    x, t = np.meshgrid(composiciones, temperaturas, indexing="ij")
+    np.testing.assert_array_equal(motor.evaluar(x, t)["densidad_liq"], tablas["densidad_liq"])
+
+
+def test_bilineal_dentro_de_cada_celda(tabla):
+    composiciones, temperaturas, tablas = tabla
+    motor = MotorPropiedades(composiciones, tablas, temperaturas)
+    v = tablas["densidad_liq"]
+    generador = np.random.default_rng(5)
+    for i, j in [(0, 0), (2, 1), (4, 2), (5 - 1, 3 - 1)]:
+        u, s = generador.uniform(0, 1, 2)
+        x = composiciones[i] + u * (composiciones[i + 1] - composiciones[i])
+        t = temperaturas[j] + s * (temperaturas[j + 1] - temperaturas[j])
+        esperado = ((1 - u) * (1 - s) * v[i, j] + u * (1 - s) * v[i + 1, j]
+                    + (1 - u) * s * v[i, j + 1] + u * s * v[i + 1, j + 1])
+        assert motor.evaluar(x, t)["densidad_liq"] == pytest.approx(esperado, rel=1e-13)
+
+
+def test_fuera_de_la_tabla_toma_el_borde(tabla):
+    composiciones, temperaturas, tablas = tabla
+    motor = MotorPropiedades(composiciones, tablas, temperaturas)
+    valores = motor.evaluar([-0.5, 1.5], [0.0, 500.0], propiedades=("tension_superficial",))
+    assert list(valores) == ["tension_superficial"]
+    np.testing.assert_array_equal(valores["tension_superficial"],
+                                  [tablas["tension_superficial"][0, 0], tablas["tension_superficial"][-1, -1]])
+
+
+def test_solo_composicion_es_lineal():
+    motor = MotorPropiedades([0.01, 0.95], {"densidad_liq": [943.7, 748.0]})
+    np.testing.assert_allclose(motor.evaluar([0.01, 0.48, 0.95])["densidad_liq"], [943.7, 845.85, 748.0])
+
+
+def test_tabla_no_valida():
+    with pytest.raises(ValueError, match="vacía"):
+        MotorPropiedades([0.0, 1.0], {})
+    with pytest.raises(ValueError, match="repetidas"):
+        MotorPropiedades([0.0, 0.5, 0.5], {"densidad_liq": [1.0, 2.0, 3.0]})
@@ -0,0 +1,71 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from MotorPlatos import MotorPlatos
+from Optimizador import margenes, optimizar, OBJETIVOS, RESTRICCIONES, VARIABLES
+
+
+# Malla pequeña para poder comprobar el óptimo evaluando los diseños uno a uno
+MALLA = {
+    "espaciados": (0.45, 0.5, 0.6),
+    "diametros": (0.61, 0.762, 0.914, 1.067),
+    "alturas_presa": (40.0, 50.0, 60.0),
+    "diametros_agujero": (4.0, 5.0, 6.0),
+    "fracciones": (0.06, 0.08, 0.1, 0.12),
+}
+
+
+def factibles_uno_a_uno(entradas, objetivo):
+    # (coste, pérdida de presión, diseño) de cada diseño factible de la malla
+    factibles = []
+    for valores in itertools.product(*MALLA.values()):
+        diseño = dict(zip(VARIABLES, valores))
+        with np.errstate(all="ignore"):
+            resultados = MotorPlatos.evaluar(**dict(entradas, **diseño))
+            holguras = margenes(resultados)
+        dentro = np.isfinite(resultados["K1"]) & np.isfinite(resultados["K2"])
+        if dentro and all(holguras[nombre] >= 0 for nombre in RESTRICCIONES):
+            coste = np.mean([resultados[nombre] for nombre in OBJETIVOS[objetivo]])
+            factibles.append((float(coste), float(resultados["perdida_total"]), diseño))
+    return factibles
+
+
+@pytest.mark.parametrize("objetivo", ["sinnott", "walas", "ambos"])
+def test_optimo_es_el_diseño_factible_mas_barato(entradas, objetivo):
+    with np.errstate(all="ignore"):
+        resultado = optimizar(entradas, objetivo, **MALLA, tamaño_bloque=50)
+    factibles = factibles_uno_a_uno(entradas, objetivo)
+    assert resultado["evaluados"] == np.prod([len(eje) for eje in MALLA.values()])
+    assert resultado["factibles"] == len(factibles) > 0
+
+    coste, perdida, diseño = min(factibles, key=lambda f: (f[0], f[1]))
+    assert resultado["coste"] == pytest.approx(coste, rel=1e-12)
+    assert resultado["diseño"] == pytest.approx(diseño)
+    assert all(holgura >= 0 for holgura in resultado["holguras"].values())
+    assert resultado["resultados"]["patron_flujo"] == "cruzado"
+
+
+def test_margenes_del_optimo_coinciden_con_el_motor(entradas):
+    with np.errstate(all="ignore"):
+        resultado = optimizar(entradas, **MALLA)
+        holguras = margenes(MotorPlatos.evaluar(**dict(entradas, **resultado["diseño"])))
+    assert all(holguras[nombre] >= 0 for nombre in RESTRICCIONES)
+    assert resultado["holguras"] == pytest.approx({nombre: float(holguras[nombre]) for nombre in RESTRICCIONES})
+    # Las restricciones activas son las de holgura pequeña; las limitantes descartan diseños más baratos
+    assert all(resultado["holguras"][nombre] <= 0.05 for nombre in resultado["restricciones_activas"])
+    assert all(n > 0 for n in resultado["limitantes"].values())
+
+
+def test_sin_diseños_factibles(entradas):
+    with np.errstate(all="ignore"):
+        resultado = optimizar(entradas, **dict(MALLA, diametros=(0.3,)), inundacion_maxima=1.0)
+    assert resultado["factibles"] == 0
+    assert resultado["diseño"] is None and resultado["coste"] is None
+
+
+def test_cancelado_y_objetivo_desconocido(entradas):
+    assert optimizar(entradas, **MALLA, cancelado=lambda: True) is None
+    with pytest.raises(ValueError, match="Objetivo desconocido"):
+        optimizar(entradas, "barato", **MALLA)
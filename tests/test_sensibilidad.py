@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from MotorPlatos import MotorPlatos
+from Sensibilidad import jacobiano, tornado, SALIDAS, VARIABLES
+
+
+def derivada_centrada(entradas, variable, salida, paso):
+    bajo = MotorPlatos.evaluar(**dict(entradas, **{variable: entradas[variable] - paso}))[salida]
+    alto = MotorPlatos.evaluar(**dict(entradas, **{variable: entradas[variable] + paso}))[salida]
+    return (float(alto) - float(bajo)) / (2 * paso)
+
+
+def test_jacobiano_coincide_con_diferencias_una_a_una(entradas):
+    resultado = jacobiano(entradas)
+    assert resultado["jacobiano"].shape == (len(SALIDAS), len(VARIABLES))
+    for i, salida in enumerate(SALIDAS):
+        for j, variable in enumerate(VARIABLES):
+            esperado = derivada_centrada(entradas, variable, salida, 1e-4 * entradas[variable])
+            assert resultado["jacobiano"][i, j] == pytest.approx(esperado, rel=1e-6, abs=1e-9), (salida, variable)
+
+
+@pytest.mark.parametrize("salida, variable, elasticidad", [
+    # Pérdida en plato seco ∝ (caudal de vapor / área de agujeros)², con área ∝ D²·constante
+    ("perdida_plato_seco", "diametro_columna", -4.0),
+    ("perdida_plato_seco", "CONSTANTE_AGUJERO", -2.0),
+    ("perdida_plato_seco", "Vm_flow", 2.0),
+    ("porcentaje_inundacion", "diametro_columna", -2.0),
+    ("perdida_total", "Ln_flow", 0.0),
+])
+def test_elasticidades_de_leyes_potenciales(entradas, salida, variable, elasticidad):
+    resultado = jacobiano(entradas)
+    i, j = SALIDAS.index(salida), VARIABLES.index(variable)
+    assert resultado["elasticidades"][i, j] == pytest.approx(elasticidad, abs=1e-6)
+
+
+@pytest.mark.parametrize("espaciado", [0.25, 0.3, 0.45, 0.5, 0.6])
+def test_espaciado_se_deriva_dentro_de_la_grafica(entradas, espaciado):
+    # Entre curvas K1 se interpola, así que el espaciado se deriva como las demás entradas; en los extremos
+    # de la gráfica la diferencia es lateral en lugar de dar NaN
+    entradas["ESPACIADO_SELECCIONADO"] = espaciado
+    resultado = jacobiano(entradas, variables=("ESPACIADO_SELECCIONADO",))
+    derivadas = resultado["jacobiano"][:, 0]
+    assert np.all(np.isfinite(derivadas))
+    i = SALIDAS.index("diametro_columna_top")
+    assert derivadas[i] < 0  # Más espaciado admite más velocidad de vapor y menos diámetro
+
+
+def test_tornado_ordenado_y_con_espaciado_acotado(entradas):
+    entradas["ESPACIADO_SELECCIONADO"] = 0.6
+    resultado = tornado(entradas, "perdida_total")
+    amplitudes = [fila[3] for fila in resultado["filas"]]
+    assert amplitudes == sorted(amplitudes, reverse=True)
+    assert resultado["nominal"] == pytest.approx(float(MotorPlatos.evaluar(**entradas)["perdida_total"]))
+    filas = {fila[0]: fila for fila in resultado["filas"]}
+    assert all(np.isfinite(filas[variable][1:]).all() for variable in VARIABLES)
+    # Al 10 % la altura de presa cambia la pérdida total en la misma cantidad a cada lado
+    _, bajo, alto, _ = filas["altura_presa"]
+    assert alto - resultado["nominal"] == pytest.approx(resultado["nominal"] - bajo)
+
+
+def test_entrada_desconocida(entradas):
+    with pytest.raises(KeyError, match="Entrada desconocida"):
+        jacobiano(entradas, variables=("caudal",))
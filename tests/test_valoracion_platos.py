@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from MotorPlatos import MotorPlatos
+from ValoracionPlatos import perfil_lineal, valorar_platos, PROPIEDADES_PLATO
+
+
+def evaluar_plato(entradas, perfil, k):
+    # Un plato evaluado por separado: las dos secciones del motor reciben los valores del plato
+    plato = dict(entradas)
+    for nombre, secciones in PROPIEDADES_PLATO.items():
+        for entrada in secciones:
+            plato[entrada] = perfil[nombre][k]
+    with np.errstate(all="ignore"):
+        return MotorPlatos.evaluar(**plato)
+
+
+def test_suma_plato_a_plato_igual_a_la_caida_total(entradas):
+    perfil = perfil_lineal(entradas)
+    valoracion = valorar_platos(perfil, entradas)
+    n = int(entradas["Num_pisos"])
+    caidas = [float(evaluar_plato(entradas, perfil, k)["dif_presion"]) for k in range(n)]
+    np.testing.assert_allclose(valoracion["dif_presion"], caidas, rtol=1e-12)
+    np.testing.assert_allclose(valoracion["caida_presion_acumulada"], np.cumsum(caidas), rtol=1e-12)
+    assert valoracion["caida_presion_total"] == pytest.approx(sum(caidas), rel=1e-12)
+
+
+def test_varios_diseños_a_la_vez(entradas):
+    perfil = perfil_lineal(entradas)
+    diametros = np.array([0.762, 0.914, 1.067])
+    valoracion = valorar_platos(perfil, dict(entradas, diametro_columna=diametros))
+    n = int(entradas["Num_pisos"])
+    assert valoracion["dif_presion"].shape == (3, n)
+    for i, diametro in enumerate(diametros):
+        por_separado = valorar_platos(perfil, dict(entradas, diametro_columna=diametro))
+        np.testing.assert_allclose(valoracion["caida_presion_total"][i], por_separado["caida_presion_total"],
+                                   rtol=1e-12)
+        np.testing.assert_allclose(valoracion["porcentaje_inundacion"][i], por_separado["porcentaje_inundacion"],
+                                   rtol=1e-12)
+
+
+def test_perfil_lineal_de_destilado_a_residuo(entradas):
+    perfil = perfil_lineal(entradas, num_pisos=5, plato_alimentacion=2)
+    np.testing.assert_array_equal(perfil["L"], [54.33, 54.33, 508.87, 508.87, 508.87])
+    np.testing.assert_allclose(perfil["densidad_liq"], np.linspace(748.0, 943.7, 5))
+    assert perfil["tension_superficial"][[0, -1]] == pytest.approx([22.7, 58.82])
+
+
+def test_plato_limitante_es_el_de_menor_holgura(entradas):
+    valoracion = valorar_platos(perfil_lineal(entradas), entradas)
+    for nombre, holguras in valoracion["holguras"].items():
+        peores = np.nan_to_num(holguras, nan=-np.inf)
+        assert valoracion["holgura_minima"][nombre] == peores.min()
+        assert peores[valoracion["plato_limitante"][nombre] - 1] == peores.min()
+    assert valoracion["factible"] == all(h >= 0 for h in valoracion["holgura_minima"].values())
+
+
+def test_columna_sin_platos(entradas):
+    with pytest.raises(ValueError, match="al menos un plato"):
+        perfil_lineal(entradas, num_pisos=0)